@@ -0,0 +1,461 @@
+"""Adaptive question selection.
+
+AdaptiveScheduler chooses decks per player instead of drawing them
+uniformly at random:
+
+- Players and questions carry Elo ratings. Every answer moves the player's
+  ability and the question's difficulty towards the observed result.
+- Answered questions come back on a spaced-repetition schedule: each
+  correct answer multiplies the review interval, a wrong answer or a
+  time-out brings the question back within minutes.
+- Each player has one ReviewQueue of review due dates per category, so
+  finding the most overdue question is O(log N) however big the bank is.
+  The categories chosen for a quiz only decide which heaps are consulted.
+  Each queue also keeps count of its reviews that are due.
+
+Questions that are due come first; the rest of the deck is made of new
+questions whose difficulty is closest to the one the player should answer
+correctly about TARGET_SUCCESS of the time. New questions are drawn from
+difficulty bins by probing a bounded number of random positions, so a deck
+costs time proportional to its size, not to the bank or to how much of it
+the player has already seen.
+
+A PlayerSchedule can be given to QuizEngine as its deck selector::
+
+    scheduler = AdaptiveScheduler.load(bank, "adaptive.json")
+    scheduler.attach(engine)
+    engine.selector = scheduler.player("Alice")
+    engine.start(["Science"], 10, 15)
+    ...
+    scheduler.save("adaptive.json")
+
+Ratings and schedules are saved by question id, which stays valid as long
+as questions are only ever appended to the bank.
+"""
+import heapq
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from alias_sampler import DifficultyBands
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adaptive.json")
+INITIAL_RATING = 1500.0
+PLAYER_K = 32.0  # How far one answer moves a player's ability
+QUESTION_K = 16.0  # How far one answer moves a question's difficulty
+TARGET_SUCCESS = 0.7  # Chance of a correct answer new questions are chosen for
+DIFFICULTY_BIN = 25.0  # Width of the difficulty bins new questions are grouped in
+FIRST_INTERVAL = 24 * 60 * 60.0  # Seconds until the first review of a correct answer
+RELEARN_INTERVAL = 10 * 60.0  # Seconds until a missed question comes back
+EASE = 2.5  # Growth of the review interval per correct answer
+PROBES_PER_QUESTION = 8  # Random ids a pool may look at per question still needed
+
+
+def expected_score(ability: float, difficulty: float) -> float:
+    """Return the chance that a player answers a question correctly."""
+    return 1.0 / (1.0 + 10.0 ** ((difficulty - ability) / 400.0))
+
+
+class IndexedHeap:
+    """Binary min-heap whose items can be re-prioritised or removed in O(log n)."""
+
+    def __init__(self):
+        self._heap: List[List[Any]] = []  # [priority, item] pairs
+        self._positions: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._positions
+
+    def priority(self, item: Any) -> float:
+        return self._heap[self._positions[item]][0]
+
+    def push(self, item: Any, priority: float):
+        """Add item, or change its priority if it is already queued."""
+        position = self._positions.get(item)
+        if position is None:
+            self._heap.append([priority, item])
+            self._positions[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old = self._heap[position][0]
+        self._heap[position][0] = priority
+        if priority < old:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def peek(self) -> Tuple[float, Any]:
+        priority, item = self._heap[0]
+        return priority, item
+
+    def pop(self) -> Tuple[float, Any]:
+        """Remove and return the (priority, item) with the lowest priority."""
+        priority, item = self._heap[0]
+        self.remove(item)
+        return priority, item
+
+    def remove(self, item: Any):
+        position = self._positions.pop(item)
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i][1]] = i
+        self._positions[heap[j][1]] = j
+
+    def _sift_up(self, position: int):
+        heap = self._heap
+        while position > 0:
+            parent = (position - 1) // 2
+            if heap[parent][0] <= heap[position][0]:
+                break
+            self._swap(parent, position)
+            position = parent
+
+    def _sift_down(self, position: int):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size and heap[child][0] < heap[smallest][0]:
+                    smallest = child
+            if smallest == position:
+                return
+            self._swap(position, smallest)
+            position = smallest
+
+
+class ReviewQueue(IndexedHeap):
+    """An IndexedHeap of review due dates that also counts the reviews due.
+
+    Due dates not yet reached wait in a second min-heap and are counted as
+    the clock passes them, so counting costs O(log n) per review that fell
+    due since the last count. Entries left behind by a rescheduled review
+    are skipped when they come up.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._upcoming: List[Tuple[float, Any]] = []  # (due date, item) not yet counted
+        self._due: Set[Any] = set()
+        self._now = -math.inf  # Clock of the last count
+
+    def push(self, item: Any, priority: float):
+        super().push(item, priority)
+        self._due.discard(item)
+        if priority <= self._now:
+            self._due.add(item)
+            return
+        if len(self._upcoming) > 2 * len(self._heap) + 64:
+            # Mostly stale: start over from the current due dates
+            self._upcoming = [(due, queued) for due, queued in self._heap
+                              if due > self._now and queued != item]
+            heapq.heapify(self._upcoming)
+        heapq.heappush(self._upcoming, (priority, item))
+
+    def remove(self, item: Any):
+        super().remove(item)
+        self._due.discard(item)
+
+    def due_count(self, now: float) -> int:
+        """Return how many items have a priority of at most now."""
+        if now < self._now:
+            # The clock went back; count again from scratch
+            self._due = {item for due, item in self._heap if due <= now}
+            self._upcoming = [(due, item) for due, item in self._heap if due > now]
+            heapq.heapify(self._upcoming)
+        else:
+            upcoming = self._upcoming
+            while upcoming and upcoming[0][0] <= now:
+                due, item = heapq.heappop(upcoming)
+                if item in self and self.priority(item) == due:
+                    self._due.add(item)
+        self._now = now
+        return len(self._due)
+
+
+class _Bin:
+    """Question ids with O(1) add, discard and access by position."""
+
+    __slots__ = ("ids", "positions")
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, question_id: int):
+        if question_id not in self.positions:
+            self.positions[question_id] = len(self.ids)
+            self.ids.append(question_id)
+
+    def discard(self, question_id: int):
+        position = self.positions.pop(question_id, None)
+        if position is None:
+            return
+        last = self.ids.pop()
+        if position < len(self.ids):
+            self.ids[position] = last
+            self.positions[last] = position
+
+
+class ReviewItem:
+    """Spaced-repetition state of one question for one player."""
+
+    __slots__ = ("interval", "due", "repetitions")
+
+    def __init__(self, interval: float = 0.0, due: float = 0.0, repetitions: int = 0):
+        self.interval = interval
+        self.due = due
+        self.repetitions = repetitions
+
+    def update(self, correct: bool, now: float):
+        if correct:
+            self.repetitions += 1
+            self.interval = FIRST_INTERVAL if self.repetitions == 1 else self.interval * EASE
+        else:
+            self.repetitions = 0
+            self.interval = RELEARN_INTERVAL
+        self.due = now + self.interval
+
+
+class PlayerSchedule:
+    """One player's ability and review queues; usable as a QuizEngine deck selector."""
+
+    def __init__(self, scheduler: "AdaptiveScheduler", name: str, ability: float = INITIAL_RATING):
+        self.scheduler = scheduler
+        self.name = name
+        self.ability = ability
+        self.reviews: Dict[int, ReviewItem] = {}
+        # Question ids by review due date, one heap per category
+        self.queues: Dict[str, ReviewQueue] = {}
+
+    def target_difficulty(self) -> float:
+        """Return the difficulty this player answers correctly TARGET_SUCCESS of the time."""
+        return self.ability - 400.0 * math.log10(TARGET_SUCCESS / (1.0 - TARGET_SUCCESS))
+
+    def _schedule(self, question_id: int, category: str, review: ReviewItem):
+        self.reviews[question_id] = review
+        queue = self.queues.get(category)
+        if queue is None:
+            queue = self.queues[category] = ReviewQueue()
+        queue.push(question_id, review.due)
+
+    def record(self, question_id: int, category: str, correct: bool, now: Optional[float] = None):
+        """Update ratings and the review schedule after an answer."""
+        now = self.scheduler.clock() if now is None else now
+        difficulty = self.scheduler.difficulty(question_id)
+        surprise = float(correct) - expected_score(self.ability, difficulty)
+        self.ability += PLAYER_K * surprise
+        self.scheduler.set_difficulty(question_id, category, difficulty - QUESTION_K * surprise)
+
+        review = self.reviews.get(question_id) or ReviewItem()
+        review.update(correct, now)
+        self._schedule(question_id, category, review)
+
+    def due_count(self, categories: Iterable[str], now: Optional[float] = None) -> int:
+        """Return how many reviews in the given categories are due."""
+        now = self.scheduler.clock() if now is None else now
+        return sum(self.queues[c].due_count(now) for c in set(categories) if c in self.queues)
+
+    def sample(self, categories: Iterable[str], k: int, rng=random) -> List[int]:
+        """Choose up to k question ids: due reviews, then new questions, then early reviews."""
+        categories = [c for c in categories if c in self.scheduler.bank.category_index]
+        now = self.scheduler.clock()
+        queues = [self.queues[c] for c in categories if c in self.queues]
+        chosen: List[int] = []
+
+        # Take reviews in due order, putting them back afterwards
+        taken: List[Tuple[ReviewQueue, float, int]] = []
+        early: List[int] = []
+        try:
+            while len(chosen) < k:
+                queue = min((q for q in queues if len(q)), key=lambda q: q.peek()[0], default=None)
+                if queue is None:
+                    break
+                due, question_id = queue.pop()
+                taken.append((queue, due, question_id))
+                if due > now:
+                    early.append(question_id)
+                    if len(early) >= k:
+                        break
+                    continue
+                chosen.append(question_id)
+        finally:
+            for queue, due, question_id in taken:
+                queue.push(question_id, due)
+
+        if len(chosen) < k:
+            chosen.extend(self.scheduler.new_questions(
+                categories, k - len(chosen), self.target_difficulty(), self.reviews, rng))
+        # Out of new questions: review early rather than ask fewer than requested
+        chosen.extend(early[:k - len(chosen)])
+        return chosen
+
+
+class AdaptiveScheduler:
+    """Question difficulties plus a PlayerSchedule per player."""
+
+    def __init__(self, bank: Any, clock: Callable[[], float] = time.time):
+        self.bank = bank
+        self.clock = clock
+        self.players: Dict[str, PlayerSchedule] = {}
+        # Ratings of questions that have been answered; the rest are INITIAL_RATING
+        self.difficulties: Dict[int, float] = {}
+        self.bands = DifficultyBands()  # Rated easy and hard questions, for a WeightedSampler
+        # Rated question ids per category, grouped in difficulty bins
+        self._bins: Dict[str, Dict[int, _Bin]] = {}
+        self._listeners: List[Tuple[Any, str, Callable]] = []  # (engine, event, callback) from attach()
+
+    def player(self, name: str) -> PlayerSchedule:
+        schedule = self.players.get(name)
+        if schedule is None:
+            schedule = self.players[name] = PlayerSchedule(self, name)
+        return schedule
+
+    def difficulty(self, question_id: int) -> float:
+        return self.difficulties.get(question_id, INITIAL_RATING)
+
+    def set_difficulty(self, question_id: int, category: str, difficulty: float):
+        bins = self._bins.setdefault(category, {})
+        old = self.difficulties.get(question_id)
+        if old is not None:
+            old_bin = bins[int(old // DIFFICULTY_BIN)]
+            old_bin.discard(question_id)
+            if not old_bin:
+                del bins[int(old // DIFFICULTY_BIN)]
+        self.difficulties[question_id] = difficulty
+        self.bands.rate(question_id, category, old, difficulty)
+        index = int(difficulty // DIFFICULTY_BIN)
+        new_bin = bins.get(index)
+        if new_bin is None:
+            new_bin = bins[index] = _Bin()
+        new_bin.add(question_id)
+
+    def new_questions(self, categories: List[str], k: int, target: float,
+                      seen: Dict[int, Any], rng=random) -> List[int]:
+        """Return up to k unseen question ids with difficulty closest to target.
+
+        Each pool, from the closest difficulty out, is probed at no more
+        than PROBES_PER_QUESTION random positions per question still needed,
+        so a pool the player has mostly seen is given up on rather than
+        scanned; a pool that small is looked at in full.
+        """
+        # Rated questions sit in bins; unrated ones form one pool at INITIAL_RATING
+        pools: List[Tuple[float, Optional[_Bin]]] = [(abs(INITIAL_RATING - target), None)]
+        for category in categories:
+            for index, ids in self._bins.get(category, {}).items():
+                centre = (index + 0.5) * DIFFICULTY_BIN
+                pools.append((abs(centre - target), ids))
+        pools.sort(key=lambda pool: pool[0])
+
+        chosen: List[int] = []
+        for _, ids in pools:
+            if ids is None:
+                chosen.extend(self._unrated(categories, k - len(chosen), seen, rng))
+            else:
+                chosen.extend(self._unseen(ids, k - len(chosen), seen, rng))
+            if len(chosen) >= k:
+                break
+        return chosen
+
+    @staticmethod
+    def _unseen(ids: _Bin, k: int, seen: Dict[int, Any], rng) -> List[int]:
+        """Draw up to k random unseen questions from a bin."""
+        chosen: List[int] = []
+        for position in rng.sample(range(len(ids)), min(len(ids), PROBES_PER_QUESTION * k)):
+            question_id = ids.ids[position]
+            if question_id not in seen:
+                chosen.append(question_id)
+                if len(chosen) >= k:
+                    break
+        return chosen
+
+    def _unrated(self, categories: List[str], k: int, seen: Dict[int, Any], rng) -> List[int]:
+        """Draw up to k random unseen questions that have never been answered."""
+        draw = min(self.bank.count(categories), PROBES_PER_QUESTION * k)
+        chosen: List[int] = []
+        for question_id in self.bank.sample(categories, draw, rng):
+            if question_id not in self.difficulties and question_id not in seen:
+                chosen.append(question_id)
+                if len(chosen) >= k:
+                    break
+        return chosen
+
+    def attach(self, engine):
+        """Record answers from an engine whose selector is one of this scheduler's players."""
+        def on_answered(session, question, answer_idx, correct):
+            selector = engine.selector
+            if isinstance(selector, PlayerSchedule) and selector.scheduler is self:
+                selector.record(session.question_ids[session.current_index], question.category, correct)
+
+        def on_timeout(session, question):
+            on_answered(session, question, None, False)
+
+        for event, callback in (("answered", on_answered), ("timeout", on_timeout)):
+            engine.on(event, callback)
+            self._listeners.append((engine, event, callback))
+
+    def detach(self):
+        """Stop recording answers from the engines this scheduler was attached to."""
+        for engine, event, callback in self._listeners:
+            engine.off(event, callback)
+        self._listeners.clear()
+
+    def save(self, path: str = DEFAULT_STATE_PATH):
+        """Write ratings and schedules to a JSON file, replacing it atomically."""
+        state = {
+            "bank_size": len(self.bank),
+            "difficulties": [[question_id, rating] for question_id, rating in self.difficulties.items()],
+            "players": {
+                name: {
+                    "ability": player.ability,
+                    "reviews": [[question_id, r.interval, r.due, r.repetitions]
+                                for question_id, r in player.reviews.items()],
+                }
+                for name, player in self.players.items()
+            },
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, bank: Any, path: str = DEFAULT_STATE_PATH,
+             clock: Callable[[], float] = time.time) -> "AdaptiveScheduler":
+        """Load saved state, or start afresh if there is none or the bank has shrunk."""
+        scheduler = cls(bank, clock)
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return scheduler
+        if state.get("bank_size", 0) > len(bank):
+            # Question ids no longer mean the same questions
+            return scheduler
+
+        for question_id, rating in state["difficulties"]:
+            scheduler.set_difficulty(question_id, bank[question_id].category, rating)
+        for name, saved in state["players"].items():
+            player = scheduler.player(name)
+            player.ability = saved["ability"]
+            for question_id, interval, due, repetitions in saved["reviews"]:
+                player._schedule(question_id, bank[question_id].category,
+                                 ReviewItem(interval, due, repetitions))
+        return scheduler
@@ -0,0 +1,229 @@
+"""Weighted deck sampling with alias tables.
+
+WeightedSampler draws decks in which each question's chance is
+proportional to the weight of its category times the weight of its
+difficulty band, so a weight of 1 everywhere gives the usual uniform draw.
+Questions are split into groups by category and band once per set of
+categories. A Walker/Vose alias table over the groups then makes every
+draw O(1): one alias lookup picks the group and one step of a sparse
+Fisher-Yates shuffle picks an unused question inside it. The table is
+rebuilt only when a group is half used up, so building a deck costs time
+proportional to the deck and the number of groups, not to the bank.
+Rated easy and hard questions are swapped out of the medium group's
+shuffle before it starts, so they are never drawn and skipped.
+
+A WeightedSampler can be given to QuizEngine as its deck selector::
+
+    sampler = WeightedSampler(bank, {"Science": 3, "History": 1})
+    engine.selector = sampler
+
+Difficulty bands need the rated easy and hard questions of each category,
+a DifficultyBands; questions without a rating count as medium. An
+adaptive.AdaptiveScheduler keeps its ``bands`` up to date as ratings
+change, and groups are cached per set of categories until a question in
+one of them moves to another band::
+
+    WeightedSampler(bank, weights, {"hard": 2}, scheduler.bands)
+"""
+import random
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+DIFFICULTY_BANDS = ("easy", "medium", "hard")
+EASY_BELOW = 1400.0  # Ratings below this are easy
+HARD_ABOVE = 1600.0  # Ratings above this are hard
+
+
+def difficulty_band(rating: float) -> str:
+    if rating < EASY_BELOW:
+        return "easy"
+    if rating > HARD_ABOVE:
+        return "hard"
+    return "medium"
+
+
+class DifficultyBands:
+    """Rated easy and hard question ids per category, moved as ratings change.
+
+    A category's version goes up whenever one of its questions changes
+    band, so ratings that move within a band leave cached groups alone.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, Dict[str, Set[int]]] = {}  # Category -> "easy"/"hard" -> ids
+        self.versions: Dict[str, int] = {}
+
+    @classmethod
+    def of(cls, bank: Any, difficulties: Dict[int, float]) -> "DifficultyBands":
+        """Return the bands of a question id -> rating mapping."""
+        bands = cls()
+        for question_id, rating in difficulties.items():
+            bands.rate(question_id, bank[question_id].category, None, rating)
+        return bands
+
+    def rate(self, question_id: int, category: str, old: Optional[float], new: float):
+        """Record a rating change from old (None if it was unrated) to new."""
+        before = "medium" if old is None else difficulty_band(old)
+        after = difficulty_band(new)
+        if before == after:
+            return
+        by_band = self.ids.setdefault(category, {"easy": set(), "hard": set()})
+        if before != "medium":
+            by_band[before].discard(question_id)
+        if after != "medium":
+            by_band[after].add(question_id)
+        self.versions[category] = self.versions.get(category, 0) + 1
+
+
+class AliasTable:
+    """Draws index i with probability weights[i] / sum(weights) in O(1) (Vose's method)."""
+
+    def __init__(self, weights: Sequence[float]):
+        total = float(sum(weights))
+        if not weights or total <= 0:
+            raise ValueError("At least one weight must be positive")
+        n = len(weights)
+        self.probabilities = array("d", bytes(8 * n))
+        self.aliases = array("I", bytes(4 * n))
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error
+        for i in large + small:
+            self.probabilities[i] = 1.0
+            self.aliases[i] = i
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def draw(self, rng=random) -> int:
+        i = int(rng.random() * len(self.probabilities))
+        return i if rng.random() < self.probabilities[i] else self.aliases[i]
+
+
+class _Group:
+    """Questions of one category and difficulty band.
+
+    The group is the first ``size`` positions of ``ids`` after the swaps in
+    ``moved`` (position -> id moved there). The medium group shares its
+    category's id array; its easy and hard questions are moved past ``size``.
+    """
+
+    __slots__ = ("ids", "size", "moved")
+
+    def __init__(self, ids: Sequence[int], size: int, moved: Optional[Dict[int, int]] = None):
+        self.ids = ids
+        self.size = size
+        self.moved = moved or {}
+
+
+def _without(ids: Sequence[int], excluded: List[int]) -> _Group:
+    """Return the group of sorted ids minus excluded, without copying ids.
+
+    Each excluded id is swapped with the last position still in the group,
+    the same step the sparse shuffle in WeightedSampler.sample takes, so
+    the cost is per excluded id rather than per id.
+    """
+    positions = sorted((bisect_left(ids, question_id) for question_id in excluded), reverse=True)
+    moved: Dict[int, int] = {}
+    size = len(ids)
+    for position in positions:
+        size -= 1
+        last = moved.pop(size, ids[size])
+        if position != size:
+            moved[position] = last
+    return _Group(ids, size, moved)
+
+
+class WeightedSampler:
+    """Samples question ids by category and difficulty weight."""
+
+    def __init__(self, bank, category_weights: Dict[str, float],
+                 difficulty_weights: Optional[Dict[str, float]] = None,
+                 bands: Optional[DifficultyBands] = None):
+        self.bank = bank
+        self.category_weights = dict(category_weights)
+        self.difficulty_weights = dict(difficulty_weights) if difficulty_weights else None
+        self.bands = bands if bands is not None else DifficultyBands()
+        # Categories -> (their band versions, groups, per-question weights)
+        self._tables: Dict[FrozenSet[str], Tuple[Tuple[int, ...], List[_Group], List[float]]] = {}
+
+    def table(self, categories: FrozenSet[str]) -> Tuple[List[_Group], List[float]]:
+        """Return the groups and per-question weights for a set of categories.
+
+        They are built once per set of categories, and again when a question
+        in one of them has changed band since if difficulty weights are in use.
+        """
+        ordered = sorted(categories)
+        versions = tuple(self.bands.versions.get(category, 0) for category in ordered) \
+            if self.difficulty_weights else ()
+        cached = self._tables.get(categories)
+        if cached is not None and cached[0] == versions:
+            return cached[1], cached[2]
+        groups: List[_Group] = []
+        weights: List[float] = []
+        for category in ordered:
+            category_weight = self.category_weights.get(category, 1.0)
+            ids = self.bank.category_index.get(category, ())
+            if category_weight <= 0 or not ids:
+                continue
+            if not self.difficulty_weights:
+                groups.append(_Group(ids, len(ids)))
+                weights.append(category_weight)
+                continue
+            # Unrated questions are medium, so medium is the category minus easy and hard
+            excluded: List[int] = []
+            by_band = self.bands.ids.get(category, {})
+            for band in ("easy", "hard"):
+                band_ids = list(by_band.get(band, ()))
+                groups.append(_Group(band_ids, len(band_ids)))
+                weights.append(category_weight * self.difficulty_weights.get(band, 1.0))
+                excluded.extend(band_ids)
+            groups.append(_without(ids, excluded))
+            weights.append(category_weight * self.difficulty_weights.get("medium", 1.0))
+        self._tables[categories] = (versions, groups, weights)
+        return groups, weights
+
+    def sample(self, categories, k: int, rng=random) -> List[int]:
+        """Return up to k distinct question ids drawn by weight, without replacement."""
+        groups, weights = self.table(frozenset(categories))
+        remaining = [group.size if weight > 0 else 0 for group, weight in zip(groups, weights)]
+        # Sparse Fisher-Yates shuffle per group: position -> id moved there
+        moved: List[Dict[int, int]] = [dict(group.moved) for group in groups]
+        unshuffled = [group.size for group in groups]
+
+        chosen: List[int] = []
+        table, base = None, remaining
+        while len(chosen) < k:
+            if table is None:
+                # A group's chance is its per-question weight times what is left of it
+                if not any(remaining):
+                    break
+                base = list(remaining)
+                table = AliasTable([w * n for w, n in zip(weights, remaining)])
+            g = table.draw(rng)
+            # Accept with remaining/base so draws follow what is left in each group
+            if rng.random() * base[g] >= remaining[g]:
+                continue
+
+            ids, swaps = groups[g].ids, moved[g]
+            position = int(rng.random() * unshuffled[g])
+            last = unshuffled[g] - 1
+            question_id = swaps.get(position, ids[position])
+            swaps[position] = swaps.get(last, ids[last])
+            unshuffled[g] = last
+            chosen.append(question_id)
+            remaining[g] -= 1
+            # Rebuild once a group is half used up, so at least half the draws are accepted
+            if remaining[g] * 2 <= base[g]:
+                table = None
+        return chosen
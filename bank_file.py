@@ -0,0 +1,250 @@
+"""Compiled, memory-mapped question bank files (.qbank).
+
+A question bank can be compiled once into a single binary file which is then
+opened with mmap. Opening a bank only reads the header and the category
+index; questions are decoded from the mapped pages when they are actually
+displayed, so startup cost and resident memory barely depend on the size of
+the bank. Processes that open the same file share its pages through the OS
+page cache.
+
+File layout (all integers little-endian):
+
+- header: magic, format version, record size, record count, category count
+  and the offset of the first record
+- category index: for each category its name, first record and record count;
+  records are grouped by category so each category is one contiguous range
+- records: fixed-width slots holding the category code, correct answer,
+  option count, string lengths and the UTF-8 text of the question and options
+
+Compile a bank from the command line with::
+
+    python bank_file.py questions.jsonl questions.qbank
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List
+
+from question_bank import QuestionBank
+from question_loader import QuestionFormatError
+from question_store import QuestionView
+
+MAGIC = b"QZBK"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIQIQ")  # magic, version, reserved, record size, records, categories, records offset
+CATEGORY_ENTRY = struct.Struct("<HQQ")  # name length, first record, record count
+RECORD_HEADER = struct.Struct("<HBBH")  # category code, correct answer, option count, text length
+BLOB_LENGTH = struct.Struct("<I")
+MAX_CATEGORIES = 0xFFFF  # Category codes are unsigned shorts
+MAX_STRING_BYTES = 0xFFFF  # Text and option lengths are unsigned shorts
+
+
+class BankFileError(ValueError):
+    """Raised when a file is not a valid compiled question bank."""
+
+
+def _encode_record(question: Any, category_code: int, number: int) -> bytes:
+    strings = [question.text.encode("utf-8")] + [o.encode("utf-8") for o in question.options]
+    if max(len(s) for s in strings) > MAX_STRING_BYTES:
+        raise QuestionFormatError("<records>", number, f"text and options must be at most "
+                                                       f"{MAX_STRING_BYTES} bytes of UTF-8 each")
+    header = RECORD_HEADER.pack(category_code, question.correct_answer,
+                                len(strings) - 1, len(strings[0]))
+    lengths = struct.pack(f"<{len(strings) - 1}H", *(len(s) for s in strings[1:]))
+    return header + lengths + b"".join(strings)
+
+
+def compile_bank(questions: Iterable[Any], path: str) -> int:
+    """Write questions to a compiled bank file and return how many were written.
+
+    Questions are streamed into a spill file in the order they arrive, and
+    each category remembers where its runs of consecutive records start, so
+    records can be grouped by category without holding the bank in memory
+    or keeping a file open per category. The bank is written next to path
+    and renamed over it once it is on disk, so readers never map a
+    half-written file.
+    """
+    import tempfile
+
+    category_codes: Dict[str, int] = {}
+    counts: List[int] = []
+    # Per category: spill offset and record count of each run, back to back
+    runs: List[array] = []
+    record_size = 0
+
+    with tempfile.TemporaryFile() as spill:
+        last_code = -1
+        for number, question in enumerate(questions, 1):
+            code = category_codes.get(question.category)
+            if code is None:
+                if len(category_codes) == MAX_CATEGORIES:
+                    raise QuestionFormatError("<records>", number,
+                                              f"a bank can have at most {MAX_CATEGORIES} categories")
+                code = len(category_codes)
+                category_codes[question.category] = code
+                counts.append(0)
+                runs.append(array("Q"))
+            record = _encode_record(question, code, number)
+            record_size = max(record_size, len(record))
+            if code == last_code:
+                runs[code][-1] += 1
+            else:
+                runs[code].extend((spill.tell(), 1))
+                last_code = code
+            spill.write(BLOB_LENGTH.pack(len(record)) + record)
+            counts[code] += 1
+
+        # Align record slots to 8 bytes
+        record_size = (record_size + 7) & ~7
+
+        index = bytearray()
+        start = 0
+        for name, code in category_codes.items():
+            encoded = name.encode("utf-8")
+            index += CATEGORY_ENTRY.pack(len(encoded), start, counts[code]) + encoded
+            start += counts[code]
+        records_offset = (HEADER.size + len(index) + 7) & ~7
+
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "wb") as out:
+                out.write(HEADER.pack(MAGIC, VERSION, 0, record_size, start,
+                                      len(category_codes), records_offset))
+                out.write(index)
+                out.write(b"\0" * (records_offset - HEADER.size - len(index)))
+                for category_runs in runs:
+                    for i in range(0, len(category_runs), 2):
+                        spill.seek(category_runs[i])
+                        for _ in range(category_runs[i + 1]):
+                            length = BLOB_LENGTH.unpack(spill.read(BLOB_LENGTH.size))[0]
+                            out.write(spill.read(length).ljust(record_size, b"\0"))
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return start
+
+
+class MappedQuestionStore:
+    """Read-only question storage backed by a memory-mapped bank file.
+
+    Provides the same lookups as QuestionStore, decoding fields straight
+    from the mapped file on every access.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            # mmap refuses empty files with a bare ValueError
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise BankFileError(f"{path}: file is too short to be a question bank")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _read_index(self):
+        path = self.path
+        magic, version, _, record_size, count, num_categories, records_offset = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise BankFileError(f"{path}: not a compiled question bank")
+        if version != VERSION:
+            raise BankFileError(f"{path}: unsupported bank format version {version}")
+
+        self.record_size = record_size
+        self.records_offset = records_offset
+        self._count = count
+        self.category_names: List[str] = []
+        self.category_ranges: Dict[str, range] = {}
+
+        offset = HEADER.size
+        for _ in range(num_categories):
+            try:
+                name_length, start, length = CATEGORY_ENTRY.unpack_from(self._mmap, offset)
+                offset += CATEGORY_ENTRY.size
+                if offset + name_length > len(self._mmap):
+                    raise BankFileError(f"{path}: file is truncated")
+                name = self._mmap[offset:offset + name_length].decode("utf-8")
+            except (struct.error, UnicodeDecodeError):
+                raise BankFileError(f"{path}: category index is truncated or damaged")
+            offset += name_length
+            self.category_names.append(name)
+            self.category_ranges[name] = range(start, start + length)
+
+        if records_offset < offset or records_offset + count * record_size > len(self._mmap):
+            raise BankFileError(f"{path}: file is truncated")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, question_id: int) -> QuestionView:
+        if not 0 <= question_id < self._count:
+            raise IndexError("question id out of range")
+        return QuestionView(self, question_id)
+
+    def __iter__(self) -> Iterator[QuestionView]:
+        for question_id in range(self._count):
+            yield QuestionView(self, question_id)
+
+    def append(self, question: Any) -> int:
+        raise TypeError("Compiled question banks are read-only")
+
+    def _offset(self, question_id: int) -> int:
+        return self.records_offset + question_id * self.record_size
+
+    def text(self, question_id: int) -> str:
+        """Return the text of a question."""
+        offset = self._offset(question_id)
+        _, _, num_options, text_length = RECORD_HEADER.unpack_from(self._mmap, offset)
+        start = offset + RECORD_HEADER.size + 2 * num_options
+        return self._mmap[start:start + text_length].decode("utf-8")
+
+    def options(self, question_id: int) -> List[str]:
+        """Return the options of a question."""
+        offset = self._offset(question_id)
+        _, _, num_options, text_length = RECORD_HEADER.unpack_from(self._mmap, offset)
+        lengths = struct.unpack_from(f"<{num_options}H", self._mmap, offset + RECORD_HEADER.size)
+        start = offset + RECORD_HEADER.size + 2 * num_options + text_length
+        options = []
+        for length in lengths:
+            options.append(self._mmap[start:start + length].decode("utf-8"))
+            start += length
+        return options
+
+    def correct_answer(self, question_id: int) -> int:
+        """Return the index of the correct option of a question."""
+        return RECORD_HEADER.unpack_from(self._mmap, self._offset(question_id))[1]
+
+    def category(self, question_id: int) -> str:
+        """Return the category name of a question."""
+        code = RECORD_HEADER.unpack_from(self._mmap, self._offset(question_id))[0]
+        return self.category_names[code]
+
+    def close(self):
+        """Unmap the bank file."""
+        self._mmap.close()
+
+
+def open_bank(path: str) -> QuestionBank:
+    """Open a compiled bank file as a read-only QuestionBank."""
+    store = MappedQuestionStore(path)
+    return QuestionBank.from_store(store, store.category_ranges)
+
+
+if __name__ == "__main__":
+    from question_loader import load_questions
+
+    if len(sys.argv) != 3:
+        print("Usage: python bank_file.py <input .jsonl/.csv> <output .qbank>")
+        sys.exit(1)
+    written = compile_bank(load_questions(sys.argv[1]), sys.argv[2])
+    print(f"Compiled {written} questions into {sys.argv[2]}")
@@ -0,0 +1,98 @@
+"""Measure how quickly the quiz entry points start.
+
+Reports, for the terminal and GUI front ends, the import time of the entry
+module as measured by ``python -X importtime`` together with the modules
+that cost the most, and for the terminal version the wall-clock time from
+launching the interpreter to the first question being printed::
+
+    python benchmarks/startup_time.py --runs 10
+
+Importing the GUI module needs tkinter but not a display.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ("quiz_cli", "quizgame")
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Import module in a fresh interpreter; return cumulative microseconds per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def time_to_first_question() -> float:
+    """Return seconds from launching quiz_cli.py until it prints the first question."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "quiz_cli.py"), "--questions", "1"],
+        cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+    )
+    try:
+        while b"Question 1/" not in process.stdout.readline():
+            pass
+        return time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait()
+
+
+def interpreter_startup() -> float:
+    """Return seconds for a bare interpreter to start and exit, for reference."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - started
+
+
+def run(runs: int) -> Dict[str, Dict[str, float]]:
+    """Measure every entry point runs times and return median milliseconds."""
+    results = {}
+    for module in ENTRY_POINTS:
+        samples = [import_times(module) for _ in range(runs)]
+        results[module] = {
+            "import_ms": statistics.median(s[module] for s in samples) / 1000,
+            "slowest": slowest_imports(samples[-1], module),
+        }
+    results["quiz_cli"]["first_question_ms"] = statistics.median(
+        time_to_first_question() for _ in range(runs)) * 1000
+    results["python"] = {"startup_ms": statistics.median(interpreter_startup() for _ in range(runs)) * 1000}
+    return results
+
+
+def slowest_imports(times: Dict[str, int], module: str, count: int = 5) -> List[Tuple[str, float]]:
+    others = [(name, us / 1000) for name, us in times.items() if name != module]
+    return sorted(others, key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    print(f"Interpreter startup:        {results['python']['startup_ms']:7.1f} ms")
+    print(f"quiz_cli to first question: {results['quiz_cli']['first_question_ms']:7.1f} ms")
+    for module in ENTRY_POINTS:
+        print(f"\nimport {module}: {results[module]['import_ms']:.1f} ms")
+        for name, ms in results[module]["slowest"]:
+            print(f"  {name:24} {ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
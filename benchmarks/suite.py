@@ -0,0 +1,275 @@
+"""Benchmark suite for the quiz hot paths.
+
+Measures, and writes as JSON:
+
+- ``deck_build/N``: starting a quiz (drawing its deck) from a bank of N questions
+- ``memory/N``: bytes per question held by a bank of N questions
+- ``render``: drawing one question on the quiz screen (display_current_question)
+- ``results_screen/N``: building the results screen after N answered questions
+- ``review_row``: filling one row of the review list (add_question_to_review)
+
+Banks are synthetic and grow from 10 to 10 million questions; pass
+``--max-questions`` for a quicker run. The GUI cases need a display; when
+there is none the suite starts Xvfb itself if it is installed, and skips
+them otherwise::
+
+    python benchmarks/suite.py --output baseline.json
+    python benchmarks/suite.py --max-questions 100000 --compare baseline.json
+
+With ``--compare`` every median time and memory figure is checked against
+the stored results, and the exit status is 1 if any got worse by more than
+``--tolerance``. Median times that moved by less than ``--min-change-us``
+are timer noise on the fastest cases and never count as regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import select
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import Question, QuestionBank  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from quiz_session import QuizSession  # noqa: E402
+
+BANK_SIZES = (10, 1000, 100_000, 1_000_000, 10_000_000)
+HISTORY_LENGTHS = (10, 100, 1000, 10_000)  # Answered questions behind a results screen
+CATEGORIES = ("Science", "History", "Geography", "Entertainment", "Sports", "Art", "Music", "Literature")
+DECK_SIZE = 20  # Questions per quiz when timing deck builds
+TIME_LIMIT = 60
+DEFAULT_TOLERANCE = 0.2  # Allowed slowdown before a case counts as a regression
+DEFAULT_MIN_CHANGE_US = 5.0  # Smaller changes in a median time are noise, whatever the fraction
+XVFB_TIMEOUT = 10.0  # Seconds to wait for Xvfb to accept connections
+
+
+def synthetic_questions(start: int, stop: int) -> Iterator[Question]:
+    """Yield questions numbered start..stop-1, spread evenly over CATEGORIES."""
+    for i in range(start, stop):
+        yield Question(
+            f"Synthetic question number {i}: which option is the right one?",
+            (f"First option {i}", f"Second option {i}", f"Third option {i}", f"Fourth option {i}"),
+            i % 4,
+            CATEGORIES[i % len(CATEGORIES)]
+        )
+
+
+def bank_bytes_per_question(bank: QuestionBank) -> float:
+    """Return the memory held by a bank's store and category index per question."""
+    index_bytes = sum(sys.getsizeof(ids) for ids in bank.category_index.values())
+    return (bank.store.nbytes() + index_bytes) / max(len(bank), 1)
+
+
+def time_calls(function, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings)
+    return {
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95)] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def run_bank_cases(sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Time deck builds and measure memory as one bank grows through sizes."""
+    results = {}
+    bank = QuestionBank()
+    engine = QuizEngine(bank)
+    for size in sizes:
+        bank.extend(synthetic_questions(len(bank), size))
+        results[f"deck_build/{size}"] = summarize(
+            time_calls(lambda: engine.start(CATEGORIES, DECK_SIZE, TIME_LIMIT), repeat))
+        results[f"memory/{size}"] = {"bytes_per_question": bank_bytes_per_question(bank)}
+        print(f"  {size:>10} questions: deck {results[f'deck_build/{size}']['p50_ms']:.3f} ms, "
+              f"{results[f'memory/{size}']['bytes_per_question']:.1f} bytes/question", file=sys.stderr)
+    return results
+
+
+def answered_session(bank: QuestionBank, length: int) -> QuizSession:
+    """Return a session in which the first length questions of bank were answered."""
+    session = QuizSession(bank, range(length), TIME_LIMIT)
+    for i in range(length):
+        if i % 5 == 4:
+            session.record_timeout(TIME_LIMIT)
+        else:
+            session.record_answer(i % 3, 1.0 + i % 7)
+        session.advance()
+    return session
+
+
+def run_gui_cases(transitions: int, repeat: int, history_lengths: List[int]) -> Dict[str, Dict[str, float]]:
+    """Time the quiz screen, results screen and review rows of a real QuizGameGUI."""
+    import tkinter as tk
+
+    from quizgame import QuizGameGUI
+    from transition_latency import measure
+
+    results = {}
+    root = tk.Tk()
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep benchmark quizzes out of the real results database
+        app = QuizGameGUI(root, results_path=os.path.join(directory, "results.db"))
+        try:
+            session = app.engine.start(app.questions.categories(), len(app.questions), TIME_LIMIT)
+            app.welcome_frame.pack_forget()
+            app.quiz_frame.pack(fill="both", expand=True)
+            app.timer_running = False
+            results["render"] = summarize(measure(root, app.display_current_question, session, transitions))
+            app.engine.stop()
+            app.quiz_frame.pack_forget()
+
+            bank = QuestionBank(synthetic_questions(0, max(history_lengths)))
+            for length in history_lengths:
+                history = answered_session(bank, length)
+                app.engine.session = history
+                quiz_results = app.engine.results()
+
+                def show():
+                    app.show_results(history, quiz_results)
+                    root.update()
+                results[f"results_screen/{length}"] = summarize(time_calls(show, max(repeat // 10, 3)))
+
+            row = app.create_review_row(app.results_frame)
+            history = answered_session(bank, min(max(history_lengths), repeat))
+            entries = [(bank[i], history.answer_record(i)) for i in range(history.answered_count)]
+
+            positions = iter(range(repeat))
+
+            def fill():
+                index = next(positions) % len(entries)
+                app.add_question_to_review(row, *entries[index], index)
+                root.update_idletasks()
+            results["review_row"] = summarize(time_calls(fill, repeat))
+        finally:
+            app.engine.stop()
+            app.results_store.close()
+            root.destroy()
+    return results
+
+
+def start_xvfb() -> Optional[subprocess.Popen]:
+    """Start a virtual X server and point DISPLAY at it; return None if Xvfb is not installed."""
+    if shutil.which("Xvfb") is None:
+        return None
+    # Xvfb picks a free display number and writes it to the pipe once it is ready
+    read_end, write_end = os.pipe()
+    process = subprocess.Popen(
+        ["Xvfb", "-displayfd", str(write_end), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        pass_fds=(write_end,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    os.close(write_end)
+    try:
+        ready, _, _ = select.select([read_end], [], [], XVFB_TIMEOUT)
+        number = os.read(read_end, 16).decode().strip() if ready else ""
+    finally:
+        os.close(read_end)
+    if not number:
+        process.terminate()
+        process.wait()
+        return None
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, min_change_us: float = DEFAULT_MIN_CHANGE_US) -> List[str]:
+    """Print each case against the baseline and return the names of regressed cases.
+
+    A time regresses when it is more than tolerance slower and also at least
+    min_change_us microseconds slower; memory only has to pass tolerance.
+    """
+    regressions = []
+    print(f"\n{'case':28} {'metric':20} {'baseline':>12} {'now':>12} {'change':>8}")
+    for case, metrics in results.items():
+        for metric in ("p50_ms", "bytes_per_question"):
+            if metric not in metrics or metric not in baseline.get(case, {}):
+                continue
+            before, now = baseline[case][metric], metrics[metric]
+            change = (now - before) / before if before else 0.0
+            flag = ""
+            if change > tolerance and (metric != "p50_ms" or (now - before) * 1000 >= min_change_us):
+                flag = "  REGRESSION"
+                regressions.append(case)
+            print(f"{case:28} {metric:20} {before:12.3f} {now:12.3f} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", "-o", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--min-change-us", type=float, default=DEFAULT_MIN_CHANGE_US,
+                        help="ignore median time changes smaller than this many microseconds "
+                             "(default %(default)s)")
+    parser.add_argument("--max-questions", type=int, default=BANK_SIZES[-1],
+                        help="largest bank to build (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per case")
+    parser.add_argument("--transitions", type=int, default=200, help="questions drawn for the render case")
+    parser.add_argument("--no-gui", action="store_true", help="skip the cases that need a display")
+    args = parser.parse_args()
+
+    print("Bank cases:", file=sys.stderr)
+    results = run_bank_cases([size for size in BANK_SIZES if size <= args.max_questions], args.repeat)
+
+    skipped = []
+    xvfb = None
+    if args.no_gui:
+        skipped.append("gui: --no-gui")
+    else:
+        if not os.environ.get("DISPLAY"):
+            xvfb = start_xvfb()
+        if os.environ.get("DISPLAY"):
+            print("GUI cases...", file=sys.stderr)
+            try:
+                results.update(run_gui_cases(args.transitions, args.repeat, list(HISTORY_LENGTHS)))
+            finally:
+                if xvfb is not None:
+                    xvfb.terminate()
+                    xvfb.wait()
+        else:
+            skipped.append("gui: no display and Xvfb is not installed")
+            print("Skipping GUI cases: no display and Xvfb is not installed", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "skipped": skipped,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance, args.min_change_us)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Measure how long the quiz screen takes to switch to the next question.
+
+Compares the current approach, which updates the quiz screen's widgets in
+place, with the old one, which destroyed and rebuilt every widget for each
+question. Needs a display; on a headless machine run it under Xvfb::
+
+    xvfb-run python benchmarks/transition_latency.py --transitions 500
+"""
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quizgame import QuizGameGUI  # noqa: E402
+from suite import summarize  # noqa: E402
+
+
+def rebuild_question(frame, session, question):
+    """Draw a question the old way: destroy the screen and create it again."""
+    for widget in frame.winfo_children():
+        widget.destroy()
+
+    header_frame = tk.Frame(frame, bg="#f0f0f0")
+    header_frame.pack(fill="x", pady=(20, 0))
+    tk.Label(header_frame, text=f"Question {session.current_index + 1}/{len(session)}",
+             font=("Arial", 12, "bold"), bg="#f0f0f0").pack(side="left", padx=20)
+    tk.Label(header_frame, text=f"Category: {question.category}", font=("Arial", 12),
+             bg="#f0f0f0", fg="#555555").pack(side="right", padx=20)
+
+    timer_frame = tk.Frame(frame, bg="#f0f0f0")
+    timer_frame.pack(pady=10)
+    tk.Label(timer_frame, text=f"Time Remaining: {session.time_limit} seconds",
+             font=("Arial", 12), bg="#f0f0f0").pack()
+    ttk.Progressbar(timer_frame, orient="horizontal", length=300, mode="determinate",
+                    maximum=session.time_limit).pack(pady=5)
+
+    tk.Label(frame, text=question.text, font=("Arial", 16, "bold"), wraplength=700,
+             justify="center", bg="#f0f0f0").pack(pady=(30, 40))
+
+    options_frame = tk.Frame(frame, bg="#f0f0f0")
+    options_frame.pack(pady=10)
+    for i, option in enumerate(question.options):
+        button_frame = tk.Frame(options_frame, bg="#f0f0f0")
+        button_frame.pack(pady=8, fill="x")
+        tk.Button(button_frame, text=f"{'ABCD'[i]}. {option}", font=("Arial", 14), bg="#e0e0e0",
+                  activebackground="#d0d0d0", relief=tk.FLAT, width=40).pack()
+
+
+def measure(root, display, session, transitions):
+    """Return the seconds each transition took, including layout."""
+    questions = list(session.deck())
+    timings = []
+    for i in range(transitions):
+        question = questions[i % len(questions)]
+        started = time.perf_counter()
+        display(session, question)
+        root.update_idletasks()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run(transitions):
+    """Measure both approaches and return their summaries."""
+    root = tk.Tk()
+    try:
+        app = QuizGameGUI(root)
+        session = app.engine.start(app.questions.categories(), len(app.questions), 60)
+        app.welcome_frame.pack_forget()
+        app.quiz_frame.pack(fill="both", expand=True)
+        app.timer_running = False
+
+        reuse = measure(root, app.display_current_question, session, transitions)
+
+        app.quiz_frame.pack_forget()
+        legacy_frame = tk.Frame(root, bg="#f0f0f0")
+        legacy_frame.pack(fill="both", expand=True)
+        rebuild = measure(root, lambda s, q: rebuild_question(legacy_frame, s, q), session, transitions)
+        app.engine.stop()
+    finally:
+        root.destroy()
+    return {"rebuild": summarize(rebuild), "reuse": summarize(reuse)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transitions", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run(args.transitions)
+    print(f"{'':10} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name in ("rebuild", "reuse"):
+        r = results[name]
+        print(f"{name:10} {r['mean_ms']:8.2f}ms {r['p50_ms']:8.2f}ms {r['p95_ms']:8.2f}ms {r['max_ms']:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
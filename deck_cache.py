@@ -0,0 +1,223 @@
+"""Ready-made decks for the settings players pick most.
+
+Starting a quiz normally draws its deck from the bank on the spot. A
+DeckCache keeps a few decks already drawn for each combination of
+categories, number of questions and seed it has been asked for, so taking
+one is a pop from a queue. A background thread tops the queues up again
+after each take. Combinations are kept in an LRU cache capped at
+``max_keys``; the least recently used one is dropped when a new one arrives.
+
+A DeckCache can be given to QuizEngine as its deck selector::
+
+    cache = DeckCache(bank, seed=2024)
+    engine.selector = cache
+    cache.stats()  # {"hits": 41, "misses": 3, "evictions": 0, ...}
+
+Decks are reproducible. Every deck of a key gets the next serial number,
+and its questions are drawn with a random generator seeded from the key and
+that serial, so ``build_deck(bank, deck.key, deck.serial)`` gives the same
+deck again for an audit, no matter which thread drew it or when. The
+cache's own seed replaces the engine's random generator, which is ignored.
+When the bank grows or is replaced, the cache's ``version`` goes up. Every
+deck records the version it was drawn at, and a key whose decks are from
+an older version drops them and numbers its decks from 0 again.
+"""
+import random
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+DEFAULT_MAX_KEYS = 64  # Setting combinations kept before the least recently used is dropped
+DEFAULT_DEPTH = 4  # Decks kept ready per combination
+
+
+class DeckKey(NamedTuple):
+    categories: FrozenSet[str]
+    num_questions: int
+    seed: int
+
+
+class Deck(NamedTuple):
+    key: DeckKey
+    serial: int  # Position of this deck in its key's sequence
+    question_ids: List[int]
+    version: int = 0  # DeckCache.version of the bank the deck was drawn from
+
+
+def deck_key(categories: Iterable[str], num_questions: int, seed: int) -> DeckKey:
+    return DeckKey(frozenset(categories), num_questions, seed)
+
+
+def build_deck(bank: Any, key: DeckKey, serial: int, version: int = 0) -> Deck:
+    """Draw deck number serial of key from bank; the same arguments give the same deck."""
+    categories = sorted(key.categories)
+    # String seeds are hashed with SHA-512, so this does not depend on PYTHONHASHSEED
+    rng = random.Random(f"{key.seed}/{key.num_questions}/{serial}/{chr(31).join(categories)}")
+    return Deck(key, serial, bank.sample(categories, key.num_questions, rng), version)
+
+
+class _Pool:
+    """The ready decks of one key and the serial of the next deck to draw."""
+
+    __slots__ = ("decks", "next_serial", "version")
+
+    def __init__(self, version: int):
+        self.decks: Deque[Deck] = deque()
+        self.next_serial = 0
+        self.version = version  # Cache version the decks and serials belong to
+
+
+class DeckCache:
+    """Pre-drawn decks per (categories, num_questions, seed), refilled in the background."""
+
+    def __init__(self, bank: Any, seed: Optional[int] = None, max_keys: int = DEFAULT_MAX_KEYS,
+                 depth: int = DEFAULT_DEPTH):
+        if max_keys < 1 or depth < 1:
+            raise ValueError("max_keys and depth must be at least 1")
+        self.bank = bank
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.max_keys = max_keys
+        self.depth = depth
+        self.last_deck: Optional[Deck] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version = 0  # Goes up whenever the bank grows or is replaced
+        self.invalidations = 0  # Times the bank changed and the queued decks were dropped
+        self.prefetched = 0  # Decks drawn by the background thread
+        self._pools: "OrderedDict[DeckKey, _Pool]" = OrderedDict()
+        self._bank_size = len(bank)
+        self._refill: "OrderedDict[DeckKey, None]" = OrderedDict()  # Keys waiting for the thread
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def _invalidate(self):
+        self.version += 1
+        self.invalidations += 1
+
+    def _sync(self, pool: _Pool):
+        """Bring pool up to the current bank, dropping decks drawn from an older one."""
+        if len(self.bank) != self._bank_size:
+            self._bank_size = len(self.bank)
+            self._invalidate()
+        if pool.version != self.version:
+            pool.decks.clear()
+            pool.next_serial = 0
+            pool.version = self.version
+
+    def _pool(self, key: DeckKey) -> _Pool:
+        """Return key's pool, most recently used, evicting the oldest key if needed."""
+        pool = self._pools.get(key)
+        if pool is not None:
+            self._pools.move_to_end(key)
+        else:
+            pool = self._pools[key] = _Pool(self.version)
+            if len(self._pools) > self.max_keys:
+                old_key, _ = self._pools.popitem(last=False)
+                self._refill.pop(old_key, None)
+                self.evictions += 1
+        self._sync(pool)
+        return pool
+
+    def _draw(self, key: DeckKey, pool: _Pool) -> Deck:
+        deck = build_deck(self.bank, key, pool.next_serial, self.version)
+        pool.next_serial += 1
+        return deck
+
+    def _request_refill(self, key: DeckKey):
+        self._refill[key] = None
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="deck-cache", daemon=True)
+            self._thread.start()
+        self._wake.notify()
+
+    def take(self, categories: Iterable[str], num_questions: int, seed: Optional[int] = None) -> Deck:
+        """Return the next deck for these settings, drawing it now if none is ready."""
+        key = deck_key(categories, num_questions, self.seed if seed is None else seed)
+        with self._lock:
+            pool = self._pool(key)
+            if pool.decks:
+                self.hits += 1
+                deck = pool.decks.popleft()
+            else:
+                self.misses += 1
+                deck = self._draw(key, pool)
+            if not self._closed:
+                self._request_refill(key)
+            self.last_deck = deck
+        return deck
+
+    def sample(self, categories: Iterable[str], k: int, rng=None) -> List[int]:
+        """QuizEngine selector interface; rng is ignored in favour of the cache's seed."""
+        return self.take(categories, k).question_ids
+
+    def prefetch(self, categories: Iterable[str], num_questions: int, seed: Optional[int] = None):
+        """Have decks drawn in the background for settings that are likely to be picked."""
+        key = deck_key(categories, num_questions, self.seed if seed is None else seed)
+        with self._lock:
+            if not self._closed:
+                self._pool(key)
+                self._request_refill(key)
+
+    def _run(self):
+        # One deck per turn of the lock, so take() never waits for more than one
+        while True:
+            with self._lock:
+                while not self._refill and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                key, _ = self._refill.popitem(last=False)
+                pool = self._pools.get(key)
+                if pool is None:
+                    continue
+                self._sync(pool)
+                if len(pool.decks) >= self.depth:
+                    continue
+                # Draw under the lock, so decks join the queue in serial order
+                pool.decks.append(self._draw(key, pool))
+                self.prefetched += 1
+                if len(pool.decks) < self.depth:
+                    self._refill[key] = None
+
+    def set_bank(self, bank: Any):
+        """Draw decks from another bank from now on, dropping every queued deck."""
+        with self._lock:
+            self.bank = bank
+            self._bank_size = len(bank)
+            self._invalidate()
+
+    def clear(self):
+        """Drop every queued deck and forget every key."""
+        with self._lock:
+            self._pools.clear()
+            self._refill.clear()
+
+    def close(self):
+        """Stop the background thread."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "keys": len(self._pools),
+                "ready_decks": sum(len(pool.decks) for pool in self._pools.values()
+                                   if pool.version == self.version),
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "prefetched": self.prefetched,
+            }
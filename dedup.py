@@ -0,0 +1,244 @@
+"""Near-duplicate detection for question bank imports.
+
+The text of each question is turned into a set of shingles (the pairs of
+neighbouring words, counting the start and the end of the text as words)
+and summarised by a MinHash signature. Two questions are duplicates when
+the similarity of their text alone reaches the threshold and their right
+answers are the same option text. Word pairs keep the order of the words,
+so "The Sun is a star." and "The Moon is a star." come out at 0.56, while
+"What is the capital city of Australia?" and "What is the capital of
+Australia?" come out at 0.70. Questions whose right answers differ are
+never duplicates, however alike they read, so "Which planet is the
+largest...?" and "...smallest...?" with the same options are both kept.
+
+Signatures are cut into bands and bucketed (locality-sensitive hashing),
+so a new question is only compared with earlier questions that share a
+bucket with it. Finding duplicates therefore takes roughly linear time, and
+only signatures, answer hashes and band hashes are kept in memory, never
+question text; the buckets are one flat hash table of about 1 KB per
+question.
+
+Deduplicator works on a stream of questions; run the module to merge banks
+while dropping or reporting near-duplicates::
+
+    python dedup.py alice.jsonl bob.csv -o merged.jsonl
+    python dedup.py big.jsonl -o big.qbank --threshold 0.8
+    python dedup.py alice.jsonl bob.csv --report-only
+"""
+import hashlib
+import re
+import sys
+from array import array
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+DEFAULT_THRESHOLD = 0.65  # Estimated Jaccard similarity at which questions count as duplicates
+NUM_PERM = 128  # MinHash values per signature
+BANDS = 32  # LSH bands; NUM_PERM / BANDS values per band
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str) -> Set[str]:
+    """Return the shingles of a question's text: its pairs of neighbouring words."""
+    words = ["\x02", *_WORD.findall(text.lower()), "\x03"]  # Start and end of the text
+    return {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+def answer_key(question) -> int:
+    """Return a hash of the text of a question's right answer, ignoring case and punctuation."""
+    answer = " ".join(_WORD.findall(question.options[question.correct_answer].lower()))
+    return int.from_bytes(hashlib.blake2b(answer.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class Duplicate(NamedTuple):
+    index: int  # Position of the duplicate in the stream
+    duplicate_of: int  # Position of the earlier question it matches
+    similarity: float  # Estimated Jaccard similarity
+
+
+class _BucketTable:
+    """Band hash -> kept question numbers, as an open-addressing table in two flat arrays.
+
+    A bucket holding several questions stores its key once per question;
+    a lookup follows the probe sequence up to the first empty slot. Keys are
+    never 0, which marks an empty slot. The table is kept at most half full,
+    so a slot costs 12 bytes and an entry 24 to 48.
+    """
+
+    __slots__ = ("keys", "members", "mask", "used")
+
+    def __init__(self, capacity: int = 1024):
+        self.keys = array("Q", bytes(8 * capacity))
+        self.members = array("I", bytes(4 * capacity))
+        self.mask = capacity - 1  # Capacity is a power of two
+        self.used = 0
+
+    def get(self, key: int) -> Iterator[int]:
+        keys, mask = self.keys, self.mask
+        slot = key & mask
+        while True:
+            found = keys[slot]
+            if not found:
+                return
+            if found == key:
+                yield self.members[slot]
+            slot = (slot + 1) & mask
+
+    def _put(self, key: int, member: int):
+        keys, mask = self.keys, self.mask
+        slot = key & mask
+        while keys[slot]:
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        self.members[slot] = member
+
+    def add(self, key: int, member: int):
+        if 2 * (self.used + 1) > len(self.keys):
+            old_keys, old_members, used = self.keys, self.members, self.used
+            self.__init__(2 * len(old_keys))
+            for old_key, old_member in zip(old_keys, old_members):
+                if old_key:
+                    self._put(old_key, old_member)
+            self.used = used
+        self._put(key, member)
+        self.used += 1
+
+
+class Deduplicator:
+    """Remembers the signatures of questions seen so far and spots near-duplicates."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.count = 0  # Questions checked so far
+        self.duplicates = 0
+        # Signatures of kept questions, back to back, their answer keys and stream positions
+        self._signatures = array("I")
+        self._answers = array("Q")
+        self._positions = array("I")
+        self._buckets = _BucketTable()
+
+    def signature(self, text: str) -> array:
+        """Return the MinHash signature of a question's text."""
+        size = 4 * self.num_perm
+        # One extendable-output hash per shingle gives num_perm independent hash values
+        rows = [array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(size))
+                for shingle in shingles(text)]
+        return array("I", map(min, zip(*rows)))
+
+    def _band_keys(self, signature: array) -> List[int]:
+        rows = self.rows
+        # Unsigned and never 0, as _BucketTable wants
+        return [hash((band, signature[band * rows:(band + 1) * rows].tobytes())) & 0xFFFFFFFFFFFFFFFF or 1
+                for band in range(self.bands)]
+
+    def similarity(self, signature: array, kept: int) -> float:
+        """Estimate the Jaccard similarity between a signature and a kept question's text."""
+        start = kept * self.num_perm
+        other = self._signatures[start:start + self.num_perm]
+        return sum(a == b for a, b in zip(signature, other)) / self.num_perm
+
+    def check(self, question) -> Optional[Duplicate]:
+        """Return a Duplicate if question matches an earlier one; otherwise remember it."""
+        index = self.count
+        self.count += 1
+        signature = self.signature(question.text)
+        answer = answer_key(question)
+        keys = self._band_keys(signature)
+
+        best, best_similarity = -1, 0.0
+        checked: Set[int] = set()
+        for key in keys:
+            for kept in self._buckets.get(key):
+                if kept in checked:
+                    continue
+                checked.add(kept)
+                if self._answers[kept] != answer:
+                    continue
+                similarity = self.similarity(signature, kept)
+                if similarity > best_similarity:
+                    best, best_similarity = kept, similarity
+        if best >= 0 and best_similarity >= self.threshold:
+            self.duplicates += 1
+            return Duplicate(index, self._positions[best], best_similarity)
+
+        kept = len(self._positions)
+        self._signatures.extend(signature)
+        self._answers.append(answer)
+        self._positions.append(index)
+        for key in keys:
+            self._buckets.add(key, kept)
+        return None
+
+
+def deduplicate(questions: Iterable, threshold: float = DEFAULT_THRESHOLD,
+                on_duplicate: Optional[Callable[[Duplicate, object], None]] = None,
+                drop: bool = True) -> Iterator:
+    """Stream questions, passing near-duplicates to on_duplicate and dropping them if drop is set."""
+    deduplicator = Deduplicator(threshold)
+    for question in questions:
+        duplicate = deduplicator.check(question)
+        if duplicate is not None:
+            if on_duplicate is not None:
+                on_duplicate(duplicate, question)
+            if drop:
+                continue
+        yield question
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from itertools import chain
+
+    from question_loader import load_questions, write_jsonl
+
+    parser = argparse.ArgumentParser(description="Merge question banks, dropping near-duplicates.")
+    parser.add_argument("inputs", nargs="+", help="question banks (.jsonl or .csv)")
+    parser.add_argument("-o", "--output", help="merged bank (.jsonl or compiled .qbank)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="similarity at which questions count as duplicates (0-1)")
+    parser.add_argument("--report-only", action="store_true",
+                        help="list duplicates without writing a merged bank")
+    args = parser.parse_args(argv)
+    if not args.output and not args.report_only:
+        parser.error("give --output or --report-only")
+
+    # Remember which file and question number each stream position came from
+    sources: List[str] = []
+    starts = array("Q")
+
+    def numbered(path: str) -> Iterator:
+        sources.append(path)
+        starts.append(position[0])
+        for question in load_questions(path):
+            position[0] += 1
+            yield question
+
+    def describe(index: int) -> str:
+        source = max(i for i in range(len(starts)) if starts[i] <= index)
+        return f"{sources[source]} #{index - starts[source] + 1}"
+
+    def report(duplicate: Duplicate, question):
+        print(f"{describe(duplicate.index)} duplicates {describe(duplicate.duplicate_of)} "
+              f"(similarity {duplicate.similarity:.2f}): {question.text}")
+
+    position = [0]
+    questions = deduplicate(chain.from_iterable(numbered(path) for path in args.inputs),
+                            args.threshold, report, drop=True)
+    if args.report_only:
+        kept = sum(1 for _ in questions)
+    elif args.output.endswith(".qbank"):
+        from bank_file import compile_bank
+        kept = compile_bank(questions, args.output)
+    else:
+        kept = write_jsonl(questions, args.output)
+    print(f"Kept {kept} of {position[0]} questions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
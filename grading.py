@@ -0,0 +1,194 @@
+"""Bulk grading of answer sheets with NumPy.
+
+grade() marks a whole class at once against one deck. answers is a
+students x questions matrix of chosen option indices, with UNANSWERED where
+a student left a question blank. Grading is a handful of array operations
+over the whole matrix, so a million answer sheets grade in seconds rather
+than one click at a time::
+
+    report = grade_deck(bank, question_ids, answers)
+    report.scores               # correct answers per student
+    report.category_stats(17)   # {"Science": {"correct": 3, "total": 5}, ...}
+    report.question_accuracy()  # share of students who got each question right
+
+category_stats() has the same shape as QuizSession.category_stats, and a
+blank answer counts like a time-out: in the total, not as correct.
+
+Answer sheets can also be graded from the command line. The CSV file has a
+header row of question ids after a student column, then one row per
+student with answers as option numbers (1-4) or letters (A-D)::
+
+    python grading.py questions.jsonl sheets.csv -o scores.csv
+
+Reading the CSV converts it cell by cell in Python, so for large files it
+takes longer than the grading itself; the command reports both times.
+
+NumPy is only needed by this module; the rest of the game runs without it.
+"""
+from array import array
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNANSWERED = -1  # Answer matrix value for a blank answer
+ANSWER_CODES = {"": UNANSWERED}
+for _i, _letter in enumerate("ABCDEFGH"):
+    ANSWER_CODES[_letter] = ANSWER_CODES[str(_i + 1)] = _i
+
+
+class AnswerSheetError(ValueError):
+    """Raised when an answer sheet file is invalid."""
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Bulk grading needs NumPy; install it with 'pip install numpy'")
+
+
+class GradeReport(NamedTuple):
+    correct: Any  # Students x questions bool array
+    scores: Any  # Correct answers per student
+    categories: List[str]  # Category names in deck order
+    category_correct: Any  # Students x categories count of correct answers
+    category_totals: Any  # Questions per category
+
+    @property
+    def students(self) -> int:
+        return self.correct.shape[0]
+
+    def percentages(self) -> Any:
+        """Return every student's score as a percentage of the deck."""
+        questions = self.correct.shape[1]
+        return self.scores * (100.0 / questions) if questions else np.zeros(self.students)
+
+    def question_accuracy(self) -> Any:
+        """Return the share of students who answered each question correctly."""
+        return self.correct.mean(axis=0) if self.students else np.zeros(self.correct.shape[1])
+
+    def category_accuracy(self) -> Dict[str, float]:
+        """Return the share of correct answers per category over all students."""
+        correct = self.category_correct.sum(axis=0)
+        return {name: float(correct[i]) / (int(self.category_totals[i]) * self.students or 1)
+                for i, name in enumerate(self.categories)}
+
+    def category_stats(self, student: int) -> Dict[str, Dict[str, int]]:
+        """Return one student's results per category, as QuizSession.category_stats."""
+        return {name: {"correct": int(self.category_correct[student, i]),
+                       "total": int(self.category_totals[i])}
+                for i, name in enumerate(self.categories)}
+
+
+def grade(answers: Any, correct_answers: Sequence[int], categories: Sequence[str]) -> GradeReport:
+    """Grade a students x questions matrix of answers against a deck's answer key."""
+    _require_numpy()
+    answers = np.asarray(answers)
+    if answers.ndim != 2 or answers.shape[1] != len(correct_answers):
+        raise ValueError(f"answers must be a students x {len(correct_answers)} matrix, "
+                         f"not {answers.shape}")
+    if len(categories) != len(correct_answers):
+        raise ValueError("categories and correct_answers must have one entry per question")
+
+    correct = answers == np.asarray(correct_answers, dtype=np.int16)
+    scores = np.count_nonzero(correct, axis=1)
+
+    # Number categories in deck order, then sum each one's columns in one pass
+    numbers = {name: i for i, name in enumerate(dict.fromkeys(categories))}
+    names = list(numbers)
+    codes = np.array([numbers[c] for c in categories], dtype=np.intp)
+    if len(names):
+        order = np.argsort(codes, kind="stable")
+        starts = np.searchsorted(codes[order], np.arange(len(names)))
+        category_correct = np.add.reduceat(correct[:, order], starts, axis=1, dtype=np.int32)
+    else:
+        category_correct = np.zeros((answers.shape[0], 0), dtype=np.int32)
+    category_totals = np.bincount(codes, minlength=len(names))
+    return GradeReport(correct, scores, names, category_correct, category_totals)
+
+
+def grade_deck(bank: Any, question_ids: Sequence[int], answers: Any) -> GradeReport:
+    """Grade answers to the given questions of a bank, in deck order."""
+    questions = [bank[question_id] for question_id in question_ids]
+    return grade(answers, [q.correct_answer for q in questions], [q.category for q in questions])
+
+
+def read_answer_sheets(path: str) -> Tuple[List[str], List[int], Any]:
+    """Read a CSV of answer sheets; return student names, question ids and the answer matrix."""
+    import csv
+
+    _require_numpy()
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or len(header) < 2:
+            raise AnswerSheetError(f"{path}: the header needs a student column and question ids")
+        try:
+            question_ids = [int(cell) for cell in header[1:]]
+        except ValueError:
+            raise AnswerSheetError(f"{path}:1: question ids must be numbers")
+
+        students: List[str] = []
+        codes = array("b")
+        width = len(question_ids) + 1
+        for line_no, row in enumerate(reader, 2):
+            if not row:
+                continue
+            if len(row) != width:
+                raise AnswerSheetError(f"{path}:{line_no}: expected {width} columns, found {len(row)}")
+            try:
+                codes.extend([ANSWER_CODES[cell.strip().upper()] for cell in row[1:]])
+            except KeyError as e:
+                raise AnswerSheetError(f"{path}:{line_no}: invalid answer {e.args[0]!r}")
+            students.append(row[0])
+    answers = np.frombuffer(codes, dtype=np.int8).reshape(len(students), len(question_ids))
+    return students, question_ids, answers
+
+
+def main():
+    import argparse
+    import csv
+    import sys
+    import time
+
+    from question_loader import load_bank
+
+    parser = argparse.ArgumentParser(description="Grade a CSV of answer sheets against a question bank.")
+    parser.add_argument("bank", help="question bank (.jsonl, .csv or .qbank)")
+    parser.add_argument("sheets", help="answer sheets CSV: student column, then one column per question id")
+    parser.add_argument("-o", "--output", help="write student,score,percentage rows to this CSV")
+    args = parser.parse_args()
+
+    bank = load_bank(args.bank)
+    started = time.perf_counter()
+    students, question_ids, answers = read_answer_sheets(args.sheets)
+    read_time = time.perf_counter() - started
+    if any(not 0 <= question_id < len(bank) for question_id in question_ids):
+        parser.error(f"{args.sheets}: question ids must be below {len(bank)}")
+
+    started = time.perf_counter()
+    report = grade_deck(bank, question_ids, answers)
+    grade_time = time.perf_counter() - started
+
+    if args.output:
+        percentages = report.percentages()
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["student", "score", "percentage"])
+            writer.writerows(zip(students, report.scores.tolist(), [f"{p:.1f}" for p in percentages.tolist()]))
+
+    print(f"Graded {report.students} answer sheets of {len(question_ids)} questions "
+          f"(read {read_time:.2f} s, graded {grade_time:.3f} s)", file=sys.stderr)
+    if report.students:
+        print(f"Mean score: {report.scores.mean():.2f}/{len(question_ids)}")
+    for category, accuracy in report.category_accuracy().items():
+        print(f"  {category}: {accuracy:.1%}")
+    accuracy = report.question_accuracy()
+    print("Hardest questions:")
+    for column in np.argsort(accuracy, kind="stable")[:5].tolist():
+        print(f"  {accuracy[column]:6.1%}  {bank[question_ids[column]].text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Reload the question bank while the game is running.
+
+BankReloader watches the bank file by polling its modification time, size
+and inode; there is nothing to install and no service to run. When the file
+changes, a background thread reads it and the new bank is published as an
+immutable BankSnapshot. Sessions keep the snapshot they started with,
+because a QuizSession holds on to its bank; a front end only has to give
+new quizzes the latest one::
+
+    reloader = BankReloader("questions.jsonl", bank)
+    ...
+    snapshot = reloader.poll()  # From the event loop, every POLL_INTERVAL seconds
+    if snapshot is not None:
+        engine.bank = snapshot
+
+Questions added to the end of a JSON Lines file are loaded incrementally.
+Only the new lines are parsed, and they are appended to the store that
+earlier snapshots share; each snapshot only sees its own first ``len()``
+questions. Only the categories that gained questions get a new index
+array; the others are shared with the previous snapshot. Question ids keep
+their meaning across such reloads. Any other change (an edited or removed
+line, a CSV or .qbank file) rebuilds the bank from scratch, and the new
+snapshot has ``rebuilt`` set because its ids may mean different questions.
+
+Reading happens off the event loop. Hashing the unchanged part of the file
+releases the GIL, and a rebuild is parsed in the background, so a reload
+of a million-question bank does not freeze the GUI or the server. A file
+that fails to load leaves the current snapshot in place and sets ``error``.
+"""
+import hashlib
+import json
+import os
+import threading
+from array import array
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from question_bank import Question, QuestionBank
+from question_loader import QuestionFormatError, load_bank, validate_records
+
+POLL_INTERVAL = 1.0  # Seconds between checks of the bank file
+READ_CHUNK = 1 << 20  # Bytes hashed at a time
+APPENDABLE = (".jsonl", ".ndjson")  # Formats that can be reloaded incrementally
+
+
+class BankSnapshot(QuestionBank):
+    """A read-only QuestionBank of the first ``len()`` questions of a store."""
+
+    def __init__(self, store: Any, size: int, category_index: Dict[str, Sequence[int]],
+                 version: int = 0, rebuilt: bool = False):
+        self.store = store
+        self.category_index = category_index
+        self.size = size
+        self.version = version  # Counts the reloads that led to this snapshot
+        self.rebuilt = rebuilt  # True when ids may differ from the previous snapshot's
+
+    @classmethod
+    def of(cls, bank: Any, version: int = 0, rebuilt: bool = False) -> "BankSnapshot":
+        """Return a snapshot of bank as it is now."""
+        return cls(bank.store, len(bank), dict(bank.category_index), version, rebuilt)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, question_id: int) -> Any:
+        if not 0 <= question_id < self.size:
+            raise IndexError("question id out of range")
+        return self.store[question_id]
+
+    def __iter__(self) -> Iterator[Any]:
+        for question_id in range(self.size):
+            yield self.store[question_id]
+
+    def add(self, question: Question) -> int:
+        raise TypeError("Bank snapshots are read-only")
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _hash_prefix(f, length: int):
+    """Return a hash of the first length bytes of f, leaving f just after them."""
+    digest = hashlib.blake2b()
+    remaining = length
+    while remaining:
+        chunk = f.read(min(READ_CHUNK, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+class _LineScanner:
+    """Reads JSON lines from a position to the end of a file, hashing what it reads.
+
+    The scanner's offset, hash and line count only describe the file once
+    records() has been run to the end.
+    """
+
+    def __init__(self, source: str, offset: int = 0, digest=None, newlines: int = 0):
+        self.source = source
+        self.offset = offset
+        self.digest = digest if digest is not None else hashlib.blake2b()
+        self.newlines = newlines  # Line breaks before offset
+
+    def records(self, f, parse: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield the raw records from f's position on, as question_loader.read_jsonl does."""
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return
+            # Finish the last line of the chunk, so UTF-8 and JSON are never split
+            if not chunk.endswith(b"\n"):
+                chunk += f.readline()
+            self.digest.update(chunk)
+            self.offset += len(chunk)
+            first_line = self.newlines + 1
+            self.newlines += chunk.count(b"\n")
+            if not parse:
+                continue
+            for line_no, line in enumerate(chunk.decode("utf-8").split("\n"), first_line):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise QuestionFormatError(self.source, line_no, f"invalid JSON ({e})")
+                if not isinstance(record, dict):
+                    raise QuestionFormatError(self.source, line_no, "expected a JSON object")
+                record["_line"] = line_no
+                yield record
+
+
+class BankReloader:
+    """Publishes a new BankSnapshot whenever the bank file changes."""
+
+    def __init__(self, path: str, bank: Any):
+        self.path = path
+        self.snapshot = bank if isinstance(bank, BankSnapshot) else BankSnapshot.of(bank)
+        self.error: Optional[str] = None
+        self.reloads = 0
+        self._appendable = os.path.splitext(path)[1].lower() in APPENDABLE
+        self._signature = _signature(path)
+        self._pending: Optional[Tuple[int, int, int]] = None
+        # How much of the file the current snapshot holds, and a hash of it
+        self._offset = 0
+        self._digest = None
+        self._lines = 0
+        self._inode = self._signature[2] if self._signature else None
+        self._result: Optional[BankSnapshot] = None
+        self._thread: Optional[threading.Thread] = None
+        if self._appendable:
+            self._start(self._measure)
+
+    @property
+    def busy(self) -> bool:
+        """True while the file is being read in the background."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _start(self, target):
+        self._thread = threading.Thread(target=target, name="bank-reload", daemon=True)
+        self._thread.start()
+
+    def _commit(self, scanner: _LineScanner, inode: int):
+        self._offset, self._digest, self._lines = scanner.offset, scanner.digest.hexdigest(), scanner.newlines
+        self._inode = inode
+
+    def _measure(self):
+        """Record the file as it is now as the contents of the current snapshot."""
+        scanner = _LineScanner(self.path)
+        try:
+            with open(self.path, "rb") as f:
+                for _ in scanner.records(f, parse=False):
+                    pass
+                self._commit(scanner, os.fstat(f.fileno()).st_ino)
+        except OSError:
+            self._digest = None
+
+    def poll(self) -> Optional[BankSnapshot]:
+        """Check the file; return a new snapshot once one is ready, else None.
+
+        Call this from the thread that uses the snapshots. A change is only
+        read once the file has looked the same for two polls in a row, so a
+        file that is still being written is not loaded half-way.
+        """
+        if self.busy:
+            return None
+        if self._result is not None:
+            snapshot, self._result = self._result, None
+            self.snapshot = snapshot
+            self.reloads += 1
+            return snapshot
+
+        signature = _signature(self.path)
+        if signature is None or signature == self._signature:
+            self._pending = None
+            return None
+        if signature != self._pending:
+            self._pending = signature
+            return None
+        self._signature = signature
+        self._pending = None
+        self._start(self._reload)
+        return None
+
+    def _reload(self):
+        try:
+            snapshot = None
+            if self._appendable and self._digest is not None:
+                snapshot = self._append()
+            if snapshot is None:
+                snapshot = self._rebuild()
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            return
+        self.error = None
+        self._result = snapshot
+
+    def _append(self) -> Optional[BankSnapshot]:
+        """Load what was added to the end of the file; None if it changed otherwise."""
+        current = self.snapshot
+        if len(current.store) != len(current) or not hasattr(current.store, "append"):
+            return None
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                return None
+            digest = _hash_prefix(f, self._offset)
+            if digest.hexdigest() != self._digest:
+                return None
+            scanner = _LineScanner(self.path, self._offset, digest, self._lines)
+            # Check every new question before the shared store is touched
+            questions = list(validate_records(scanner.records(f), self.path))
+        if not questions:
+            self._commit(scanner, stat.st_ino)
+            return current
+
+        # Copy on write: only categories that gain questions get new id arrays
+        category_index = dict(current.category_index)
+        copied = set()
+        store = current.store
+        for question in questions:
+            question_id = store.append(question)
+            if question.category not in copied:
+                category_index[question.category] = array("I", category_index.get(question.category, ()))
+                copied.add(question.category)
+            category_index[question.category].append(question_id)
+
+        self._commit(scanner, stat.st_ino)
+        return BankSnapshot(store, len(store), category_index, current.version + 1)
+
+    def _rebuild(self) -> BankSnapshot:
+        """Load the whole file into a new store."""
+        version = self.snapshot.version + 1
+        if not self._appendable:
+            return BankSnapshot.of(load_bank(self.path), version, rebuilt=True)
+        # Hash exactly the bytes that are parsed, so later appends line up
+        scanner = _LineScanner(self.path)
+        with open(self.path, "rb") as f:
+            bank = QuestionBank(validate_records(scanner.records(f), self.path))
+            self._commit(scanner, os.fstat(f.fileno()).st_ino)
+        return BankSnapshot.of(bank, version, rebuilt=True)
+
+    def close(self):
+        """Wait for a reload in progress to finish."""
+        if self._thread is not None:
+            self._thread.join()
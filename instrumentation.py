@@ -0,0 +1,169 @@
+"""Timing spans for the GUI's hot paths and an event-loop lag probe.
+
+Instrumentation wraps methods of an object so every call is timed, and can
+watch a Tk event loop: a callback is scheduled with ``after`` at a fixed
+interval and the delay between when it was due and when it ran is recorded.
+A long lag with short spans points at work outside the instrumented methods
+(such as layout or another callback); a long span points at that method.
+
+Durations go into the streaming summaries of quiz_stats, so memory stays
+constant however long the kiosk runs. Nothing is wrapped unless
+instrument() is called, so disabled instrumentation costs nothing::
+
+    instrumentation = Instrumentation()
+    instrumentation.instrument(app)  # times HOT_PATHS
+    instrumentation.watch_event_loop(root)
+    instrumentation.export_every(root, "quiz_metrics.prom")
+
+Metrics are exported as Prometheus text exposition (paths ending in .prom,
+replaced on every export, suitable for node_exporter's textfile collector)
+or appended as one JSON object per line. Spans include the spans they call
+into; update_timer, for example, includes show_timeout_feedback.
+"""
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from quiz_stats import PERCENTILES, LogHistogram, RunningStats
+
+HOT_PATHS = ("display_current_question", "answer_question", "show_timeout_feedback",
+             "show_results", "update_timer")
+LAG_INTERVAL_MS = 100  # How often the event-loop probe is scheduled
+EXPORT_INTERVAL_MS = 10_000  # How often export_every writes the metrics
+MIN_SECONDS = 1e-6  # Shorter durations share the first histogram bucket
+METRIC_PREFIX = "quiz_"
+
+
+class Timing:
+    """Count, mean, maximum and quantiles of a stream of durations in seconds."""
+
+    __slots__ = ("stats", "histogram")
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.histogram = LogHistogram(min_value=MIN_SECONDS)
+
+    def add(self, seconds: float):
+        self.stats.add(seconds)
+        self.histogram.add(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        summary = {
+            "count": self.stats.count,
+            "sum": self.stats.mean * self.stats.count,
+            "mean": self.stats.mean,
+            "max": self.stats.max if self.stats.count else 0.0,
+        }
+        for name, fraction in PERCENTILES:
+            summary[name] = self.histogram.quantile(fraction)
+        return summary
+
+
+class Instrumentation:
+    """Collects span timings and event-loop lag, and exports them."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.spans: Dict[str, Timing] = {}
+        self.lag = Timing()
+
+    def timing(self, name: str) -> Timing:
+        timing = self.spans.get(name)
+        if timing is None:
+            timing = self.spans[name] = Timing()
+        return timing
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the body of a with statement."""
+        timing = self.timing(name)
+        started = self.clock()
+        try:
+            yield
+        finally:
+            timing.add(self.clock() - started)
+
+    def wrap(self, function: Callable, name: str) -> Callable:
+        """Return function timed as the span name."""
+        timing = self.timing(name)
+        clock = self.clock
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing.add(clock() - started)
+        return timed
+
+    def instrument(self, obj: Any, names: Iterable[str] = HOT_PATHS):
+        """Replace the named methods of obj with timed ones.
+
+        Only calls made through the object's attributes are timed, so do this
+        before the methods are handed out as callbacks.
+        """
+        for name in names:
+            setattr(obj, name, self.wrap(getattr(obj, name), name))
+
+    def watch_event_loop(self, root: Any, interval_ms: int = LAG_INTERVAL_MS):
+        """Record how late a callback scheduled every interval_ms on root runs."""
+        interval = interval_ms / 1000
+
+        def check(due: float):
+            now = self.clock()
+            self.lag.add(max(now - due, 0.0))
+            root.after(interval_ms, check, now + interval)
+        root.after(interval_ms, check, self.clock() + interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every span and the event-loop lag as plain data."""
+        return {
+            "time": time.time(),
+            "spans": {name: timing.summary() for name, timing in sorted(self.spans.items())},
+            "event_loop_lag": self.lag.summary(),
+        }
+
+    def prometheus(self) -> str:
+        """Return the metrics in Prometheus text exposition format."""
+        lines = []
+
+        def summary(metric: str, help_text: str, timings: Dict[str, Timing], label: str):
+            name = METRIC_PREFIX + metric
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for value, timing in timings.items():
+                labels = f'{label}="{value}",' if label else ""
+                for _, fraction in PERCENTILES:
+                    lines.append(f'{name}{{{labels}quantile="{fraction}"}} '
+                                 f'{timing.histogram.quantile(fraction):.9g}')
+                braces = f"{{{labels.rstrip(',')}}}" if label else ""
+                lines.append(f"{name}_sum{braces} {timing.stats.mean * timing.stats.count:.9g}")
+                lines.append(f"{name}_count{braces} {timing.stats.count}")
+
+        summary("span_seconds", "Time spent in instrumented GUI methods.",
+                dict(sorted(self.spans.items())), "span")
+        summary("event_loop_lag_seconds", "How late scheduled Tk callbacks ran.", {"": self.lag}, "")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Write the metrics to path: Prometheus text for .prom files, else append a JSON line."""
+        if path.endswith(".prom"):
+            # Replace the file whole so a scraper never reads half of it
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+            os.replace(temp_path, path)
+        else:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.snapshot(), separators=(",", ":")) + "\n")
+
+    def export_every(self, root: Any, path: str, interval_ms: int = EXPORT_INTERVAL_MS):
+        """Export the metrics to path from root's event loop every interval_ms."""
+        def tick():
+            self.export(path)
+            root.after(interval_ms, tick)
+        root.after(interval_ms, tick)
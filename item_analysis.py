@@ -0,0 +1,350 @@
+"""Item analysis of stored answers, for finding questions to retire.
+
+For every question in a results database this computes:
+
+- p-value: the share of answers that were correct
+- discrimination index: p-value among answers from the top 27% of
+  players minus p-value among the bottom 27%
+- point-biserial correlation between answering the question correctly and
+  the session's score on its other questions
+- distractor rates: the share of answers choosing each option, and blank
+
+Players are ranked by their session's score on its other questions (the
+share answered correctly), so a question's own answer does not count
+towards the group it is judged by; with short quizzes it otherwise would
+dominate both statistics.
+
+The answers table is read in chunks of about ``chunk_rows`` rows, each a
+range of session ids, and every chunk is reduced to per-question totals
+with vectorized NumPy (bincount over question ids). The totals add up
+across chunks. The chunks and the group cut-offs are planned in one
+streamed pass over the sessions, which only keeps a histogram of the
+possible scores, so memory is bounded by the chunk size and the number of
+questions, not by the number of sessions or answers. Chunks can be
+handed to a process pool; each worker opens its own read-only connection::
+
+    python item_analysis.py --workers 8 --flag
+    python item_analysis.py --csv items.csv
+
+Needs NumPy.
+"""
+import sqlite3
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from question_loader import MAX_OPTIONS
+from results_store import DEFAULT_RESULTS_PATH
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_ROWS = 1_000_000  # Answers per chunk
+FETCH_ROWS = 50_000  # Rows converted to an array at a time
+GROUP_FRACTION = 0.27  # Share of answers in each of the upper and lower groups
+BLANK = MAX_OPTIONS  # Option column counting answers left blank (time-outs)
+
+# Flag thresholds for --flag
+MIN_RESPONSES = 30
+MIN_P_VALUE = 0.2
+MAX_P_VALUE = 0.95
+MIN_DISCRIMINATION = 0.2
+MIN_POINT_BISERIAL = 0.1
+
+# Rows of the per-question totals each chunk returns
+(RESPONSES, CORRECT, REST_N, REST_CORRECT, REST_SUM, REST_SQUARES, REST_PRODUCTS,
+ UPPER_N, UPPER_CORRECT, LOWER_N, LOWER_CORRECT) = range(11)
+TOTAL_ROWS = 11
+
+
+class ItemStatistics(NamedTuple):
+    question_id: int  # Id in the results database
+    text: str
+    category: str
+    correct_answer: int
+    responses: int
+    p_value: float
+    discrimination: float
+    point_biserial: float
+    option_rates: Tuple[float, ...]  # Share choosing each option; the last is blank
+
+    def flags(self) -> List[str]:
+        """Return the reasons this question looks like a bad item, if any."""
+        reasons = []
+        if self.p_value < MIN_P_VALUE:
+            reasons.append("too hard")
+        elif self.p_value > MAX_P_VALUE:
+            reasons.append("too easy")
+        if self.discrimination < MIN_DISCRIMINATION:
+            reasons.append("low discrimination")
+        if self.point_biserial < MIN_POINT_BISERIAL:
+            reasons.append("low point-biserial")
+        for option, rate in enumerate(self.option_rates[:BLANK]):
+            if option != self.correct_answer and rate > self.option_rates[self.correct_answer]:
+                reasons.append(f"option {option + 1} chosen more than the answer")
+        return reasons
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Item analysis needs NumPy; install it with 'pip install numpy'")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # as_uri() quotes characters such as ? and # that would end the path
+    return sqlite3.connect(Path(path).absolute().as_uri() + "?mode=ro", uri=True)
+
+
+def _fetch_batches(cursor: sqlite3.Cursor, columns: int) -> Iterator[Any]:
+    """Yield the rows of an integer query as n x columns arrays of up to FETCH_ROWS rows."""
+    while True:
+        rows = cursor.fetchmany(FETCH_ROWS)
+        if not rows:
+            return
+        yield np.fromiter(chain.from_iterable(rows), dtype=np.int64,
+                          count=len(rows) * columns).reshape(len(rows), columns)
+
+
+def _fetch_array(cursor: sqlite3.Cursor, columns: int) -> Any:
+    """Read all rows of an integer query into an n x columns array, FETCH_ROWS at a time."""
+    parts = list(_fetch_batches(cursor, columns))
+    return np.concatenate(parts) if parts else np.zeros((0, columns), dtype=np.int64)
+
+
+def _rest_scores(sessions: Any) -> Tuple[Any, Any]:
+    """Return the rest scores answers of these sessions can have, and how many answers have each."""
+    # A session scoring k of n gives its k correct answers a rest score of
+    # (k - 1) / (n - 1) and its n - k wrong ones k / (n - 1)
+    score = sessions[:, 1].astype(np.float64)
+    answered = sessions[:, 2]
+    others = np.maximum(answered - 1, 1)
+    rest = np.concatenate(((score - 1) / others, score / others))
+    weights = np.concatenate((score, answered - score)) * np.tile(answered > 1, 2)
+    return rest[weights > 0], weights[weights > 0]
+
+
+def _add_to_histogram(values: Any, counts: Any, new_values: Any, new_counts: Any) -> Tuple[Any, Any]:
+    """Merge weighted values into a histogram of distinct sorted values."""
+    values, inverse = np.unique(np.concatenate((values, new_values)), return_inverse=True)
+    return values, np.bincount(inverse, weights=np.concatenate((counts, new_counts)), minlength=len(values))
+
+
+def plan_chunks(path: str, chunk_rows: int = CHUNK_ROWS) -> Tuple[List[Tuple[int, int]], float, float]:
+    """Split the sessions into id ranges of about chunk_rows answers each.
+
+    Also returns the score on a session's other questions (as a share
+    answered correctly) at or below which an answer is in the lower group,
+    and at or above which it is in the upper group.
+
+    Sessions are streamed FETCH_ROWS at a time. Rest scores are fractions
+    with the quiz length as denominator, so their histogram is exact and
+    its size depends on the quiz lengths played, not on the sessions.
+    """
+    _require_numpy()
+    ranges: List[Tuple[int, int]] = []
+    low = last_id = last_chunk = None
+    carried = 0  # Answers in the sessions before this batch
+    values, counts = np.zeros(0), np.zeros(0)
+    connection = _connect(path)
+    try:
+        cursor = connection.execute("SELECT id, score, answered FROM sessions WHERE answered > 0 ORDER BY id")
+        for sessions in _fetch_batches(cursor, 3):
+            ids = sessions[:, 0]
+            running = carried + np.cumsum(sessions[:, 2])
+            # A chunk ends before each session that takes the running answer count
+            # past a multiple of chunk_rows
+            chunk_numbers = running // chunk_rows
+            if low is None:
+                low, last_chunk = int(ids[0]), int(chunk_numbers[0])
+            for start in np.flatnonzero(np.diff(chunk_numbers, prepend=last_chunk)).tolist():
+                high = (int(ids[start - 1]) if start else last_id) + 1
+                ranges.append((low, high))
+                low = high
+            carried, last_chunk, last_id = int(running[-1]), int(chunk_numbers[-1]), int(ids[-1])
+            values, counts = _add_to_histogram(values, counts, *_rest_scores(sessions))
+    finally:
+        connection.close()
+    if low is None:
+        return [], 0.0, 1.0
+    ranges.append((low, last_id + 1))
+
+    if not len(values):
+        return ranges, 0.0, 1.0
+    cumulative = np.cumsum(counts)
+    positions = np.searchsorted(cumulative, [GROUP_FRACTION * cumulative[-1],
+                                             (1 - GROUP_FRACTION) * cumulative[-1]])
+    lower, upper = values[np.minimum(positions, len(values) - 1)]
+    return ranges, float(lower), float(upper)
+
+
+def chunk_totals(path: str, low: int, high: int, lower: float, upper: float, size: int) -> Tuple[Any, Any]:
+    """Return per-question totals and option counts for sessions low <= id < high.
+
+    Both are indexed by question id below size; they add up across chunks.
+    """
+    connection = _connect(path)
+    try:
+        sessions = _fetch_array(connection.execute(
+            "SELECT id, score, answered FROM sessions WHERE id >= ? AND id < ?", (low, high)), 3)
+        answers = _fetch_array(connection.execute(
+            "SELECT session_id, question_id, IFNULL(answer, -1), correct FROM answers"
+            " WHERE session_id >= ? AND session_id < ?", (low, high)), 4)
+    finally:
+        connection.close()
+
+    # Each answer's session score and question count, looked up by session id
+    session_score = np.zeros(high - low, dtype=np.float64)
+    session_answered = np.zeros(high - low, dtype=np.float64)
+    session_score[sessions[:, 0] - low] = sessions[:, 1]
+    session_answered[sessions[:, 0] - low] = sessions[:, 2]
+    rows = answers[:, 0] - low
+    questions = answers[:, 1]
+    choices = answers[:, 2]
+    correct = answers[:, 3].astype(np.float64)
+    score = session_score[rows]
+    answered = session_answered[rows]
+
+    totals = np.zeros((TOTAL_ROWS, size), dtype=np.float64)
+
+    def add(row: int, mask: Optional[Any] = None, weights: Optional[Any] = None):
+        ids = questions if mask is None else questions[mask]
+        if weights is not None and mask is not None:
+            weights = weights[mask]
+        totals[row] += np.bincount(ids, weights=weights, minlength=size)[:size]
+
+    add(RESPONSES)
+    add(CORRECT, weights=correct)
+
+    # Score on the session's other questions, for the point-biserial correlation
+    has_rest = answered > 1
+    rest = (score - correct) / np.maximum(answered - 1, 1)
+    add(REST_N, has_rest)
+    add(REST_CORRECT, has_rest, correct)
+    add(REST_SUM, has_rest, rest)
+    add(REST_SQUARES, has_rest, rest * rest)
+    add(REST_PRODUCTS, has_rest, rest * correct)
+
+    in_upper = has_rest & (rest >= upper)
+    in_lower = has_rest & (rest <= lower)
+    add(UPPER_N, in_upper)
+    add(UPPER_CORRECT, in_upper, correct)
+    add(LOWER_N, in_lower)
+    add(LOWER_CORRECT, in_lower, correct)
+
+    columns = BLANK + 1
+    options = np.where((choices < 0) | (choices >= BLANK), BLANK, choices)
+    option_counts = np.bincount(questions * columns + options, minlength=size * columns)[:size * columns]
+    return totals, option_counts.reshape(size, columns)
+
+
+def _chunk_totals(task: Tuple[str, int, int, float, float, int]) -> Tuple[Any, Any]:
+    return chunk_totals(*task)
+
+
+def item_statistics(totals: Any, option_counts: Any,
+                    questions: Iterable[Tuple[int, str, str, int]]) -> Iterator[ItemStatistics]:
+    """Turn summed totals into statistics for each (id, text, category, correct answer) with answers."""
+    for question_id, text, category, correct_answer in questions:
+        t = totals[:, question_id]
+        responses = t[RESPONSES]
+        if not responses:
+            continue
+        n, y = t[REST_N], t[REST_CORRECT]
+        x, xx, xy = t[REST_SUM], t[REST_SQUARES], t[REST_PRODUCTS]
+        spread = (n * xx - x * x) * (n * y - y * y)
+        point_biserial = (n * xy - x * y) / spread ** 0.5 if spread > 0 else 0.0
+        upper = t[UPPER_CORRECT] / t[UPPER_N] if t[UPPER_N] else 0.0
+        lower = t[LOWER_CORRECT] / t[LOWER_N] if t[LOWER_N] else 0.0
+        yield ItemStatistics(
+            question_id, text, category, correct_answer, int(responses),
+            float(t[CORRECT] / responses), float(upper - lower), float(point_biserial),
+            tuple(float(count / responses) for count in option_counts[question_id]),
+        )
+
+
+def analyze(path: str = DEFAULT_RESULTS_PATH, chunk_rows: int = CHUNK_ROWS,
+            workers: int = 0) -> List[ItemStatistics]:
+    """Return item statistics for every answered question in a results database.
+
+    With workers > 1 the chunks are reduced in that many processes.
+    """
+    _require_numpy()
+    ranges, lower, upper = plan_chunks(path, chunk_rows)
+    connection = _connect(path)
+    try:
+        size = (connection.execute("SELECT MAX(id) FROM questions").fetchone()[0] or 0) + 1
+        questions = connection.execute(
+            "SELECT q.id, q.text, c.name, q.correct_answer FROM questions q"
+            " JOIN categories c ON c.id = q.category_id ORDER BY q.id").fetchall()
+    finally:
+        connection.close()
+
+    totals = np.zeros((TOTAL_ROWS, size), dtype=np.float64)
+    option_counts = np.zeros((size, BLANK + 1), dtype=np.int64)
+    tasks = [(path, low, high, lower, upper, size) for low, high in ranges]
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            results = pool.map(_chunk_totals, tasks)
+            for chunk, counts in results:
+                totals += chunk
+                option_counts += counts
+    else:
+        for task in tasks:
+            chunk, counts = _chunk_totals(task)
+            totals += chunk
+            option_counts += counts
+    return list(item_statistics(totals, option_counts, questions))
+
+
+def write_csv(items: Sequence[ItemStatistics], path: str):
+    import csv
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["question_id", "category", "responses", "p_value", "discrimination",
+                         "point_biserial"] + [f"option{i + 1}" for i in range(BLANK)] + ["blank", "text"])
+        for item in items:
+            writer.writerow([item.question_id, item.category, item.responses, f"{item.p_value:.4f}",
+                             f"{item.discrimination:.4f}", f"{item.point_biserial:.4f}"]
+                            + [f"{rate:.4f}" for rate in item.option_rates] + [item.text])
+
+
+def main():
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Item statistics for every question in a results database.")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_PATH, help="results database")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="answers read per chunk")
+    parser.add_argument("--workers", type=int, default=0, help="reduce chunks in this many processes")
+    parser.add_argument("--csv", help="write every question's statistics to this CSV file")
+    parser.add_argument("--flag", action="store_true", help="only list questions that look like bad items")
+    parser.add_argument("--min-responses", type=int, default=MIN_RESPONSES,
+                        help="answers a question needs before it is flagged")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    items = analyze(args.db, args.chunk_rows, args.workers)
+    elapsed = time.perf_counter() - started
+    responses = sum(item.responses for item in items)
+    print(f"Analysed {responses} answers to {len(items)} questions in {elapsed:.2f} s", file=sys.stderr)
+
+    if args.csv:
+        write_csv(items, args.csv)
+    print(f"{'p':>6} {'D':>6} {'r_pb':>6} {'answers':>8}  question")
+    for item in items:
+        reasons = item.flags() if item.responses >= args.min_responses else []
+        if args.flag and not reasons:
+            continue
+        note = f"  [{', '.join(reasons)}]" if reasons else ""
+        print(f"{item.p_value:6.2f} {item.discrimination:6.2f} {item.point_biserial:6.2f} "
+              f"{item.responses:8}  {item.text}{note}")
+
+
+if __name__ == "__main__":
+    main()
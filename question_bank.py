@@ -0,0 +1,91 @@
+import random
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Sequence
+
+from question_store import QuestionStore, QuestionView
+
+
+class Question(NamedTuple):
+    """A read-only quiz question; answers are tracked by QuizSession."""
+    text: str
+    options: Sequence[str]
+    correct_answer: int  # Index of the correct answer
+    category: str
+
+
+def sample_ids(groups: Sequence[Sequence[int]], k: int, rng=random) -> List[int]:
+    """Pick k distinct ids from the union of several id groups.
+
+    Positions are drawn from the combined length of the groups and mapped
+    back to ids, so only k ids are touched no matter how large the groups are.
+    """
+    offsets = []
+    total = 0
+    for group in groups:
+        offsets.append(total)
+        total += len(group)
+
+    ids = []
+    for position in rng.sample(range(total), min(k, total)):
+        g = bisect_right(offsets, position) - 1
+        # Skip over empty groups that share the same offset
+        while len(groups[g]) <= position - offsets[g]:
+            g += 1
+        ids.append(groups[g][position - offsets[g]])
+    return ids
+
+
+class QuestionBank:
+    """All available questions plus an index of question ids by category.
+
+    Questions are kept in a compact QuestionStore and handed out as
+    QuestionView objects.
+    """
+
+    def __init__(self, questions: Iterable[Question] = ()):
+        self.store = QuestionStore()
+        # Question ids per category, kept as compact arrays of unsigned ints
+        self.category_index: Dict[str, Sequence[int]] = {}
+        self.extend(questions)
+
+    @classmethod
+    def from_store(cls, store: Any, category_index: Dict[str, Sequence[int]]) -> "QuestionBank":
+        """Wrap an existing store whose category index is already known."""
+        bank = cls()
+        bank.store = store
+        bank.category_index = dict(category_index)
+        return bank
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, question_id: int) -> QuestionView:
+        return self.store[question_id]
+
+    def __iter__(self) -> Iterator[QuestionView]:
+        return iter(self.store)
+
+    def add(self, question: Question) -> int:
+        """Add a question and return its id."""
+        question_id = self.store.append(question)
+        self.category_index.setdefault(question.category, array("I")).append(question_id)
+        return question_id
+
+    def extend(self, questions: Iterable[Question]):
+        """Add several questions."""
+        for question in questions:
+            self.add(question)
+
+    def categories(self) -> List[str]:
+        """Return the category names in the order they were first seen."""
+        return list(self.category_index)
+
+    def count(self, categories: Iterable[str]) -> int:
+        """Return the number of questions in the given categories."""
+        return sum(len(self.category_index.get(c, ())) for c in categories)
+
+    def sample(self, categories: Iterable[str], k: int, rng=random) -> List[int]:
+        """Return up to k random question ids from the given categories."""
+        groups = [self.category_index[c] for c in categories if c in self.category_index]
+        return sample_ids(groups, k, rng)
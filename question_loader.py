@@ -0,0 +1,177 @@
+"""Streaming question bank loaders.
+
+Questions are read from JSON Lines or CSV files one record at a time, so a
+bank of any size can be consumed without holding the file in memory.
+
+JSON Lines records look like::
+
+    {"text": "...", "options": ["A", "B", "C", "D"], "correct_answer": 1, "category": "Science"}
+
+CSV files need a header row with ``text``, ``correct_answer`` and
+``category`` columns plus one column per option (``option1``, ``option2``,
+...), in any order. Empty option cells are ignored, and any other column
+whose name starts with ``option`` is an error rather than a silently
+dropped option.
+"""
+import os
+import re
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from question_bank import Question, QuestionBank
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.jsonl")
+MAX_OPTIONS = 4
+MAX_TEXT_LENGTH = 1000
+OPTION_COLUMN = re.compile(r"option(\d+)")  # CSV option columns: option1, option2, ...
+
+
+class QuestionFormatError(ValueError):
+    """Raised when a record in a question bank file is invalid."""
+
+    def __init__(self, source: str, line: int, message: str):
+        super().__init__(f"{source}:{line}: {message}")
+        self.source = source
+        self.line = line
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield one raw record per non-empty line of a JSON Lines file."""
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise QuestionFormatError(path, line_no, f"invalid JSON ({e})")
+            if not isinstance(record, dict):
+                raise QuestionFormatError(path, line_no, "expected a JSON object")
+            record["_line"] = line_no
+            yield record
+
+
+def read_csv(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield one raw record per data row of a CSV file."""
+    import csv
+
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        numbered = []
+        for name in reader.fieldnames or []:
+            match = OPTION_COLUMN.fullmatch(name)
+            if match:
+                numbered.append((int(match.group(1)), name))
+            elif name.lower().startswith("option"):
+                raise QuestionFormatError(path, 1, f"unexpected column {name!r}; "
+                                                   "option columns are named option1, option2, ...")
+        option_columns = [name for _, name in sorted(numbered)]
+        for row in reader:
+            yield {
+                "text": row.get("text"),
+                "options": [row[name] for name in option_columns if row.get(name)],
+                "correct_answer": row.get("correct_answer"),
+                "category": row.get("category"),
+                "_line": reader.line_num,
+            }
+
+
+def validate_records(records: Iterable[Dict[str, Any]], source: str = "<records>",
+                     skip_invalid: bool = False) -> Iterator[Question]:
+    """Turn raw records into Question objects, checking each one as it arrives.
+
+    Invalid records raise QuestionFormatError unless skip_invalid is set, in
+    which case they are dropped.
+    """
+    for record in records:
+        line = record.get("_line", 0)
+        try:
+            yield _to_question(record, source, line)
+        except QuestionFormatError:
+            if not skip_invalid:
+                raise
+
+
+def _to_question(record: Dict[str, Any], source: str, line: int) -> Question:
+    text = record.get("text")
+    options = record.get("options")
+    category = record.get("category")
+
+    if not isinstance(text, str) or not text.strip():
+        raise QuestionFormatError(source, line, "missing question text")
+    if len(text) > MAX_TEXT_LENGTH:
+        raise QuestionFormatError(source, line, "question text is too long")
+    if not isinstance(options, list) or not 2 <= len(options) <= MAX_OPTIONS:
+        raise QuestionFormatError(source, line, f"expected 2 to {MAX_OPTIONS} options")
+    if not all(isinstance(option, str) and option for option in options):
+        raise QuestionFormatError(source, line, "options must be non-empty strings")
+    if not isinstance(category, str) or not category.strip():
+        raise QuestionFormatError(source, line, "missing category")
+
+    try:
+        correct_answer = int(record.get("correct_answer"))
+    except (TypeError, ValueError):
+        raise QuestionFormatError(source, line, "correct_answer must be an integer")
+    if not 0 <= correct_answer < len(options):
+        raise QuestionFormatError(source, line, "correct_answer is out of range")
+
+    return Question(text.strip(), tuple(options), correct_answer, category.strip())
+
+
+def load_questions(path: str, limit: Optional[int] = None,
+                   skip_invalid: bool = False) -> Iterator[Question]:
+    """Stream validated questions from a .jsonl or .csv file.
+
+    At most limit questions are read, which caps the memory a bank can use.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        records = read_jsonl(path)
+    elif ext == ".csv":
+        records = read_csv(path)
+    else:
+        raise ValueError(f"Unsupported question bank format: {path}")
+
+    questions = validate_records(records, path, skip_invalid)
+    if limit is not None:
+        questions = islice(questions, limit)
+    return questions
+
+
+def load_bank(path: str, limit: Optional[int] = None) -> QuestionBank:
+    """Load a whole question bank, memory-mapping compiled .qbank files."""
+    if path.endswith(".qbank"):
+        from bank_file import open_bank
+        return open_bank(path)
+    return QuestionBank(load_questions(path, limit))
+
+
+def write_jsonl(questions: Iterable[Question], path: str) -> int:
+    """Write questions to a JSON Lines file and return how many were written."""
+    import json
+
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for question in questions:
+            record = {
+                "text": question.text,
+                "options": list(question.options),
+                "correct_answer": question.correct_answer,
+                "category": question.category,
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,166 @@
+"""Compact, array-backed storage for large question banks.
+
+Every Question holds its own text object, a tuple of option strings and a
+category string, which adds up to hundreds of bytes per question. The store
+keeps the same data in a handful of flat buffers instead:
+
+- question text and option text are UTF-8 encoded into one shared byte pool,
+  with an offset array marking where each string starts
+- each question owns a run of consecutive strings (text first, then options)
+- categories are interned and stored as 2-byte codes
+- correct answers are stored in a byte array
+
+QuestionView gives the familiar text/options/correct_answer/category
+attributes on top of a store so the rest of the code does not need to know
+how questions are kept.
+"""
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+class QuestionView:
+    """A lightweight, read-only, Question-like view of one stored question."""
+
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store: "QuestionStore", question_id: int):
+        self._store = store
+        self.id = question_id
+
+    @property
+    def text(self) -> str:
+        return self._store.text(self.id)
+
+    @property
+    def options(self) -> List[str]:
+        return self._store.options(self.id)
+
+    @property
+    def correct_answer(self) -> int:
+        return self._store.correct_answer(self.id)
+
+    @property
+    def category(self) -> str:
+        return self._store.category(self.id)
+
+    def __repr__(self):
+        return f"QuestionView({self.id}, {self.text!r})"
+
+
+class QuestionStore:
+    """Columnar storage for questions."""
+
+    def __init__(self, questions: Iterable[Any] = ()):
+        self.category_names: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+
+        self.category_codes = array("H")
+        self.correct_answers = bytearray()
+        self.string_pool = bytearray()
+        # String i is string_pool[string_offsets[i]:string_offsets[i + 1]]
+        self.string_offsets = array("Q", [0])
+        # Question i owns strings question_strings[i]:question_strings[i + 1]
+        self.question_strings = array("I", [0])
+
+        for question in questions:
+            self.append(question)
+
+    def __len__(self) -> int:
+        return len(self.correct_answers)
+
+    def __getitem__(self, question_id: int) -> QuestionView:
+        if not 0 <= question_id < len(self.correct_answers):
+            raise IndexError("question id out of range")
+        return QuestionView(self, question_id)
+
+    def __iter__(self) -> Iterator[QuestionView]:
+        for question_id in range(len(self)):
+            yield QuestionView(self, question_id)
+
+    def append(self, question: Any) -> int:
+        """Store a Question (or anything shaped like one) and return its id."""
+        code = self._category_codes.get(question.category)
+        if code is None:
+            code = len(self.category_names)
+            self._category_codes[question.category] = code
+            self.category_names.append(question.category)
+
+        for string in [question.text] + list(question.options):
+            self.string_pool += string.encode("utf-8")
+            self.string_offsets.append(len(self.string_pool))
+        self.question_strings.append(len(self.string_offsets) - 1)
+
+        self.category_codes.append(code)
+        self.correct_answers.append(question.correct_answer)
+        return len(self) - 1
+
+    def _string(self, index: int) -> str:
+        start = self.string_offsets[index]
+        end = self.string_offsets[index + 1]
+        return self.string_pool[start:end].decode("utf-8")
+
+    def text(self, question_id: int) -> str:
+        """Return the text of a question."""
+        return self._string(self.question_strings[question_id])
+
+    def options(self, question_id: int) -> List[str]:
+        """Return the options of a question."""
+        first = self.question_strings[question_id] + 1
+        last = self.question_strings[question_id + 1]
+        return [self._string(i) for i in range(first, last)]
+
+    def correct_answer(self, question_id: int) -> int:
+        """Return the index of the correct option of a question."""
+        return self.correct_answers[question_id]
+
+    def category(self, question_id: int) -> str:
+        """Return the category name of a question."""
+        return self.category_names[self.category_codes[question_id]]
+
+    def nbytes(self) -> int:
+        """Return the number of bytes held by the store's buffers."""
+        buffers = (self.category_codes, self.correct_answers, self.string_pool,
+                   self.string_offsets, self.question_strings)
+        total = sum(sys.getsizeof(buffer) for buffer in buffers)
+        total += sum(sys.getsizeof(name) for name in self.category_names)
+        return total
+
+    def bytes_per_question(self) -> float:
+        """Return the average memory cost of one stored question."""
+        return self.nbytes() / max(len(self), 1)
+
+
+def object_bytes_per_question(questions: Iterable[Any]) -> float:
+    """Return the average memory cost of plain Question objects, for comparison.
+
+    Strings that are shared between questions (such as interned category
+    names) are only counted once.
+    """
+    seen = set()
+    total = 0
+    count = 0
+
+    def size(obj) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    for question in questions:
+        count += 1
+        total += size(question)
+        total += size(question.text) + size(question.category)
+        total += size(question.options) + sum(size(o) for o in question.options)
+    return total / max(count, 1)
+
+
+if __name__ == "__main__":
+    from question_loader import load_questions
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "questions.jsonl"
+    questions = list(load_questions(path))
+    store = QuestionStore(questions)
+    print(f"Questions:              {len(store)}")
+    print(f"Question objects:       {object_bytes_per_question(questions):.1f} bytes/question")
+    print(f"Columnar QuestionStore: {store.bytes_per_question():.1f} bytes/question")
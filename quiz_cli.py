@@ -0,0 +1,252 @@
+"""Terminal version of the quiz game.
+
+Plays a quiz with the same QuizEngine rules and timing as the GUI, without
+importing tkinter, so it starts quickly and works over SSH and inside
+containers. Answers are read a key at a time while a countdown runs::
+
+    python quiz_cli.py --questions 10 --time 20 --category Science
+    python quiz_cli.py my_questions.qbank
+
+Press 1-4 (or A-D) to answer and Q to quit. When standard input is not a
+terminal, answers are read from it one character at a time.
+"""
+import argparse
+import math
+import os
+import sys
+
+from question_loader import DEFAULT_BANK_PATH, QuestionFormatError, load_bank
+from quiz_engine import QuizEngine, QuizError
+from quiz_stats import StatsRecorder
+from timing_wheel import TimingWheel
+
+TIMER_TICK = 0.05
+OPTION_LETTERS = "ABCD"
+QUIT_KEYS = ("q", "Q", "\x03", "\x04")
+
+
+class KeyReader:
+    """Reads single key presses with a timeout, without blocking the countdown."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self.fd = self.stream.fileno()
+        self.interactive = self.stream.isatty()
+        self._saved_mode = None
+        self._eof = False
+
+    def __enter__(self) -> "KeyReader":
+        if self.interactive and os.name != "nt":
+            import termios
+            import tty
+            self._saved_mode = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._saved_mode is not None:
+            import termios
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved_mode)
+            self._saved_mode = None
+
+    def read_key(self, timeout=None):
+        """Return the next key pressed, or None if none arrived within timeout."""
+        if self._eof:
+            return "q"
+        if os.name == "nt" and self.interactive:
+            return self._read_console_key(timeout)
+
+        import select
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        data = os.read(self.fd, 1)
+        if not data:
+            # Standard input was closed: treat it like quitting
+            self._eof = True
+            return "q"
+        key = data.decode("latin-1")
+        if not self.interactive and key.isspace():
+            return None
+        return key
+
+    def _read_console_key(self, timeout):
+        import msvcrt
+        import time
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+        return msvcrt.getwch()
+
+
+class QuizGameCLI:
+    """Runs quizzes in a terminal on top of QuizEngine."""
+
+    def __init__(self, bank, keys: KeyReader, out=None):
+        self.bank = bank
+        self.keys = keys
+        self.out = out or sys.stdout
+        self.timer_wheel = TimingWheel(tick=TIMER_TICK)
+        self.engine = QuizEngine(bank, wheel=self.timer_wheel)
+        self.engine.on("question", self.display_current_question)
+        self.engine.on("answered", self.show_answer_feedback)
+        self.engine.on("timeout", self.show_timeout_feedback)
+        self.engine.on("finished", self.show_results)
+        self.stats = StatsRecorder(self.engine)
+        self.waiting_for_answer = False
+        self.shown_seconds = None
+
+    def write(self, text: str):
+        self.out.write(text)
+        self.out.flush()
+
+    def play(self, categories, num_questions: int, time_limit: int) -> bool:
+        """Play one quiz; return False if the player quit before the end."""
+        self.engine.start(categories, num_questions, time_limit)
+        while True:
+            if self.waiting_for_answer:
+                key = self.keys.read_key(TIMER_TICK)
+                if key in QUIT_KEYS:
+                    self.engine.stop()
+                    self.write("\n")
+                    return False
+                if key is not None:
+                    self.answer_key(key)
+                self.timer_wheel.advance()
+                if self.waiting_for_answer:
+                    self.update_timer_display()
+                continue
+
+            if not self.keys.interactive:
+                # Piped answers follow each other without a pause
+                if not self.engine.next():
+                    return True
+                continue
+            if self.engine.session.is_last_question():
+                prompt = "Press any key to see your results..."
+            else:
+                prompt = "Press any key for the next question..."
+            self.write(prompt)
+            key = self.keys.read_key()
+            self.write("\n")
+            if key in QUIT_KEYS:
+                return False
+            if not self.engine.next():
+                return True
+
+    def answer_key(self, key: str):
+        """Answer the current question if key names one of its options."""
+        options = self.engine.session.current_question().options
+        key = key.upper()
+        if key.isdigit():
+            answer_idx = int(key) - 1
+        elif key in OPTION_LETTERS:
+            answer_idx = OPTION_LETTERS.index(key)
+        else:
+            return
+        if 0 <= answer_idx < len(options):
+            self.engine.answer(answer_idx)
+
+    def display_current_question(self, session, question):
+        self.write(f"\nQuestion {session.current_index + 1}/{len(session)}"
+                   f"    Category: {question.category}\n\n{question.text}\n\n")
+        for i, option in enumerate(question.options):
+            self.write(f"  {OPTION_LETTERS[i]}. {option}\n")
+        self.write("\n")
+        self.waiting_for_answer = True
+        self.shown_seconds = None
+        self.update_timer_display()
+
+    def update_timer_display(self):
+        """Redraw the countdown line when the whole seconds left change."""
+        seconds = math.ceil(self.engine.remaining())
+        if seconds == self.shown_seconds:
+            return
+        if self.keys.interactive:
+            self.write(f"\rTime Remaining: {seconds:3d} seconds  Your answer: ")
+        elif self.shown_seconds is None:
+            self.write(f"Time Remaining: {seconds} seconds  Your answer: ")
+        self.shown_seconds = seconds
+
+    def show_answer_feedback(self, session, question, answer_idx, correct):
+        self.waiting_for_answer = False
+        self.write(f"{OPTION_LETTERS[answer_idx]}\n")
+        if correct:
+            self.write("Correct!\n")
+        else:
+            self.write(f"Incorrect! The correct answer was: "
+                       f"{question.options[question.correct_answer]}\n")
+
+    def show_timeout_feedback(self, session, question):
+        self.waiting_for_answer = False
+        self.write(f"\nTime's up! You didn't answer in time.\n"
+                   f"The correct answer was: {question.options[question.correct_answer]}\n")
+
+    def show_results(self, session, results):
+        self.write(f"\nQuiz Results\n\n"
+                   f"Final Score: {results.score}/{results.answered} ({results.percentage:.1f}%)\n"
+                   f"Average Time Per Question: {results.average_time:.2f} seconds\n")
+        answer_stats = self.stats.session.overall
+        if answer_stats.answered:
+            percentiles = answer_stats.percentiles()
+            self.write(f"Answer Time p50/p95/p99: {percentiles['p50']:.1f} / {percentiles['p95']:.1f} / "
+                       f"{percentiles['p99']:.1f} seconds\n")
+        self.write("\nPerformance by Category\n")
+        for category, stats in results.category_stats.items():
+            if stats["total"] > 0:
+                percentage = (stats["correct"] / stats["total"]) * 100
+                self.write(f"  {category}: {stats['correct']}/{stats['total']} ({percentage:.1f}%)\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play the quiz game in a terminal.")
+    parser.add_argument("bank", nargs="?", default=DEFAULT_BANK_PATH,
+                        help="question bank (.jsonl, .csv or compiled .qbank)")
+    parser.add_argument("--questions", type=int, default=5, help="number of questions")
+    parser.add_argument("--time", type=int, default=15, help="seconds per question")
+    parser.add_argument("--category", action="append", dest="categories",
+                        help="only ask questions from this category (may be repeated)")
+    parser.add_argument("--name", default="Player", help="player name the results are saved under")
+    parser.add_argument("--no-save", action="store_true", help="do not save the results")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="choose questions from the player's review schedule and ability")
+    args = parser.parse_args(argv)
+
+    try:
+        bank = load_bank(args.bank)
+    except (OSError, QuestionFormatError) as exc:
+        parser.exit(1, f"Could not load questions: {exc}\n")
+
+    categories = args.categories or bank.categories()
+    with KeyReader() as keys:
+        cli = QuizGameCLI(bank, keys)
+        scheduler = None
+        if args.adaptive:
+            from adaptive import AdaptiveScheduler
+            scheduler = AdaptiveScheduler.load(bank)
+            scheduler.attach(cli.engine)
+            cli.engine.selector = scheduler.player(args.name)
+        try:
+            finished = cli.play(categories, args.questions, args.time)
+        except QuizError as exc:
+            parser.exit(1, f"{exc.title}: {exc.message}\n")
+        except KeyboardInterrupt:
+            cli.engine.stop()
+            cli.write("\n")
+            return
+        finally:
+            if scheduler is not None:
+                scheduler.save()
+
+    if finished and not args.no_save:
+        # Imported here so saving results adds nothing to startup time
+        from results_store import ResultsStore
+        store = ResultsStore()
+        store.record_session(args.name, cli.engine.session, cli.engine.results())
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Client for the quiz server.
+
+QuizClient speaks the newline-delimited JSON protocol of quiz_server.py.
+Run this module to play a quiz in the terminal against a local server::
+
+    python quiz_client.py --port 8765 --name Alice
+"""
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, Optional
+
+from quiz_server import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE
+
+
+class QuizServerError(Exception):
+    """Raised when the server rejects a request."""
+
+
+class QuizClient:
+    """One connection to a quiz server."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.events: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "QuizClient":
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "QuizClient":
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if "event" in message:
+                    self.events.put_nowait(message)
+                    continue
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection to quiz server closed"))
+            self._pending.clear()
+
+    async def request(self, op: str, **params) -> Dict[str, Any]:
+        """Send one request and wait for its reply."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        params.update(id=request_id, op=op)
+        self.writer.write(json.dumps(params, separators=(",", ":")).encode("utf-8") + b"\n")
+        reply = await future
+        if not reply.get("ok"):
+            raise QuizServerError(reply.get("error", "request failed"))
+        return reply
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._reader_task.cancel()
+
+
+async def play(client: QuizClient, name: str, num_questions: int, time_limit: int,
+               room: Optional[str] = None):
+    """Play one quiz interactively in the terminal."""
+    loop = asyncio.get_running_loop()
+    await client.request("hello", name=name)
+    if room:
+        await client.request("join", room=room)
+
+    reply = await client.request("start", num_questions=num_questions, time_limit=time_limit)
+    question = reply["question"]
+    while True:
+        print(f"\nQuestion {question['index'] + 1}/{question['total']}  ({question['category']})")
+        print(question["text"])
+        for i, option in enumerate(question["options"]):
+            print(f"  {i + 1}. {option}")
+
+        choice = await loop.run_in_executor(None, input, "Your answer: ")
+        try:
+            reply = await client.request("answer", index=int(choice) - 1)
+        except (ValueError, QuizServerError):
+            reply = await client.request("timeout")
+            reply["timed_out"] = True
+        correct_text = question["options"][reply["correct_answer"]]
+        if reply.get("timed_out"):
+            print(f"No answer recorded. The correct answer was: {correct_text}")
+        elif reply["correct"]:
+            print("Correct!")
+        else:
+            print(f"Incorrect! The correct answer was: {correct_text}")
+
+        reply = await client.request("next")
+        if reply["finished"]:
+            break
+        question = reply["question"]
+
+    results = reply["results"]
+    print(f"\nFinal Score: {results['score']}/{results['answered']} ({results['percentage']:.1f}%)")
+    print(f"Average Time Per Question: {results['average_time']:.2f} seconds")
+    while not client.events.empty():
+        event = client.events.get_nowait()
+        if event["event"] == "finished":
+            print(f"{event['name']} finished with {event['score']}/{event['answered']}")
+
+
+async def run(args):
+    if args.unix:
+        client = await QuizClient.connect_unix(args.unix)
+    else:
+        client = await QuizClient.connect(args.host, args.port)
+    try:
+        await play(client, args.name, args.questions, args.time, args.room)
+    finally:
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a quiz against a quiz server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--name", default="Player")
+    parser.add_argument("--room", help="join a room so everyone gets the same questions")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--time", type=int, default=15)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Headless quiz engine.
+
+QuizEngine holds all of the quiz rules -- deck selection, timing, scoring
+and category stats -- without any user interface, so quizzes can be run
+without a display and many can be driven from one process. Front ends call
+start/answer/timeout/next/results and react to the events the engine emits:
+
+- ``question(session, question)``: a new question is being asked
+- ``answered(session, question, answer_idx, correct)``: an answer was recorded
+- ``timeout(session, question)``: time ran out on the current question
+- ``finished(session, results)``: the last question was completed
+
+Decks are drawn at random from the bank unless the engine is given a
+selector -- any object with the bank's ``sample(categories, k, rng)``
+method, such as an adaptive.PlayerSchedule.
+
+The options of every question are shown in a random order drawn from the
+engine's random generator, unless it is created with
+``shuffle_options=False``. Questions in events and answer indices are in
+displayed order (see quiz_session.ShuffledQuestion).
+
+Each question gets a deadline on the monotonic clock. When the engine is
+given a TimingWheel it schedules the deadline there and times out the
+question by itself; front ends only need to keep the wheel ticking.
+"""
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from quiz_session import QuizSession
+from timing_wheel import TimingWheel
+
+EVENTS = ("question", "answered", "timeout", "finished")
+
+
+class QuizError(Exception):
+    """Raised when a quiz cannot be started with the given settings."""
+
+    def __init__(self, title: str, message: str):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+class QuizResults(NamedTuple):
+    score: int
+    answered: int
+    total_time: float
+    category_stats: Dict[str, Dict[str, int]]
+
+    @property
+    def percentage(self) -> float:
+        return (self.score / self.answered) * 100 if self.answered else 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.answered if self.answered else 0.0
+
+
+class QuizEngine:
+    """Runs one quiz at a time against a shared question bank."""
+
+    def __init__(self, bank: Any, clock: Callable[[], float] = time.monotonic, rng=random,
+                 wheel: Optional[TimingWheel] = None, selector: Any = None, shuffle_options: bool = True):
+        self.bank = bank
+        self.clock = wheel.clock if wheel is not None else clock
+        self.rng = rng
+        self.wheel = wheel
+        self.selector = selector
+        self.shuffle_options = shuffle_options
+        self.session: Optional[QuizSession] = None
+        self.question_started = 0.0
+        self.deadline = 0.0
+        self._timer = None
+        self._listeners: Dict[str, List[Callable]] = {event: [] for event in EVENTS}
+
+    def on(self, event: str, callback: Callable) -> Callable:
+        """Call callback whenever event is emitted."""
+        if event not in self._listeners:
+            raise ValueError(f"Unknown quiz event: {event}")
+        self._listeners[event].append(callback)
+        return callback
+
+    def off(self, event: str, callback: Callable):
+        """Stop calling callback for event."""
+        self._listeners[event].remove(callback)
+
+    def _emit(self, event: str, *args):
+        for callback in self._listeners[event]:
+            callback(*args)
+
+    def start(self, categories: Iterable[str], num_questions: int, time_limit: int) -> QuizSession:
+        """Start a new quiz and ask its first question."""
+        categories = list(categories)
+        if not categories:
+            raise QuizError("No Categories", "Please select at least one category.")
+        if num_questions < 1 or time_limit < 1:
+            raise QuizError("Invalid Input", "Please enter valid numbers for settings.")
+        if not self.bank.count(categories):
+            raise QuizError("No Questions", "No questions available for selected categories.")
+
+        # Draw the required number of questions without shuffling the whole pool
+        selector = self.selector if self.selector is not None else self.bank
+        question_ids = selector.sample(categories, num_questions, self.rng)
+        if not question_ids:
+            # A weighted selector gives nothing when every weight is zero
+            raise QuizError("No Questions", "No questions match the selected weights.")
+
+        self._stop_timer()
+        self.session = QuizSession(self.bank, question_ids, time_limit,
+                                   self.rng if self.shuffle_options else None)
+        self._ask()
+        return self.session
+
+    def _ask(self):
+        self.question_started = self.clock()
+        self.deadline = self.question_started + self.session.time_limit
+        if self.wheel is not None:
+            self._timer = self.wheel.schedule(self.deadline, self._expire)
+        self._emit("question", self.session, self.session.current_question())
+
+    def _stop_timer(self):
+        if self._timer is not None:
+            self.wheel.cancel(self._timer)
+            self._timer = None
+
+    def stop(self):
+        """Abandon the current question, cancelling its deadline."""
+        self._stop_timer()
+
+    def _expire(self):
+        self._timer = None
+        if not self.session.is_answered():
+            self.timeout()
+
+    def elapsed(self) -> float:
+        """Return the seconds spent on the current question so far."""
+        return self.clock() - self.question_started
+
+    def remaining(self) -> float:
+        """Return the seconds left before the current question times out."""
+        return max(0.0, self.deadline - self.clock())
+
+    def answer(self, answer_idx: int) -> bool:
+        """Record an answer, as displayed, to the current question and return whether it was correct.
+
+        An answer that arrives after the deadline is recorded as a timeout.
+        """
+        if self.clock() >= self.deadline:
+            self.timeout()
+            return False
+        self._stop_timer()
+        question = self.session.current_question()
+        correct = self.session.record_answer(answer_idx, self.elapsed())
+        self._emit("answered", self.session, question, answer_idx, correct)
+        return correct
+
+    def timeout(self):
+        """Record that time ran out on the current question."""
+        self._stop_timer()
+        question = self.session.current_question()
+        self.session.record_timeout(self.elapsed())
+        self._emit("timeout", self.session, question)
+
+    def next(self) -> bool:
+        """Ask the next question; return False and finish when there is none."""
+        if self.session.advance():
+            self._ask()
+            return True
+        self._emit("finished", self.session, self.results())
+        return False
+
+    def results(self) -> QuizResults:
+        """Return the results of the current quiz so far."""
+        session = self.session
+        return QuizResults(session.score, session.answered_count, session.total_time,
+                           session.category_stats)
@@ -0,0 +1,144 @@
+"""Load generator for the quiz server.
+
+Opens many concurrent connections, plays quizzes on each of them and reports
+throughput and answer-to-ack latency percentiles::
+
+    python quiz_loadgen.py --spawn --clients 10000 --think-time 1.0
+
+With --spawn a server is started in a subprocess on the chosen address;
+otherwise an already running server is used.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from quiz_client import QuizClient, QuizServerError
+from quiz_server import DEFAULT_HOST, DEFAULT_PORT, raise_open_file_limit
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return the value at the given fraction of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class LoadStats:
+    def __init__(self):
+        self.answer_latencies: List[float] = []
+        self.requests = 0
+        self.quizzes = 0
+        self.errors = 0
+
+
+async def run_client(args, stats: LoadStats, start_delay: float):
+    await asyncio.sleep(start_delay)
+    try:
+        if args.unix:
+            client = await QuizClient.connect_unix(args.unix)
+        else:
+            client = await QuizClient.connect(args.host, args.port)
+    except OSError:
+        stats.errors += 1
+        return
+
+    try:
+        await client.request("hello", name=f"bot-{id(client)}")
+        stats.requests += 1
+        for _ in range(args.quizzes):
+            reply = await client.request("start", num_questions=args.questions, time_limit=60)
+            stats.requests += 1
+            while True:
+                if args.think_time:
+                    await asyncio.sleep(random.uniform(0, 2 * args.think_time))
+                options = len(reply["question"]["options"])
+                sent = time.perf_counter()
+                await client.request("answer", index=random.randrange(options))
+                stats.answer_latencies.append(time.perf_counter() - sent)
+                reply = await client.request("next")
+                stats.requests += 2
+                if reply["finished"]:
+                    break
+            stats.quizzes += 1
+    except (ConnectionError, OSError, QuizServerError):
+        stats.errors += 1
+    finally:
+        await client.close()
+
+
+async def run_load(args) -> LoadStats:
+    stats = LoadStats()
+    # Spread connection setup over the ramp-up period
+    tasks = [run_client(args, stats, args.ramp * i / args.clients) for i in range(args.clients)]
+    await asyncio.gather(*tasks)
+    return stats
+
+
+def _discard(stream):
+    for _ in stream:
+        pass
+
+
+def spawn_server(args) -> subprocess.Popen:
+    server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_server.py")
+    command = [sys.executable, server_script, "--bank", args.bank]
+    if args.unix:
+        command += ["--unix", args.unix]
+    else:
+        command += ["--host", args.host, "--port", str(args.port)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()  # Wait for the "listening" line
+    # Keep discarding what the server prints, so a full pipe never blocks it
+    threading.Thread(target=_discard, args=(server.stdout,), name="server-output", daemon=True).start()
+    return server
+
+
+def report(stats: LoadStats, elapsed: float):
+    latencies = sorted(stats.answer_latencies)
+    print(f"Quizzes completed:  {stats.quizzes}")
+    print(f"Requests:           {stats.requests} ({stats.requests / elapsed:.0f}/s)")
+    print(f"Errors:             {stats.errors}")
+    print(f"Elapsed:            {elapsed:.2f} s")
+    print("Answer-to-ack latency:")
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0)):
+        print(f"  {label}: {percentile(latencies, fraction) * 1000:.2f} ms")
+
+
+def main(argv: Optional[List[str]] = None):
+    from question_loader import DEFAULT_BANK_PATH
+
+    parser = argparse.ArgumentParser(description="Load-test the quiz server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--clients", type=int, default=1000, help="concurrent sessions")
+    parser.add_argument("--quizzes", type=int, default=1, help="quizzes played per session")
+    parser.add_argument("--questions", type=int, default=5, help="questions per quiz")
+    parser.add_argument("--think-time", type=float, default=0.5,
+                        help="mean seconds a bot waits before answering")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which to open connections")
+    parser.add_argument("--spawn", action="store_true", help="start a server in a subprocess")
+    parser.add_argument("--bank", default=DEFAULT_BANK_PATH, help="question bank for --spawn")
+    args = parser.parse_args(argv)
+
+    raise_open_file_limit()
+    server = spawn_server(args) if args.spawn else None
+    try:
+        started = time.perf_counter()
+        stats = asyncio.run(run_load(args))
+        report(stats, time.perf_counter() - started)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Asyncio multi-player quiz server.
+
+Every connection gets its own QuizEngine, and all engines share one
+question bank. Players may join a room; everyone in a room gets the same
+deck and is told when another member finishes. A room draws a new deck for
+each round, which starts when a member who already played the last deck
+starts again.
+
+The protocol is newline-delimited JSON. Each request is an object with an
+``op`` and an optional ``id`` that is echoed back in the reply::
+
+    {"id": 1, "op": "hello", "name": "Alice"}
+    {"id": 2, "op": "join", "room": "friday"}
+    {"id": 3, "op": "start", "categories": ["Science"], "num_questions": 5, "time_limit": 15}
+    {"id": 4, "op": "answer", "index": 2}
+    {"id": 5, "op": "timeout"}
+    {"id": 6, "op": "next"}
+    {"id": 7, "op": "results"}
+    {"id": 8, "op": "categories"}
+    {"id": 9, "op": "stats"}
+
+Replies carry ``"ok": true`` or ``"ok": false`` with an ``error`` message.
+Messages pushed by the server have an ``event`` key instead of an ``id``.
+A request line longer than MAX_LINE bytes gets an error reply and the
+connection is closed.
+
+Run a server with::
+
+    python quiz_server.py --port 8765
+    python quiz_server.py --unix /tmp/quiz.sock
+
+The bank file is watched while the server runs (see hot_reload): new
+quizzes get the latest questions and quizzes in progress keep the ones they
+started with. Pass --no-reload to turn this off.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+from typing import Any, Dict, Optional, Set
+
+from hot_reload import POLL_INTERVAL, BankReloader
+from quiz_engine import QuizEngine, QuizError
+from quiz_stats import AnswerStats, QuizStats, StatsRecorder
+from timing_wheel import TimingWheel
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LINE = 64 * 1024
+TIMER_TICK = 0.05  # Seconds between timing wheel ticks
+WRITE_BUFFER_LIMIT = 256 * 1024  # Wait for the socket to drain beyond this
+
+
+class RequestError(Exception):
+    """Raised for a request the server cannot carry out."""
+
+
+def question_payload(session: Any, question: Any) -> Dict[str, Any]:
+    """Describe the current question for a client."""
+    return {
+        "index": session.current_index,
+        "total": len(session),
+        "text": question.text,
+        "options": list(question.options),
+        "category": question.category,
+        "time_limit": session.time_limit,
+    }
+
+
+def results_payload(results: Any) -> Dict[str, Any]:
+    return {
+        "score": results.score,
+        "answered": results.answered,
+        "percentage": results.percentage,
+        "average_time": results.average_time,
+        "category_stats": results.category_stats,
+    }
+
+
+def stats_payload(stats: AnswerStats) -> Dict[str, Any]:
+    payload = {"answered": stats.answered, "timeouts": stats.timeouts, "correct": stats.correct,
+               "mean_time": stats.times.mean}
+    payload.update(stats.percentiles())
+    return payload
+
+
+class Room:
+    """A group of players that share one deck."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seed = 0
+        self.players: Set["PlayerConnection"] = set()
+        self.started: Set["PlayerConnection"] = set()  # Members who started this round's deck
+
+    def seed_for(self, player: "PlayerConnection") -> int:
+        """Return the seed of player's next deck, beginning a new round if they played this one."""
+        if not self.started or player in self.started:
+            self.seed = random.getrandbits(64)
+            self.started = set()
+        self.started.add(player)
+        return self.seed
+
+    def remove(self, player: "PlayerConnection"):
+        self.players.discard(player)
+        self.started.discard(player)
+
+    def broadcast(self, message: Dict[str, Any], exclude: Optional["PlayerConnection"] = None):
+        for player in self.players:
+            if player is not exclude:
+                player.send(message)
+
+
+class PlayerConnection:
+    """Protocol state for one connected player."""
+
+    def __init__(self, server: "QuizServer", reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.name = "Player"
+        self.room: Optional[Room] = None
+        self.engine = QuizEngine(server.bank, wheel=server.wheel)
+        self.engine.on("timeout", self.on_timeout)
+        self.engine.on("finished", self.on_finished)
+        # Finished quizzes are merged into the server-wide statistics
+        self.stats = StatsRecorder(self.engine, server.stats)
+
+    def send(self, message: Dict[str, Any]):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    line = await self.reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # The stream cannot find the end of an over-long line; give up on it
+                    self.send({"ok": False, "error": f"request longer than {MAX_LINE} bytes", "id": None})
+                    break
+                if not line:
+                    break
+                self.send(self.handle_line(line))
+                if self.writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                    await self.writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.engine.stop()
+            self.leave_room()
+            self.writer.close()
+
+    def handle_line(self, line: bytes) -> Dict[str, Any]:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            handler = getattr(self, "op_" + str(request.get("op")), None)
+            if handler is None:
+                raise RequestError(f"unknown op {request.get('op')!r}")
+            reply = handler(request)
+        except QuizError as e:
+            reply = {"ok": False, "error": e.message}
+        except (RequestError, KeyError, ValueError, TypeError, AttributeError) as e:
+            reply = {"ok": False, "error": str(e)}
+        else:
+            reply["ok"] = True
+        reply["id"] = request_id
+        return reply
+
+    def _session(self):
+        if self.engine.session is None:
+            raise RequestError("no quiz in progress, send 'start' first")
+        return self.engine.session
+
+    def op_hello(self, request):
+        self.name = str(request.get("name") or self.name)
+        return {"name": self.name}
+
+    def op_categories(self, request):
+        return {"categories": self.server.bank.categories()}
+
+    def op_stats(self, request):
+        stats = self.server.stats
+        return {
+            "overall": stats_payload(stats.overall),
+            "categories": {name: stats_payload(s) for name, s in stats.categories.items()},
+        }
+
+    def op_join(self, request):
+        self.leave_room()
+        name = str(request["room"])
+        self.room = self.server.rooms.get(name)
+        if self.room is None:
+            self.room = self.server.rooms[name] = Room(name)
+        self.room.players.add(self)
+        self.room.broadcast({"event": "joined", "room": name, "name": self.name}, exclude=self)
+        return {"room": name, "players": len(self.room.players)}
+
+    def leave_room(self):
+        if self.room is None:
+            return
+        self.room.remove(self)
+        if not self.room.players:
+            self.server.rooms.pop(self.room.name, None)
+        self.room = None
+
+    def op_start(self, request):
+        categories = request.get("categories") or self.server.bank.categories()
+        num_questions = int(request.get("num_questions", 5))
+        time_limit = int(request.get("time_limit", 15))
+        # New quizzes use the latest bank; running ones keep theirs
+        self.engine.bank = self.server.bank
+        # Room members draw the same deck
+        self.engine.rng = random.Random(self.room.seed_for(self)) if self.room else random
+        session = self.engine.start(categories, num_questions, time_limit)
+        return {"question": question_payload(session, session.current_question())}
+
+    def op_answer(self, request):
+        session = self._session()
+        question = session.current_question()
+        if not session.is_answered():
+            answer_idx = int(request["index"])
+            if not 0 <= answer_idx < len(question.options):
+                raise RequestError("answer index out of range")
+            self.engine.answer(answer_idx)
+        elif session.answer_record(session.current_index).answer is not None:
+            raise RequestError("the current question has already been answered")
+
+        # Late answers are recorded as time-outs; the reply uses the client's option order
+        question, record = session.review_entry(session.current_index)
+        return {"timed_out": record.answer is None,
+                "correct": record.answer == question.correct_answer,
+                "correct_answer": question.correct_answer, "score": session.score}
+
+    def op_timeout(self, request):
+        session = self._session()
+        if not session.is_answered():
+            self.engine.timeout()
+        elif session.answer_record(session.current_index).answer is not None:
+            raise RequestError("the current question has already been answered")
+        question = session.current_question()
+        return {"correct_answer": question.correct_answer, "score": session.score}
+
+    def op_next(self, request):
+        session = self._session()
+        if not session.is_answered():
+            raise RequestError("answer the current question first")
+        if self.engine.next():
+            return {"finished": False, "question": question_payload(session, session.current_question())}
+        return {"finished": True, "results": results_payload(self.engine.results())}
+
+    def op_results(self, request):
+        self._session()
+        return {"results": results_payload(self.engine.results())}
+
+    def on_timeout(self, session, question):
+        self.send({"event": "timeout", "index": session.current_index,
+                   "correct_answer": question.correct_answer})
+
+    def on_finished(self, session, results):
+        if self.room is not None:
+            self.room.broadcast({"event": "finished", "room": self.room.name, "name": self.name,
+                                 "score": results.score, "answered": results.answered}, exclude=self)
+
+
+class QuizServer:
+    """Hosts quiz sessions for many concurrent connections."""
+
+    def __init__(self, bank: Any):
+        self.bank = bank
+        self.rooms: Dict[str, Room] = {}
+        self.connections = 0
+        self.stats = QuizStats()
+        # One wheel serves the deadlines of every session
+        self.wheel = TimingWheel(tick=TIMER_TICK)
+
+    async def run_timers(self):
+        """Advance the timing wheel until cancelled."""
+        while True:
+            await asyncio.sleep(TIMER_TICK)
+            self.wheel.advance()
+
+    async def watch_bank(self, reloader: BankReloader):
+        """Serve new quizzes from the latest snapshot of the bank file until cancelled."""
+        error = None
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            snapshot = reloader.poll()
+            if snapshot is not None:
+                self.bank = snapshot
+                print(f"Reloaded the question bank: {len(snapshot)} questions", flush=True)
+            if reloader.error != error:
+                error = reloader.error
+                if error:
+                    print(f"Could not reload the question bank: {error}", flush=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            await PlayerConnection(self, reader, writer).run()
+        finally:
+            self.connections -= 1
+
+    async def start_tcp(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port,
+                                          limit=MAX_LINE, backlog=4096)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self.handle_connection, path,
+                                               limit=MAX_LINE, backlog=4096)
+
+
+def raise_open_file_limit():
+    """Allow as many open sockets as the system permits."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def serve(bank: Any, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                unix_path: Optional[str] = None, reload_path: Optional[str] = None):
+    """Run a quiz server until cancelled, reloading the bank when reload_path changes."""
+    reloader = None
+    if reload_path:
+        reloader = BankReloader(reload_path, bank)
+        bank = reloader.snapshot
+    server = QuizServer(bank)
+    # Keep the long-lived bank out of garbage collection passes
+    gc.freeze()
+    if unix_path:
+        listener = await server.start_unix(unix_path)
+    else:
+        listener = await server.start_tcp(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Quiz server listening on {addresses}", flush=True)
+    tasks = [asyncio.ensure_future(server.run_timers())]
+    if reloader is not None:
+        tasks.append(asyncio.ensure_future(server.watch_bank(reloader)))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def main():
+    from question_loader import DEFAULT_BANK_PATH, load_bank
+
+    parser = argparse.ArgumentParser(description="Run the multi-player quiz server.")
+    parser.add_argument("--bank", default=DEFAULT_BANK_PATH, help="question bank (.jsonl, .csv or .qbank)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--no-reload", action="store_true", help="ignore changes to the bank file")
+    args = parser.parse_args()
+
+    raise_open_file_limit()
+    try:
+        asyncio.run(serve(load_bank(args.bank), args.host, args.port, args.unix,
+                          None if args.no_reload else args.bank))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
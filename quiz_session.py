@@ -0,0 +1,231 @@
+"""Per-player quiz state, kept separate from the shared question bank.
+
+Questions are read-only and may be shared by any number of sessions. A
+QuizSession only stores the ids of the questions in its deck and a compact
+answer record for every question that has been asked, so its memory grows
+with the number of questions asked rather than with the bank.
+
+A session given a random generator also shuffles the options of every
+question it asks, so the right answer is not always behind the same letter.
+Only the Lehmer code of each question's option order is stored (one small
+integer per asked question); current_question() returns a ShuffledQuestion
+view that reads the bank's options through that order without copying them.
+Everything the player sees and answers is in displayed order, while
+answer_record() keeps answers in the bank's stored order for saving::
+
+    session = QuizSession(bank, question_ids, 15, rng=random.Random(7))
+    question = session.current_question()
+    question.options[0]            # the option shown first
+    question.correct_answer        # its displayed position
+    question.original_index(0)     # its position in the bank
+"""
+import math
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+NO_ANSWER = -1  # Stored answer when the player ran out of time
+FACTORIALS = tuple(math.factorial(n) for n in range(13))  # Option orders of n options; codes fit in "I"
+
+
+class AnswerRecord(NamedTuple):
+    question_id: int
+    answer: Optional[int]  # Index of the chosen option, or None on time-out
+    time_taken: float
+
+
+def encode_permutation(order: Sequence[int]) -> int:
+    """Return the Lehmer code (rank) of a permutation of range(len(order))."""
+    code = 0
+    for i, value in enumerate(order):
+        smaller_after = sum(1 for later in order[i + 1:] if later < value)
+        code += smaller_after * FACTORIALS[len(order) - 1 - i]
+    return code
+
+
+@lru_cache(maxsize=4096)
+def decode_permutation(code: int, n: int) -> Tuple[int, ...]:
+    """Return the permutation of range(n) with the given Lehmer code."""
+    remaining = list(range(n))
+    order = []
+    for i in range(n - 1, -1, -1):
+        digit, code = divmod(code, FACTORIALS[i])
+        order.append(remaining.pop(digit))
+    return tuple(order)
+
+
+class PermutedOptions(Sequence):
+    """A question's options in displayed order; reads through to the original list."""
+
+    __slots__ = ("_options", "_order")
+
+    def __init__(self, options: Sequence[str], order: Tuple[int, ...]):
+        self._options = options
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._options[i] for i in self._order[index]]
+        return self._options[self._order[index]]
+
+    def __repr__(self):
+        return f"PermutedOptions({list(self)!r})"
+
+
+class ShuffledQuestion:
+    """A Question-like view of a question with its options shown in another order."""
+
+    __slots__ = ("question", "order", "correct_answer")
+
+    def __init__(self, question: Any, order: Tuple[int, ...]):
+        self.question = question
+        self.order = order  # order[displayed index] == original index
+        self.correct_answer = order.index(question.correct_answer)  # Displayed index
+
+    @property
+    def text(self) -> str:
+        return self.question.text
+
+    @property
+    def category(self) -> str:
+        return self.question.category
+
+    @property
+    def options(self) -> PermutedOptions:
+        return PermutedOptions(self.question.options, self.order)
+
+    def original_index(self, displayed: int) -> int:
+        """Return the bank's index of the option shown at displayed."""
+        return self.order[displayed]
+
+    def displayed_index(self, original: int) -> int:
+        """Return where the bank's option original is shown."""
+        return self.order.index(original)
+
+    def __repr__(self):
+        return f"ShuffledQuestion({self.question!r}, {self.order})"
+
+
+class QuizSession:
+    """One player's run through a deck of questions."""
+
+    def __init__(self, bank: Any, question_ids: Sequence[int], time_limit: int, rng=None):
+        self.bank = bank
+        self.question_ids = array("I", question_ids)
+        self.time_limit = time_limit
+        self.current_index = 0
+        self.score = 0
+        self.total_time = 0.0
+        self.category_stats: Dict[str, Dict[str, int]] = {}
+
+        # One entry per asked question
+        self._answers = array("b")  # Chosen option in the bank's order
+        self._times = array("d")
+        # Option order of every asked question, when shuffling
+        self._rng = rng
+        self._orders = array("I") if rng is not None else None
+
+        # Initialize category stats
+        for question in self.deck():
+            if question.category not in self.category_stats:
+                self.category_stats[question.category] = {"correct": 0, "total": 0}
+
+        self._current = self._ask(0) if self.question_ids else None
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def _ask(self, index: int) -> Any:
+        """Return the index-th question as shown, drawing its option order."""
+        question = self.bank[self.question_ids[index]]
+        if self._orders is None:
+            return question
+        n = len(question.options)
+        self._orders.append(self._rng.randrange(FACTORIALS[n]))
+        return ShuffledQuestion(question, decode_permutation(self._orders[index], n))
+
+    def question(self, index: int) -> Any:
+        """Return the index-th asked question as it was shown to the player."""
+        question = self.bank[self.question_ids[index]]
+        if self._orders is None:
+            return question
+        return ShuffledQuestion(question, decode_permutation(self._orders[index], len(question.options)))
+
+    def deck(self) -> Iterator[Any]:
+        """Yield the questions of the deck in order."""
+        for question_id in self.question_ids:
+            yield self.bank[question_id]
+
+    def current_question(self) -> Any:
+        """Return the question currently being asked."""
+        return self._current
+
+    def is_last_question(self) -> bool:
+        return self.current_index >= len(self.question_ids) - 1
+
+    def is_answered(self) -> bool:
+        """Return whether the current question already has a record."""
+        return len(self._answers) > self.current_index
+
+    def _record(self, answer: int, time_taken: float):
+        if self.is_answered():
+            raise RuntimeError("The current question has already been answered")
+        question = self._current
+        self._answers.append(answer)
+        self._times.append(time_taken)
+        self.total_time += time_taken
+        self.category_stats[question.category]["total"] += 1
+        return question
+
+    def record_answer(self, answer_idx: int, time_taken: float) -> bool:
+        """Record the player's answer, given as displayed, and return whether it was correct."""
+        question = self._current
+        stored = answer_idx if self._orders is None else question.original_index(answer_idx)
+        self._record(stored, time_taken)
+        correct = answer_idx == question.correct_answer
+        if correct:
+            self.score += 1
+            self.category_stats[question.category]["correct"] += 1
+        return correct
+
+    def record_timeout(self, time_taken: float):
+        """Record that the player did not answer in time."""
+        self._record(NO_ANSWER, time_taken)
+
+    def advance(self) -> bool:
+        """Move to the next question; return False when the deck is finished."""
+        if self.is_last_question():
+            return False
+        self.current_index += 1
+        self._current = self._ask(self.current_index)
+        return True
+
+    @property
+    def answered_count(self) -> int:
+        return len(self._answers)
+
+    def answer_record(self, index: int) -> AnswerRecord:
+        """Return the record of the index-th asked question, with the answer in the bank's order."""
+        answer = self._answers[index]
+        return AnswerRecord(
+            self.question_ids[index],
+            None if answer == NO_ANSWER else answer,
+            self._times[index]
+        )
+
+    def review_entry(self, index: int) -> Tuple[Any, AnswerRecord]:
+        """Return the index-th asked question and its record, both as shown to the player."""
+        question = self.question(index)
+        record = self.answer_record(index)
+        if self._orders is not None and record.answer is not None:
+            record = record._replace(answer=question.displayed_index(record.answer))
+        return question, record
+
+    def history(self) -> Iterator[Tuple[Any, AnswerRecord]]:
+        """Yield (question, record) pairs for every asked question."""
+        for index in range(len(self._answers)):
+            record = self.answer_record(index)
+            yield self.bank[record.question_id], record
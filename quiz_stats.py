@@ -0,0 +1,236 @@
+"""Streaming statistics for answers and response times.
+
+Every answer updates a handful of small, fixed-size summaries instead of
+being kept in a list, so statistics for one quiz and for millions of them
+cost the same memory and the same time to query:
+
+- RunningStats: count, mean, variance, min and max (Welford's method)
+- LogHistogram: response-time quantiles with a bounded relative error
+- AnswerStats: both of the above plus correct/answered/timeout counts
+
+All of them can be merged, so per-session statistics can be folded into
+server-wide ones, or statistics from several processes combined. QuizStats
+keeps AnswerStats overall, per category and per question, and StatsRecorder
+fills one in from a QuizEngine's events::
+
+    recorder = StatsRecorder(engine)
+    ...
+    recorder.session.overall.percentiles()  # {"p50": 4.2, "p95": 11.0, "p99": 13.8}
+"""
+import math
+from typing import Dict, Iterator, Optional, Tuple
+
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of values in constant memory."""
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "RunningStats"):
+        """Add another RunningStats' values to this one."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class LogHistogram:
+    """Quantile sketch with logarithmic buckets.
+
+    Bucket boundaries grow geometrically, so any quantile is estimated
+    within ``relative_error`` of the true value. Values below
+    ``min_value`` share the first bucket; the number of buckets is bounded
+    by the spread of the values, not by how many there are.
+    """
+
+    __slots__ = ("relative_error", "min_value", "count", "_gamma", "_log_gamma", "_buckets")
+
+    def __init__(self, relative_error: float = 0.01, min_value: float = 0.001):
+        self.relative_error = relative_error
+        self.min_value = min_value
+        self.count = 0
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(max(value, self.min_value)) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1):
+        index = self._index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "LogHistogram"):
+        """Add another histogram's values; both must use the same relative error."""
+        if other._gamma != self._gamma:
+            raise ValueError("Cannot merge histograms with different relative errors")
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += other.count
+
+    def quantile(self, fraction: float) -> float:
+        """Return the value below which the given fraction of values fall."""
+        if not self.count:
+            return 0.0
+        rank = fraction * (self.count - 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i]
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def buckets(self) -> Iterator[Tuple[float, int]]:
+        """Yield (upper bound, count) for every non-empty bucket in order."""
+        for index in sorted(self._buckets):
+            yield self._gamma ** index, self._buckets[index]
+
+
+class AnswerStats:
+    """Accuracy and response-time statistics for a group of answers.
+
+    Timed-out questions count towards accuracy but not towards response times.
+    """
+
+    __slots__ = ("correct", "answered", "timeouts", "times", "histogram")
+
+    def __init__(self):
+        self.correct = 0
+        self.answered = 0
+        self.timeouts = 0
+        self.times = RunningStats()
+        self.histogram = LogHistogram()
+
+    @property
+    def total(self) -> int:
+        return self.answered + self.timeouts
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    def add_answer(self, time_taken: float, correct: bool):
+        self.answered += 1
+        if correct:
+            self.correct += 1
+        self.times.add(time_taken)
+        self.histogram.add(time_taken)
+
+    def add_timeout(self):
+        self.timeouts += 1
+
+    def merge(self, other: "AnswerStats"):
+        self.correct += other.correct
+        self.answered += other.answered
+        self.timeouts += other.timeouts
+        self.times.merge(other.times)
+        self.histogram.merge(other.histogram)
+
+    def quantile(self, fraction: float) -> float:
+        """Return a response-time quantile, clamped to the times actually seen."""
+        if not self.times.count:
+            return 0.0
+        return min(max(self.histogram.quantile(fraction), self.times.min), self.times.max)
+
+    def percentiles(self) -> Dict[str, float]:
+        """Return the p50, p95 and p99 response times in seconds."""
+        return {name: self.quantile(fraction) for name, fraction in PERCENTILES}
+
+
+class QuizStats:
+    """AnswerStats overall, per category and per question id."""
+
+    def __init__(self):
+        self.overall = AnswerStats()
+        self.categories: Dict[str, AnswerStats] = {}
+        self.questions: Dict[int, AnswerStats] = {}
+
+    def _groups(self, question_id: int, category: str) -> Tuple[AnswerStats, AnswerStats, AnswerStats]:
+        by_category = self.categories.get(category)
+        if by_category is None:
+            by_category = self.categories[category] = AnswerStats()
+        by_question = self.questions.get(question_id)
+        if by_question is None:
+            by_question = self.questions[question_id] = AnswerStats()
+        return self.overall, by_category, by_question
+
+    def record_answer(self, question_id: int, category: str, time_taken: float, correct: bool):
+        for stats in self._groups(question_id, category):
+            stats.add_answer(time_taken, correct)
+
+    def record_timeout(self, question_id: int, category: str):
+        for stats in self._groups(question_id, category):
+            stats.add_timeout()
+
+    def merge(self, other: "QuizStats"):
+        """Fold another QuizStats into this one."""
+        self.overall.merge(other.overall)
+        for category, stats in other.categories.items():
+            self.categories.setdefault(category, AnswerStats()).merge(stats)
+        for question_id, stats in other.questions.items():
+            self.questions.setdefault(question_id, AnswerStats()).merge(stats)
+
+
+class StatsRecorder:
+    """Keeps QuizStats for an engine's current session and for all finished ones.
+
+    ``session`` is replaced when a new quiz starts; when a quiz finishes it is
+    merged into ``overall``, which may be shared by several recorders.
+    """
+
+    def __init__(self, engine, overall: Optional[QuizStats] = None):
+        self.session = QuizStats()
+        self.overall = overall if overall is not None else QuizStats()
+        engine.on("question", self._on_question)
+        engine.on("answered", self._on_answered)
+        engine.on("timeout", self._on_timeout)
+        engine.on("finished", self._on_finished)
+
+    def _on_question(self, session, question):
+        if session.current_index == 0:
+            self.session = QuizStats()
+
+    def _on_answered(self, session, question, answer_idx, correct):
+        index = session.current_index
+        self.session.record_answer(session.question_ids[index], question.category,
+                                   session.answer_record(index).time_taken, correct)
+
+    def _on_timeout(self, session, question):
+        self.session.record_timeout(session.question_ids[session.current_index], question.category)
+
+    def _on_finished(self, session, results):
+        self.overall.merge(self.session)
@@ -1,20 +1,39 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
+import math
+import os
+import sys
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-class Question:
-    def __init__(self, text: str, options: List[str], correct_answer: int, category: str):
-        self.text = text
-        self.options = options
-        self.correct_answer = correct_answer  # Index of the correct answer
-        self.category = category
-        self.user_answer = None
-        self.time_taken = 0
+from adaptive import AdaptiveScheduler
+from alias_sampler import DIFFICULTY_BANDS, WeightedSampler
+from deck_cache import DeckCache
+from hot_reload import POLL_INTERVAL, BankReloader
+from question_bank import Question, QuestionBank
+from quiz_engine import QuizEngine, QuizError
+from quiz_stats import StatsRecorder
+from results_store import DEFAULT_RESULTS_PATH, ResultsStore
+from search_index import SearchIndex, index_path
+from question_loader import DEFAULT_BANK_PATH, MAX_OPTIONS, QuestionFormatError, batched, load_bank, load_questions
+from timing_wheel import TimingWheel
+
+LOAD_BATCH_SIZE = 2000  # Questions loaded per event-loop slice
+TIMER_TICK_MS = 50  # How often the countdown is refreshed
+SEARCH_DELAY_MS = 150  # Pause in typing before the search runs
+SEARCH_LIMIT = 50  # Results shown in the search window
+METRICS_ENV = "QUIZ_METRICS"  # Export hot-path timings to this file (.prom or JSON lines)
+REVIEW_TEXT_CHARS = 140  # Question text that fits in a review row; the rest is shown on request
+REVIEW_OPTION_CHARS = 80  # Option text that fits on one line of a review row
+
+
+def shorten(text, limit):
+    """Return text cut to at most limit characters, ending in an ellipsis if it was cut."""
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "\u2026"
 
 class QuizGameGUI:
-    def __init__(self, root):
+    def __init__(self, root, bank_path: Optional[str] = None, results_path: str = DEFAULT_RESULTS_PATH,
+                 instrumentation: Any = None):
         self.root = root
         self.root.title("Python Quiz Game")
         self.root.geometry("800x600")
@@ -23,108 +42,149 @@ class QuizGameGUI:
         # Set icon (optional)
         # self.root.iconbitmap("quiz_icon.ico")
         
-        self.questions = []
-        self.current_question_index = 0
-        self.score = 0
-        self.total_time = 0
-        self.question_history = []
-        self.category_stats = {}
+        self.bank_path = bank_path or DEFAULT_BANK_PATH
+        self.questions = QuestionBank()
+        self.question_scale = None
+        self.reloader = None  # Watches the bank file once it has loaded
         self.time_limit = 15  # Default time limit in seconds
         self.num_questions = 5  # Default number of questions
-        self.remaining_time = 0
+        self.player_name = "Player"
+        self.adaptive = False
+        self.scheduler = None  # Loaded the first time question ratings are needed
+        self.retired_scheduler = None  # Replaced by a reload; kept until its quiz is over
+        self.category_weights = {}  # Relative weight per category; 1 if missing
+        self.difficulty_weights = {band: 1.0 for band in DIFFICULTY_BANDS}
+        self.sampler = None
+        self.sampler_key = None
+        self.search_index = None  # Loaded the first time the search window opens
+        self.search_window = None
+        self.search_job = None
         self.timer_running = False
         self.timer_id = None
+        self.timer_wheel = TimingWheel(tick=TIMER_TICK_MS / 1000)
+        
+        # Time the hot paths before the engine and Tk hold references to them
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.instrument(self)
+            instrumentation.watch_event_loop(self.root)
         
         # Initialize questions
         self.initialize_questions()
         
+        # Decks for the usual settings are drawn ahead of time in the background
+        self.deck_cache = DeckCache(self.questions)
+        
+        # The engine runs the quiz; this class only draws it
+        self.engine = QuizEngine(self.questions, wheel=self.timer_wheel)
+        self.engine.on("question", self.display_current_question)
+        self.engine.on("answered", self.show_answer_feedback)
+        self.engine.on("timeout", self.show_timeout_feedback)
+        self.engine.on("finished", self.show_results)
+        self.stats = StatsRecorder(self.engine)
+        
+        # Finished quizzes are saved from a background thread
+        self.results_store = ResultsStore(results_path)
+        
         # Create frames
         self.create_frames()
         
         # Show welcome screen
         self.show_welcome_screen()
+        
+        # Start the timer tick
+        self.update_timer()
+        
+        # Pick up changes to the bank file without a restart
+        self.root.after(int(POLL_INTERVAL * 1000), self.poll_bank_file)
     
     def initialize_questions(self):
-        """Add questions to the quiz."""
-        # Science questions
-        self.questions.append(Question(
-            "What is the chemical symbol for gold?",
-            ["Go", "Au", "Ag", "Gd"],
-            1,
-            "Science"
-        ))
-        self.questions.append(Question(
-            "Which planet is known as the Red Planet?",
-            ["Venus", "Jupiter", "Mars", "Saturn"],
-            2,
-            "Science"
-        ))
-        self.questions.append(Question(
-            "What is the hardest natural substance on Earth?",
-            ["Titanium", "Platinum", "Gold", "Diamond"],
-            3,
-            "Science"
-        ))
-        
-        # History questions
-        self.questions.append(Question(
-            "In which year did World War II end?",
-            ["1943", "1945", "1947", "1950"],
-            1,
-            "History"
-        ))
-        self.questions.append(Question(
-            "Who was the first President of the United States?",
-            ["Thomas Jefferson", "John Adams", "George Washington", "Benjamin Franklin"],
-            2,
-            "History"
-        ))
-        self.questions.append(Question(
-            "Which ancient civilization built the Machu Picchu?",
-            ["Aztecs", "Mayans", "Incas", "Olmecs"],
-            2,
-            "History"
-        ))
-        
-        # Geography questions
-        self.questions.append(Question(
-            "What is the capital of Australia?",
-            ["Sydney", "Melbourne", "Canberra", "Perth"],
-            2,
-            "Geography"
-        ))
-        self.questions.append(Question(
-            "Which is the longest river in the world?",
-            ["Amazon", "Nile", "Yangtze", "Mississippi"],
-            1,
-            "Geography"
-        ))
-        self.questions.append(Question(
-            "Which country has the largest population?",
-            ["India", "United States", "Russia", "China"],
-            0,
-            "Geography"
-        ))
-        
-        # Entertainment questions
-        self.questions.append(Question(
-            "Who directed the movie 'Inception'?",
-            ["Steven Spielberg", "James Cameron", "Christopher Nolan", "Quentin Tarantino"],
-            2,
-            "Entertainment"
-        ))
-        self.questions.append(Question(
-            "Which band performed the album 'Dark Side of the Moon'?",
-            ["The Beatles", "Led Zeppelin", "Pink Floyd", "The Rolling Stones"],
-            2,
-            "Entertainment"
-        ))
-        self.questions.append(Question(
-            "Who wrote the Harry Potter series?",
-            ["J.R.R. Tolkien", "J.K. Rowling", "George R.R. Martin", "Stephen King"],
-            1,
-            "Entertainment"
-        ))
+        """Start streaming questions from the bank file.
+
+        The first batch is loaded straight away so the settings screen has
+        something to show; the rest is loaded in small slices from the Tk
+        event loop so the UI stays responsive on large banks. Compiled .qbank
+        files are memory-mapped instead and need no loading at all.
+        """
+        if self.bank_path.endswith(".qbank"):
+            self.questions = load_bank(self.bank_path)
+            self.loading_questions = False
+            return
+        
+        self.loading_questions = True
+        self._question_batches = batched(load_questions(self.bank_path), LOAD_BATCH_SIZE)
+        self.load_question_batch(reschedule=False)
+        if self.loading_questions:
+            self.root.after(1, self.load_question_batch)
+    
+    def load_question_batch(self, reschedule=True):
+        """Load the next batch of questions from the bank file."""
+        try:
+            batch = next(self._question_batches, None)
+        except QuestionFormatError as e:
+            messagebox.showerror("Invalid Question Bank", str(e))
+            batch = None
+        
+        if batch is None:
+            self.loading_questions = False
+            return
+        
+        self.questions.extend(batch)
+        
+        # Let an open settings screen offer the new questions
+        if self.question_scale is not None and self.question_scale.winfo_exists():
+            self.question_scale.config(to=len(self.questions))
+        
+        if reschedule:
+            self.root.after(1, self.load_question_batch)
+    
+    def poll_bank_file(self):
+        """Switch to a new snapshot of the bank once a background reload has read it."""
+        if not self.loading_questions:
+            if self.reloader is None:
+                # From now on quizzes are played on read-only snapshots of the bank
+                self.reloader = BankReloader(self.bank_path, self.questions)
+                self.install_bank(self.reloader.snapshot)
+            else:
+                snapshot = self.reloader.poll()
+                if snapshot is not None:
+                    self.install_bank(snapshot)
+        self.root.after(int(POLL_INTERVAL * 1000), self.poll_bank_file)
+    
+    def install_bank(self, bank):
+        """Use bank for new quizzes; a quiz in progress keeps the bank it started with."""
+        rebuilt = getattr(bank, "rebuilt", False)
+        self.questions = bank
+        self.engine.bank = bank
+        self.deck_cache.set_bank(bank)
+        self.sampler_key = None
+        
+        # Ratings and the search index use question ids, which a rebuild may change
+        if self.scheduler is not None:
+            if rebuilt:
+                # Reloaded against the new bank when next needed, as after a restart.
+                # A quiz it is choosing for keeps recording its answers in it.
+                self.retire_scheduler()
+                self.retired_scheduler, self.scheduler = self.scheduler, None
+                selector = self.engine.selector
+                if getattr(selector, "scheduler", None) is not self.retired_scheduler:
+                    self.retire_scheduler()
+            else:
+                self.scheduler.bank = bank
+        if self.search_index is not None:
+            if rebuilt:
+                self.search_index = SearchIndex()
+            self.index_question_batch()
+        
+        if self.question_scale is not None and self.question_scale.winfo_exists():
+            self.question_scale.config(to=len(bank))
+    
+    def retire_scheduler(self):
+        """Save and detach a scheduler replaced by a reload, once its quiz is over."""
+        if self.retired_scheduler is not None:
+            self.retired_scheduler.detach()
+            self.retired_scheduler.save()
+            self.retired_scheduler = None
     
     def create_frames(self):
         """Create the main frames for the GUI."""
@@ -137,6 +197,7 @@ class QuizGameGUI:
         
         # Quiz frame
         self.quiz_frame = tk.Frame(self.root, bg="#f0f0f0")
+        self.build_quiz_screen()
         
         # Results frame
         self.results_frame = tk.Frame(self.root, bg="#f0f0f0")
@@ -182,6 +243,21 @@ class QuizGameGUI:
         )
         start_button.pack(pady=(0, 20))
         
+        # Search button
+        search_button = tk.Button(
+            self.welcome_frame,
+            text="Search Questions",
+            command=self.show_search_window,
+            font=("Arial", 14),
+            bg="#2196F3",
+            fg="white",
+            padx=20,
+            pady=10,
+            relief=tk.FLAT,
+            activebackground="#1976D2"
+        )
+        search_button.pack(pady=(0, 20))
+        
         # Exit button
         exit_button = tk.Button(
             self.welcome_frame,
@@ -197,6 +273,131 @@ class QuizGameGUI:
         )
         exit_button.pack()
     
+    def show_search_window(self):
+        """Open a window for searching the question bank."""
+        if self.search_window is not None:
+            self.search_window.lift()
+            return
+        
+        if self.search_index is None:
+            # A saved index is read straight away; new questions are indexed in slices
+            self.search_index = SearchIndex.load(self.questions, index_path(self.bank_path), index_new=False)
+            self.index_question_batch()
+        
+        self.search_window = tk.Toplevel(self.root)
+        self.search_window.title("Search Questions")
+        self.search_window.geometry("650x500")
+        self.search_window.configure(bg="#f0f0f0")
+        self.search_window.protocol("WM_DELETE_WINDOW", self.close_search_window)
+        
+        # Search box
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(
+            self.search_window,
+            textvariable=self.search_var,
+            font=("Arial", 14)
+        )
+        search_entry.pack(fill="x", padx=20, pady=(20, 5))
+        search_entry.focus_set()
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        
+        self.search_status = tk.Label(
+            self.search_window,
+            text="Type to search questions, options and categories",
+            font=("Arial", 10),
+            bg="#f0f0f0",
+            fg="#555555",
+            anchor="w"
+        )
+        self.search_status.pack(fill="x", padx=20)
+        
+        # Results
+        results_frame = tk.Frame(self.search_window, bg="#f0f0f0")
+        results_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        scrollbar = ttk.Scrollbar(results_frame, orient="vertical")
+        self.search_results = tk.Listbox(
+            results_frame,
+            font=("Arial", 11),
+            activestyle="none",
+            yscrollcommand=scrollbar.set
+        )
+        scrollbar.config(command=self.search_results.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.search_results.pack(side="left", fill="both", expand=True)
+        self.search_results.bind("<<ListboxSelect>>", self.show_search_result)
+        self.search_result_ids = []
+        
+        # Details of the selected question
+        self.search_details = tk.Label(
+            self.search_window,
+            text="",
+            font=("Arial", 11),
+            bg="#f0f0f0",
+            justify="left",
+            anchor="w",
+            wraplength=600
+        )
+        self.search_details.pack(fill="x", padx=20, pady=(0, 20))
+    
+    def close_search_window(self):
+        """Close the search window."""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        self.search_window.destroy()
+        self.search_window = None
+    
+    def index_question_batch(self):
+        """Add the next slice of loaded questions to the search index."""
+        added = self.search_index.update(self.questions, LOAD_BATCH_SIZE)
+        if added or self.loading_questions:
+            self.root.after(1, self.index_question_batch)
+        elif self.search_window is not None and self.search_var.get():
+            # Show the results for the whole bank
+            self.run_search()
+    
+    def schedule_search(self):
+        """Search once typing pauses."""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY_MS, self.run_search)
+    
+    def run_search(self):
+        """Search for the text in the search box and list the results."""
+        self.search_job = None
+        query = self.search_var.get()
+        start = time.perf_counter()
+        results = self.search_index.search(query, SEARCH_LIMIT)
+        elapsed = time.perf_counter() - start
+        
+        self.search_results.delete(0, tk.END)
+        self.search_result_ids = [question_id for question_id, _ in results]
+        for question_id in self.search_result_ids:
+            question = self.questions[question_id]
+            self.search_results.insert(tk.END, f"[{question.category}] {question.text}")
+        self.search_details.config(text="")
+        
+        if not query.strip():
+            status = "Type to search questions, options and categories"
+        else:
+            status = f"{len(results)} results in {elapsed * 1000:.1f} ms"
+        if len(self.search_index) < len(self.questions) or self.loading_questions:
+            status += f" (indexed {len(self.search_index):,} of {len(self.questions):,} questions so far)"
+        self.search_status.config(text=status)
+    
+    def show_search_result(self, event):
+        """Show the options of the selected search result."""
+        selection = self.search_results.curselection()
+        if not selection:
+            return
+        question = self.questions[self.search_result_ids[selection[0]]]
+        lines = [question.text]
+        for i, option in enumerate(question.options):
+            marker = "\u2713" if i == question.correct_answer else " "
+            lines.append(f"  {marker} {i+1}. {option}")
+        self.search_details.config(text="\n".join(lines))
+    
     def show_settings_screen(self):
         """Display the settings screen."""
         # Hide welcome frame
@@ -232,7 +433,7 @@ class QuizGameGUI:
         question_label.grid(row=0, column=0, padx=10, pady=10, sticky="w")
         
         self.question_var = tk.StringVar(value=str(self.num_questions))
-        question_scale = tk.Scale(
+        self.question_scale = tk.Scale(
             settings_container,
             from_=1,
             to=len(self.questions),
@@ -242,7 +443,7 @@ class QuizGameGUI:
             font=("Arial", 10),
             bg="#f0f0f0"
         )
-        question_scale.grid(row=0, column=1, padx=10, pady=10)
+        self.question_scale.grid(row=0, column=1, padx=10, pady=10)
         
         # Time limit
         time_label = tk.Label(
@@ -266,6 +467,65 @@ class QuizGameGUI:
         )
         time_scale.grid(row=1, column=1, padx=10, pady=10)
         
+        # Player name
+        name_label = tk.Label(
+            settings_container,
+            text="Player Name:",
+            font=("Arial", 12),
+            bg="#f0f0f0"
+        )
+        name_label.grid(row=2, column=0, padx=10, pady=10, sticky="w")
+        
+        self.player_var = tk.StringVar(value=self.player_name)
+        name_entry = tk.Entry(
+            settings_container,
+            textvariable=self.player_var,
+            font=("Arial", 11),
+            width=22
+        )
+        name_entry.grid(row=2, column=1, padx=10, pady=10)
+        
+        # Adaptive mode
+        self.adaptive_var = tk.BooleanVar(value=self.adaptive)
+        adaptive_check = tk.Checkbutton(
+            settings_container,
+            text="Adaptive (review missed questions, match difficulty)",
+            variable=self.adaptive_var,
+            font=("Arial", 11),
+            bg="#f0f0f0"
+        )
+        adaptive_check.grid(row=3, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+        
+        # Difficulty weights
+        difficulty_label = tk.Label(
+            settings_container,
+            text="Difficulty Weights:",
+            font=("Arial", 12),
+            bg="#f0f0f0"
+        )
+        difficulty_label.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+        
+        difficulty_frame = tk.Frame(settings_container, bg="#f0f0f0")
+        difficulty_frame.grid(row=4, column=1, padx=10, pady=5)
+        
+        self.difficulty_weight_vars = {}
+        for i, band in enumerate(DIFFICULTY_BANDS):
+            var = tk.DoubleVar(value=self.difficulty_weights[band])
+            self.difficulty_weight_vars[band] = var
+            band_scale = tk.Scale(
+                difficulty_frame,
+                label=band.capitalize(),
+                from_=0,
+                to=5,
+                resolution=0.5,
+                orient=tk.HORIZONTAL,
+                length=70,
+                variable=var,
+                font=("Arial", 8),
+                bg="#f0f0f0"
+            )
+            band_scale.grid(row=0, column=i)
+        
         # Categories frame
         categories_frame = tk.LabelFrame(
             self.settings_frame,
@@ -278,10 +538,11 @@ class QuizGameGUI:
         categories_frame.pack(pady=20)
         
         # Get unique categories
-        categories = list(set(q.category for q in self.questions))
+        categories = self.questions.categories()
         
-        # Category checkbuttons
+        # Category checkbuttons and weights
         self.category_vars = {}
+        self.category_weight_vars = {}
         for i, category in enumerate(categories):
             var = tk.BooleanVar(value=True)
             self.category_vars[category] = var
@@ -293,7 +554,24 @@ class QuizGameGUI:
                 font=("Arial", 11),
                 bg="#f0f0f0"
             )
-            cb.grid(row=i//2, column=i%2, padx=10, pady=5, sticky="w")
+            cb.grid(row=i//2, column=(i%2)*2, padx=(10, 0), pady=5, sticky="w")
+            
+            # Relative weight of the category in the deck
+            weight_var = tk.DoubleVar(value=self.category_weights.get(category, 1.0))
+            self.category_weight_vars[category] = weight_var
+            weight_scale = tk.Scale(
+                categories_frame,
+                from_=0,
+                to=5,
+                resolution=0.5,
+                orient=tk.HORIZONTAL,
+                length=80,
+                variable=weight_var,
+                showvalue=True,
+                font=("Arial", 8),
+                bg="#f0f0f0"
+            )
+            weight_scale.grid(row=i//2, column=(i%2)*2 + 1, padx=(0, 10), pady=5)
         
         # Buttons frame
         buttons_frame = tk.Frame(self.settings_frame, bg="#f0f0f0")
@@ -329,6 +607,9 @@ class QuizGameGUI:
     
     def start_quiz(self):
         """Start the quiz with selected settings."""
+        # Any earlier quiz is over
+        self.retire_scheduler()
+        
         # Get settings values
         try:
             self.num_questions = int(self.question_var.get())
@@ -336,70 +617,88 @@ class QuizGameGUI:
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter valid numbers for settings.")
             return
+        self.player_name = self.player_var.get().strip() or "Player"
+        self.adaptive = self.adaptive_var.get()
+        self.category_weights = {cat: float(var.get()) for cat, var in self.category_weight_vars.items()}
+        self.difficulty_weights = {band: float(var.get()) for band, var in self.difficulty_weight_vars.items()}
+        weighted_difficulty = any(weight != 1.0 for weight in self.difficulty_weights.values())
         
         # Filter questions by selected categories
         selected_categories = [cat for cat, var in self.category_vars.items() if var.get()]
-        if not selected_categories:
-            messagebox.showerror("No Categories", "Please select at least one category.")
-            return
         
-        filtered_questions = [q for q in self.questions if q.category in selected_categories]
-        if not filtered_questions:
-            messagebox.showerror("No Questions", "No questions available for selected categories.")
+        # The weight sliders go down to 0; a deck needs something with a positive weight
+        if selected_categories and (
+                all(self.category_weights.get(cat, 1.0) <= 0 for cat in selected_categories)
+                or all(weight <= 0 for weight in self.difficulty_weights.values())):
+            messagebox.showerror("No Questions", "Give at least one selected category and one "
+                                                 "difficulty a weight above zero.")
             return
         
-        # Shuffle questions and take required number
-        random.shuffle(filtered_questions)
-        self.quiz_questions = filtered_questions[:self.num_questions]
-        
-        # Reset quiz state
-        self.current_question_index = 0
-        self.score = 0
-        self.total_time = 0
-        self.question_history = []
-        self.category_stats = {}
+        # Adaptive mode and difficulty weights need the saved question ratings
+        if self.adaptive or weighted_difficulty:
+            if self.loading_questions:
+                messagebox.showinfo("Loading", "Adaptive mode and difficulty weights are available "
+                                               "once all questions are loaded.")
+                return
+            if self.scheduler is None:
+                self.scheduler = AdaptiveScheduler.load(self.questions)
+                self.scheduler.attach(self.engine)
+        
+        # Choose who picks the deck: the player's schedule, the weights, or the ready decks
+        if self.adaptive:
+            self.engine.selector = self.scheduler.player(self.player_name)
+        elif weighted_difficulty or any(weight != 1.0 for weight in self.category_weights.values()):
+            self.engine.selector = self.weighted_sampler(weighted_difficulty)
+        elif not self.loading_questions:
+            self.engine.selector = self.deck_cache
+        else:
+            self.engine.selector = None
         
-        # Initialize category stats
-        for question in self.quiz_questions:
-            if question.category not in self.category_stats:
-                self.category_stats[question.category] = {"correct": 0, "total": 0}
+        # Start a fresh session; the engine asks the first question
+        try:
+            self.engine.start(selected_categories, self.num_questions, self.time_limit)
+        except QuizError as e:
+            messagebox.showerror(e.title, e.message)
+            return
         
         # Hide settings frame and show quiz frame
         self.settings_frame.pack_forget()
         self.quiz_frame.pack(fill="both", expand=True)
-        
-        # Start displaying questions
-        self.display_current_question()
     
-    def display_current_question(self):
-        """Display the current question."""
-        # Clear quiz frame
-        for widget in self.quiz_frame.winfo_children():
-            widget.destroy()
-        
-        # Get current question
-        question = self.quiz_questions[self.current_question_index]
-        
+    def weighted_sampler(self, weighted_difficulty):
+        """Return a sampler for the current weights, rebuilding it only when they change."""
+        key = (len(self.questions), tuple(self.category_weights.items()),
+               tuple(self.difficulty_weights.items()) if weighted_difficulty else None)
+        if key != self.sampler_key:
+            self.sampler = WeightedSampler(
+                self.questions,
+                self.category_weights,
+                self.difficulty_weights if weighted_difficulty else None,
+                self.scheduler.bands if weighted_difficulty else None
+            )
+            self.sampler_key = key
+        return self.sampler
+    
+    def build_quiz_screen(self):
+        """Create the quiz screen's widgets once; questions update them in place."""
         # Question number and category
         header_frame = tk.Frame(self.quiz_frame, bg="#f0f0f0")
         header_frame.pack(fill="x", pady=(20, 0))
         
-        question_num_label = tk.Label(
+        self.question_num_label = tk.Label(
             header_frame,
-            text=f"Question {self.current_question_index + 1}/{len(self.quiz_questions)}",
             font=("Arial", 12, "bold"),
             bg="#f0f0f0"
         )
-        question_num_label.pack(side="left", padx=20)
+        self.question_num_label.pack(side="left", padx=20)
         
-        category_label = tk.Label(
+        self.category_label = tk.Label(
             header_frame,
-            text=f"Category: {question.category}",
             font=("Arial", 12),
             bg="#f0f0f0",
             fg="#555555"
         )
-        category_label.pack(side="right", padx=20)
+        self.category_label.pack(side="right", padx=20)
         
         # Timer
         self.timer_frame = tk.Frame(self.quiz_frame, bg="#f0f0f0")
@@ -407,7 +706,6 @@ class QuizGameGUI:
         
         self.timer_label = tk.Label(
             self.timer_frame,
-            text=f"Time Remaining: {self.time_limit} seconds",
             font=("Arial", 12),
             bg="#f0f0f0"
         )
@@ -418,37 +716,33 @@ class QuizGameGUI:
             self.timer_frame,
             orient="horizontal",
             length=300,
-            mode="determinate",
-            maximum=self.time_limit
+            mode="determinate"
         )
         self.timer_progress.pack(pady=5)
         
         # Question text
-        question_label = tk.Label(
+        self.question_label = tk.Label(
             self.quiz_frame,
-            text=question.text,
             font=("Arial", 16, "bold"),
             wraplength=700,
             justify="center",
             bg="#f0f0f0"
         )
-        question_label.pack(pady=(30, 40))
+        self.question_label.pack(pady=(30, 40))
         
         # Options frame
         options_frame = tk.Frame(self.quiz_frame, bg="#f0f0f0")
         options_frame.pack(pady=10)
         
-        # Option buttons
+        # Option buttons, one for the most options a question can have
+        self.option_frames = []
         self.option_buttons = []
-        option_letters = ["A", "B", "C", "D"]
         
-        for i, option in enumerate(question.options):
+        for i in range(MAX_OPTIONS):
             button_frame = tk.Frame(options_frame, bg="#f0f0f0")
-            button_frame.pack(pady=8, fill="x")
             
             btn = tk.Button(
                 button_frame,
-                text=f"{option_letters[i]}. {option}",
                 font=("Arial", 14),
                 bg="#e0e0e0",
                 activebackground="#d0d0d0",
@@ -457,62 +751,97 @@ class QuizGameGUI:
                 command=lambda idx=i: self.answer_question(idx)
             )
             btn.pack()
+            self.option_frames.append(button_frame)
             self.option_buttons.append(btn)
+        self.option_fg = self.option_buttons[0].cget("fg")
         
-        # Start timer
-        self.remaining_time = self.time_limit
-        self.timer_running = True
-        self.update_timer()
+        # Feedback and next button, shown once the question is over
+        self.feedback_label = tk.Label(self.quiz_frame, bg="#f0f0f0")
+        self.next_button = tk.Button(
+            self.quiz_frame,
+            command=self.next_question,
+            font=("Arial", 12),
+            bg="#2196F3",
+            fg="white",
+            padx=15,
+            pady=8,
+            relief=tk.FLAT
+        )
     
-    def update_timer(self):
-        """Update the timer display."""
-        if not self.timer_running:
-            return
+    def display_current_question(self, session, question):
+        """Display the current question."""
+        # Hide the previous question's feedback
+        self.feedback_label.pack_forget()
+        self.next_button.pack_forget()
         
-        if self.remaining_time <= 0:
-            self.timer_label.config(text="Time's up!")
-            self.timer_progress["value"] = 0
-            self.time_up()
-            return
+        # Question number and category
+        self.question_num_label.config(text=f"Question {session.current_index + 1}/{len(session)}")
+        self.category_label.config(text=f"Category: {question.category}")
+        
+        # Timer
+        self.timer_progress.config(maximum=session.time_limit)
+        
+        # Question text
+        self.question_label.config(text=question.text)
         
-        self.timer_label.config(text=f"Time Remaining: {self.remaining_time} seconds")
-        self.timer_progress["value"] = self.remaining_time
+        # Option buttons; unused ones are hidden
+        option_letters = ["A", "B", "C", "D"]
+        options = question.options
+        
+        for i, (button_frame, btn) in enumerate(zip(self.option_frames, self.option_buttons)):
+            if i < len(options):
+                btn.config(
+                    text=f"{option_letters[i]}. {options[i]}",
+                    bg="#e0e0e0",
+                    fg=self.option_fg,
+                    state=tk.NORMAL
+                )
+                button_frame.pack(pady=8, fill="x")
+            else:
+                button_frame.pack_forget()
         
-        self.remaining_time -= 1
-        self.timer_id = self.root.after(1000, self.update_timer)
+        # Start timer; the engine's deadline drives the countdown
+        self.timer_running = True
+        self.update_timer_display()
+    
+    def update_timer(self):
+        """Advance the timing wheel and refresh the countdown.
+        
+        This single tick fires question deadlines (the engine then emits its
+        "timeout" event), so nothing reschedules per-question callbacks.
+        """
+        self.timer_wheel.advance()
+        if self.timer_running:
+            self.update_timer_display()
+        self.timer_id = self.root.after(TIMER_TICK_MS, self.update_timer)
+    
+    def update_timer_display(self):
+        """Show the time left on the current question."""
+        remaining = self.engine.remaining()
+        self.timer_label.config(text=f"Time Remaining: {math.ceil(remaining)} seconds")
+        self.timer_progress["value"] = remaining
     
-    def time_up(self):
-        """Handle time up event."""
+    def show_timeout_feedback(self, session, question):
+        """Show the correct answer after time ran out."""
+        # Stop timer
+        self.timer_running = False
+        self.timer_label.config(text="Time's up!")
+        self.timer_progress["value"] = 0
+        
         # Disable option buttons
         for btn in self.option_buttons:
             btn.config(state=tk.DISABLED)
         
         # Highlight correct answer
-        correct_idx = self.quiz_questions[self.current_question_index].correct_answer
-        self.option_buttons[correct_idx].config(bg="#4CAF50", fg="white")
-        
-        # Record that user didn't answer
-        question = self.quiz_questions[self.current_question_index]
-        question.user_answer = None
-        question.time_taken = self.time_limit
-        
-        # Update category stats
-        self.category_stats[question.category]["total"] += 1
-        
-        # Add to history
-        self.question_history.append(question)
-        
-        # Add time to total
-        self.total_time += question.time_taken
+        self.option_buttons[question.correct_answer].config(bg="#4CAF50", fg="white")
         
         # Show message
-        tk.Label(
-            self.quiz_frame,
+        self.feedback_label.config(
             text="Time's up! You didn't answer in time.",
             font=("Arial", 12, "bold"),
-            fg="#f44336",
-            bg="#f0f0f0"
-        ).pack(pady=10)
+            fg="#f44336"
+        )
+        self.feedback_label.pack(pady=10)
         
         # Next question button
         self.show_next_button()
@@ -521,51 +850,26 @@ class QuizGameGUI:
         """Process the user's answer."""
         # Stop timer
         self.timer_running = False
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-        
-        # Calculate time taken
-        time_taken = self.time_limit - self.remaining_time
-        
-        # Record answer
-        question = self.quiz_questions[self.current_question_index]
-        question.user_answer = answer_idx
-        question.time_taken = time_taken
-        
-        # Update category stats
-        self.category_stats[question.category]["total"] += 1
-        
-        # Add to history
-        self.question_history.append(question)
-        
-        # Add time to total
-        self.total_time += time_taken
         
+        # Record answer; the engine updates score and category stats
+        self.engine.answer(answer_idx)
+    
+    def show_answer_feedback(self, session, question, answer_idx, correct):
+        """Show whether the recorded answer was correct."""
         # Disable option buttons
         for btn in self.option_buttons:
             btn.config(state=tk.DISABLED)
         
-        # Check if answer is correct
-        correct = answer_idx == question.correct_answer
-        
         if correct:
             # Highlight correct answer
             self.option_buttons[answer_idx].config(bg="#4CAF50", fg="white")
             
-            # Update score
-            self.score += 1
-            
-            # Update category stats
-            self.category_stats[question.category]["correct"] += 1
-            
             # Show correct message
-            tk.Label(
-                self.quiz_frame,
+            self.feedback_label.config(
                 text="Correct!",
                 font=("Arial", 14, "bold"),
-                fg="#4CAF50",
-                bg="#f0f0f0"
-            ).pack(pady=10)
+                fg="#4CAF50"
+            )
         else:
             # Highlight user's wrong answer
             self.option_buttons[answer_idx].config(bg="#f44336", fg="white")
@@ -574,42 +878,32 @@ class QuizGameGUI:
             self.option_buttons[question.correct_answer].config(bg="#4CAF50", fg="white")
             
             # Show incorrect message
-            tk.Label(
-                self.quiz_frame,
+            self.feedback_label.config(
                 text=f"Incorrect! The correct answer was: {question.options[question.correct_answer]}",
                 font=("Arial", 12, "bold"),
-                fg="#f44336",
-                bg="#f0f0f0"
-            ).pack(pady=10)
+                fg="#f44336"
+            )
+        self.feedback_label.pack(pady=10)
         
         # Next question button
         self.show_next_button()
     
     def show_next_button(self):
         """Show the next question button."""
-        button_text = "Next Question" if self.current_question_index < len(self.quiz_questions) - 1 else "Finish Quiz"
-        button_command = self.next_question if self.current_question_index < len(self.quiz_questions) - 1 else self.show_results
-        
-        next_button = tk.Button(
-            self.quiz_frame,
-            text=button_text,
-            command=button_command,
-            font=("Arial", 12),
-            bg="#2196F3",
-            fg="white",
-            padx=15,
-            pady=8,
-            relief=tk.FLAT
-        )
-        next_button.pack(pady=20)
+        button_text = "Finish Quiz" if self.engine.session.is_last_question() else "Next Question"
+        self.next_button.config(text=button_text)
+        self.next_button.pack(pady=20)
     
     def next_question(self):
-        """Move to the next question."""
-        self.current_question_index += 1
-        self.display_current_question()
+        """Move to the next question, or to the results after the last one."""
+        self.engine.next()
     
-    def show_results(self):
+    def show_results(self, session, results):
         """Show the quiz results."""
+        # Queue the session for saving; the write happens off the UI thread
+        self.results_store.record_session(self.player_name, session, results)
+        self.retire_scheduler()
+        
         # Hide quiz frame
         self.quiz_frame.pack_forget()
         
@@ -633,25 +927,35 @@ class QuizGameGUI:
         score_frame = tk.Frame(self.results_frame, bg="#f0f0f0")
         score_frame.pack(pady=10)
         
-        score_percentage = (self.score / len(self.question_history)) * 100
-        
         score_label = tk.Label(
             score_frame,
-            text=f"Final Score: {self.score}/{len(self.question_history)} ({score_percentage:.1f}%)",
+            text=f"Final Score: {results.score}/{results.answered} ({results.percentage:.1f}%)",
             font=("Arial", 16, "bold"),
             bg="#f0f0f0"
         )
         score_label.pack()
         
-        avg_time = self.total_time / len(self.question_history)
         time_label = tk.Label(
             score_frame,
-            text=f"Average Time Per Question: {avg_time:.2f} seconds",
+            text=f"Average Time Per Question: {results.average_time:.2f} seconds",
             font=("Arial", 12),
             bg="#f0f0f0"
         )
         time_label.pack(pady=5)
         
+        answer_stats = self.stats.session.overall
+        if answer_stats.answered:
+            percentiles = answer_stats.percentiles()
+            percentile_label = tk.Label(
+                score_frame,
+                text=f"Answer Time p50/p95/p99: {percentiles['p50']:.1f} / {percentiles['p95']:.1f} / "
+                     f"{percentiles['p99']:.1f} seconds",
+                font=("Arial", 11),
+                fg="#555555",
+                bg="#f0f0f0"
+            )
+            percentile_label.pack()
+        
         # Category performance
         category_frame = tk.LabelFrame(
             self.results_frame,
@@ -663,7 +967,7 @@ class QuizGameGUI:
         )
         category_frame.pack(pady=20, padx=50, fill="x")
         
-        for category, stats in self.category_stats.items():
+        for category, stats in results.category_stats.items():
             if stats["total"] > 0:
                 percentage = (stats["correct"] / stats["total"]) * 100
                 category_label = tk.Label(
@@ -682,57 +986,16 @@ class QuizGameGUI:
         # All questions tab
         all_tab = tk.Frame(review_notebook, bg="#f0f0f0")
         review_notebook.add(all_tab, text="All Questions")
+        ReviewList(all_tab, self, session.answered_count,
+                   session.review_entry)
         
-        # Category tabs
-        category_tabs = {}
-        for category in self.category_stats.keys():
+        # Category tabs are filled in the first time they are selected
+        self.review_tabs = {}
+        for category in results.category_stats.keys():
             tab = tk.Frame(review_notebook, bg="#f0f0f0")
             review_notebook.add(tab, text=category)
-            category_tabs[category] = tab
-        
-        # Add scrollable frame for questions
-        all_canvas = tk.Canvas(all_tab, bg="#f0f0f0")
-        all_scrollbar = ttk.Scrollbar(all_tab, orient="vertical", command=all_canvas.yview)
-        all_scrollable_frame = tk.Frame(all_canvas, bg="#f0f0f0")
-        
-        all_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: all_canvas.configure(scrollregion=all_canvas.bbox("all"))
-        )
-        
-        all_canvas.create_window((0, 0), window=all_scrollable_frame, anchor="nw")
-        all_canvas.configure(yscrollcommand=all_scrollbar.set)
-        
-        all_canvas.pack(side="left", fill="both", expand=True, padx=(10, 0))
-        all_scrollbar.pack(side="right", fill="y")
-        
-        # Add questions to all tab
-        for i, question in enumerate(self.question_history):
-            self.add_question_to_review(all_scrollable_frame, question, i)
-        
-        # Add category scrollable frames
-        for category, tab in category_tabs.items():
-            canvas = tk.Canvas(tab, bg="#f0f0f0")
-            scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
-            scrollable_frame = tk.Frame(canvas, bg="#f0f0f0")
-            
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e, c=canvas: c.configure(scrollregion=c.bbox("all"))
-            )
-            
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-            
-            canvas.pack(side="left", fill="both", expand=True, padx=(10, 0))
-            scrollbar.pack(side="right", fill="y")
-            
-            # Add category-specific questions
-            question_index = 0
-            for i, question in enumerate(self.question_history):
-                if question.category == category:
-                    self.add_question_to_review(scrollable_frame, question, question_index)
-                    question_index += 1
+            self.review_tabs[str(tab)] = category
+        review_notebook.bind("<<NotebookTabChanged>>", self.on_review_tab_changed)
         
         # Buttons frame
         buttons_frame = tk.Frame(self.results_frame, bg="#f0f0f0")
@@ -780,47 +1043,107 @@ class QuizGameGUI:
         )
         exit_button.pack(side="right", padx=(10, 50))
     
-    def add_question_to_review(self, parent_frame, question, index):
-        """Add a question to the review tab."""
+    def on_review_tab_changed(self, event):
+        """Build a category review tab the first time it is shown."""
+        notebook = event.widget
+        tab_name = notebook.select()
+        category = self.review_tabs.pop(tab_name, None)
+        if category is None:
+            return
+        
+        session = self.engine.session
+        indices = [i for i in range(session.answered_count)
+                   if session.bank[session.question_ids[i]].category == category]
+        ReviewList(notebook.nametowidget(tab_name), self, len(indices),
+                   lambda i: session.review_entry(indices[i]))
+    
+    def create_review_row(self, parent_frame):
+        """Create the widgets for one review entry; ReviewList reuses them."""
+        row = ReviewRow()
+        
         # Question frame
-        question_frame = tk.LabelFrame(
+        row.frame = tk.LabelFrame(
             parent_frame,
-            text=f"Question {index + 1}",
             font=("Arial", 12, "bold"),
             bg="#f0f0f0",
             padx=10,
             pady=10
         )
-        question_frame.pack(pady=10, padx=10, fill="x")
         
         # Question text and category
-        text_frame = tk.Frame(question_frame, bg="#f0f0f0")
+        text_frame = tk.Frame(row.frame, bg="#f0f0f0")
         text_frame.pack(fill="x", pady=5)
         
-        question_text = tk.Label(
+        row.question_text = tk.Label(
             text_frame,
-            text=question.text,
             font=("Arial", 12),
             wraplength=600,
             justify="left",
             bg="#f0f0f0"
         )
-        question_text.pack(side="left")
+        row.question_text.pack(side="left")
         
-        category_label = tk.Label(
+        row.category_label = tk.Label(
             text_frame,
-            text=f"Category: {question.category}",
             font=("Arial", 10),
             fg="#555555",
             bg="#f0f0f0"
         )
-        category_label.pack(side="right")
+        row.category_label.pack(side="right")
+        
+        # Options
+        row.option_labels = []
+        for i in range(MAX_OPTIONS):
+            option_label = tk.Label(
+                row.frame,
+                font=("Arial", 11),
+                padx=5,
+                pady=2,
+                anchor="w"
+            )
+            row.option_labels.append(option_label)
+        
+        # Status
+        row.status_frame = tk.Frame(row.frame, bg="#f0f0f0")
+        
+        row.status_label = tk.Label(
+            row.status_frame,
+            font=("Arial", 11, "bold"),
+            bg="#f0f0f0"
+        )
+        row.status_label.pack(side="left")
+        
+        # Time taken
+        row.time_label = tk.Label(
+            row.status_frame,
+            font=("Arial", 10),
+            fg="#555555",
+            bg="#f0f0f0"
+        )
+        row.time_label.pack(side="right")
+        
+        # Text cut short to fit the row is shown in full on request
+        row.more_button = tk.Button(
+            row.status_frame,
+            text="Show full text",
+            font=("Arial", 9),
+            relief="flat",
+            cursor="hand2"
+        )
+        return row
+    
+    def add_question_to_review(self, row, question, record, index):
+        """Show a question and the player's answer in a review row."""
+        row.frame.config(text=f"Question {index + 1}")
+        row.question_text.config(text=shorten(question.text, REVIEW_TEXT_CHARS))
+        row.category_label.config(text=f"Category: {question.category}")
         
         # Options
+        row.status_frame.pack_forget()
+        for option_label in row.option_labels:
+            option_label.pack_forget()
+        
         for i, option in enumerate(question.options):
-            option_frame = tk.Frame(question_frame, bg="#f0f0f0")
-            option_frame.pack(fill="x", pady=2)
-            
             # Determine background color
             bg_color = "#f0f0f0"
             text_color = "#000000"
@@ -828,60 +1151,168 @@ class QuizGameGUI:
             if i == question.correct_answer:
                 bg_color = "#c8e6c9"  # Light green for correct answer
                 text_color = "#2e7d32"
-            elif question.user_answer is not None and i == question.user_answer and i != question.correct_answer:
+            elif record.answer is not None and i == record.answer and i != question.correct_answer:
                 bg_color = "#ffcdd2"  # Light red for wrong answer
                 text_color = "#c62828"
             
-            option_label = tk.Label(
-                option_frame,
-                text=f"{i+1}. {option}",
-                font=("Arial", 11),
-                bg=bg_color,
-                fg=text_color,
-                padx=5,
-                pady=2,
-                anchor="w"
-            )
-            option_label.pack(fill="x")
+            row.option_labels[i].config(text=f"{i+1}. {shorten(option, REVIEW_OPTION_CHARS)}",
+                                        bg=bg_color, fg=text_color)
+            row.option_labels[i].pack(fill="x", pady=2)
         
         # Status
-        status_frame = tk.Frame(question_frame, bg="#f0f0f0")
-        status_frame.pack(fill="x", pady=5)
+        row.status_frame.pack(fill="x", pady=5)
         
-        if question.user_answer is None:
+        if record.answer is None:
             status_text = "No answer (Time's up)"
             status_color = "#f44336"
-        elif question.user_answer == question.correct_answer:
+        elif record.answer == question.correct_answer:
             status_text = "Correct"
             status_color = "#4CAF50"
         else:
-            status_text = f"Incorrect (Chose: {question.options[question.user_answer]})"
+            status_text = f"Incorrect (Chose: {shorten(question.options[record.answer], REVIEW_OPTION_CHARS)})"
             status_color = "#f44336"
         
-        # Status label completion
-        status_label = tk.Label(
-            status_frame,
-            text=status_text,
-            font=("Arial", 11, "bold"),
-            fg=status_color,
-            bg="#f0f0f0"
+        row.status_label.config(text=status_text, fg=status_color)
+        row.time_label.config(text=f"Time taken: {record.time_taken:.1f} seconds")
+        
+        row.more_button.pack_forget()
+        if (len(question.text) > REVIEW_TEXT_CHARS
+                or any(len(option) > REVIEW_OPTION_CHARS for option in question.options)):
+            row.more_button.config(command=lambda: self.show_review_details(question, index))
+            row.more_button.pack(side="right", padx=10)
+    
+    def show_review_details(self, question, index):
+        """Open a window with the full text of a question that its review row cut short."""
+        window = tk.Toplevel(self.root)
+        window.title(f"Question {index + 1}")
+        window.geometry("600x400")
+        window.configure(bg="#f0f0f0")
+        
+        scrollbar = ttk.Scrollbar(window, orient="vertical")
+        text = tk.Text(
+            window,
+            font=("Arial", 12),
+            wrap="word",
+            bg="#f0f0f0",
+            relief="flat",
+            padx=10,
+            pady=10,
+            yscrollcommand=scrollbar.set
         )
-        status_label.pack(side="left")
+        scrollbar.config(command=text.yview)
+        scrollbar.pack(side="right", fill="y")
+        text.pack(side="left", fill="both", expand=True)
         
-        # Time taken
-        time_label = tk.Label(
-            status_frame,
-            text=f"Time taken: {question.time_taken:.1f} seconds",
-            font=("Arial", 10),
-            fg="#555555",
-            bg="#f0f0f0"
+        text.insert("end", question.text + "\n\n")
+        for i, option in enumerate(question.options):
+            marker = "  (correct)" if i == question.correct_answer else ""
+            text.insert("end", f"{i+1}. {option}{marker}\n")
+        text.config(state="disabled")
+
+
+class ReviewRow:
+    """The widgets of one recyclable review entry."""
+
+
+class ReviewList:
+    """A scrollable review list that only creates rows for the visible area.
+    
+    Every entry has the same height, so the rows on screen can be worked out
+    from the scroll position. A small pool of rows is repositioned and
+    refilled while scrolling, so opening the list costs the same whether the
+    quiz had 5 questions or 500. To keep that height fixed,
+    add_question_to_review cuts long text short and offers the full text in
+    a separate window.
+    """
+    ROW_HEIGHT = 230
+    
+    def __init__(self, parent, app, count, get_item):
+        self.app = app
+        self.count = count
+        self.get_item = get_item  # index -> (question, answer record)
+        self.rows = []  # (row, canvas window, index shown) per pooled row
+        
+        self.canvas = tk.Canvas(parent, bg="#f0f0f0", highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.canvas.configure(
+            yscrollcommand=self.scrollbar.set,
+            scrollregion=(0, 0, 0, count * self.ROW_HEIGHT),
+            yscrollincrement=self.ROW_HEIGHT // 4
         )
-        time_label.pack(side="right")
+        
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(10, 0))
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.canvas.bind("<Configure>", self.on_configure)
+        self.canvas.bind("<Enter>", self.bind_mousewheel)
+        self.canvas.bind("<Leave>", self.unbind_mousewheel)
+    
+    def yview(self, *args):
+        """Scroll the list and refill the rows that came into view."""
+        self.canvas.yview(*args)
+        self.refresh()
+    
+    def bind_mousewheel(self, event):
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self.on_mousewheel)
+    
+    def unbind_mousewheel(self, event):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+    
+    def on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+    
+    def on_configure(self, event):
+        """Grow the row pool to cover the visible area and match its width."""
+        needed = min(self.count, event.height // self.ROW_HEIGHT + 2)
+        while len(self.rows) < needed:
+            row = self.app.create_review_row(self.canvas)
+            window = self.canvas.create_window(
+                0, 0, window=row.frame, anchor="nw", height=self.ROW_HEIGHT - 10
+            )
+            self.rows.append([row, window, None])
+        for _, window, _ in self.rows:
+            self.canvas.itemconfigure(window, width=max(event.width - 20, 1))
+        self.refresh()
+    
+    def refresh(self):
+        """Show the entries that are inside the visible area."""
+        if not self.rows:
+            return
+        first = int(self.canvas.canvasy(0)) // self.ROW_HEIGHT
+        for index in range(first, first + len(self.rows)):
+            slot = self.rows[index % len(self.rows)]
+            row, window, shown = slot
+            if index >= self.count:
+                self.canvas.itemconfigure(window, state="hidden")
+                continue
+            self.canvas.itemconfigure(window, state="normal")
+            self.canvas.coords(window, 10, index * self.ROW_HEIGHT)
+            if shown != index:
+                question, record = self.get_item(index)
+                self.app.add_question_to_review(row, question, record, index)
+                slot[2] = index
+
 
 def main():
     """Main function to run the quiz game."""
     root = tk.Tk()
-    app = QuizGameGUI(root)
+    bank_path = sys.argv[1] if len(sys.argv) > 1 else None
+    
+    # Instrumentation is only loaded, and the hot paths only wrapped, when asked for
+    metrics_path = os.environ.get(METRICS_ENV)
+    instrumentation = None
+    if metrics_path:
+        from instrumentation import Instrumentation
+        instrumentation = Instrumentation()
+    app = QuizGameGUI(root, bank_path, instrumentation=instrumentation)
+    if instrumentation is not None:
+        instrumentation.export_every(root, metrics_path)
     
     # Set a custom style for ttk widgets
     style = ttk.Style()
@@ -901,6 +1332,17 @@ def main():
     
     # Start the main loop
     root.mainloop()
+    
+    # Finish writing any results that are still queued
+    app.results_store.close()
+    app.deck_cache.close()
+    app.retire_scheduler()
+    if app.scheduler is not None:
+        app.scheduler.save()
+    if app.search_index is not None and app.search_index.modified:
+        app.search_index.save(index_path(app.bank_path))
+    if instrumentation is not None:
+        instrumentation.export(metrics_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""Persistent quiz results.
+
+ResultsStore keeps every finished quiz and every answer in a local SQLite
+database. The front ends hand finished sessions to record_session(), which
+only copies the answers and queues them; a background thread writes queued
+sessions in batches, one transaction per batch, so the caller never waits
+on the disk. The database runs in WAL mode so reads can run while the
+writer is busy.
+
+A question is identified by a hash of its text, options and category, so
+two questions that share a prompt but offer different answers are stored
+apart.
+
+Per-category totals are kept up to date as sessions are written, and the
+session table is indexed by player and by score, so history, accuracy and
+leaderboard queries stay fast however many answers have been stored::
+
+    python results_store.py --leaderboard
+    python results_store.py --player Alice
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.db")
+BATCH_SIZE = 500  # Most sessions written in one transaction
+FLUSH_INTERVAL = 0.5  # Seconds the writer waits for a batch to fill up
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    content_hash BLOB NOT NULL UNIQUE,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    correct_answer INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players (id),
+    finished_at REAL NOT NULL,
+    score INTEGER NOT NULL,
+    answered INTEGER NOT NULL,
+    total_time REAL NOT NULL,
+    time_limit INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_player ON sessions (player_id, finished_at);
+CREATE INDEX IF NOT EXISTS sessions_by_score ON sessions (score DESC, total_time);
+CREATE TABLE IF NOT EXISTS answers (
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    position INTEGER NOT NULL,
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    answer INTEGER,
+    correct INTEGER NOT NULL,
+    time_taken REAL NOT NULL,
+    PRIMARY KEY (session_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_category_totals (
+    player_id INTEGER NOT NULL REFERENCES players (id),
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (player_id, category_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS category_totals (
+    category_id INTEGER PRIMARY KEY REFERENCES categories (id),
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+"""
+
+
+def question_key(text: str, options: Sequence[str], category: str) -> bytes:
+    """Return the content hash that identifies a question in the database."""
+    encoded = json.dumps([text, list(options), category], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).digest()
+
+
+class SessionRecord(NamedTuple):
+    """A finished quiz copied out of its QuizSession, ready to be written."""
+    player: str
+    finished_at: float
+    score: int
+    answered: int
+    total_time: float
+    time_limit: int
+    # (question text, options, category, correct answer, answer or None, time taken) per question
+    answers: List[Tuple[str, List[str], str, int, Optional[int], float]]
+
+
+class ResultsStore:
+    """Stores finished quizzes in SQLite from a background writer thread."""
+
+    def __init__(self, path: str = DEFAULT_RESULTS_PATH, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sessions_written = 0
+        self.error: Optional[Exception] = None
+        self._queue: "queue.Queue[Optional[SessionRecord]]" = queue.Queue()
+        self._reader: Optional[sqlite3.Connection] = None
+
+        # Create the schema up front so readers never see a missing table
+        connection = self._connect()
+        with connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="results-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record_session(self, player: str, session: Any, results: Any):
+        """Queue a finished session for writing; returns without touching the disk."""
+        answers = []
+        for i in range(session.answered_count):
+            record = session.answer_record(i)
+            question = session.bank[record.question_id]
+            answers.append((question.text, list(question.options), question.category,
+                            question.correct_answer, record.answer, record.time_taken))
+        self._queue.put(SessionRecord(player, time.time(), results.score, results.answered,
+                                      results.total_time, session.time_limit, answers))
+
+    def flush(self):
+        """Wait until every queued session has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write what is still queued and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _write_loop(self):
+        connection = self._connect()
+        writer = _BatchWriter(connection)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                # Collect whatever else arrives shortly so it shares the transaction
+                deadline = time.monotonic() + self.flush_interval
+                while batch[-1] is not None and len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        batch.append(self._queue.get(timeout=timeout) if timeout > 0
+                                     else self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                records = [record for record in batch if record is not None]
+                try:
+                    if records:
+                        writer.write(records)
+                        self.sessions_written += len(records)
+                except Exception as exc:
+                    # Keep writing later batches; this one is lost
+                    logger.exception("Could not write %d quiz session(s) to %s", len(records), self.path)
+                    self.error = exc
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(records) < len(batch):
+                    return
+        finally:
+            connection.close()
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        if self._reader is None:
+            self._reader = self._connect()
+        return self._reader.execute(sql, params).fetchall()
+
+    def player_history(self, player: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return a player's most recent sessions, newest first."""
+        rows = self._read(
+            "SELECT s.id, s.finished_at, s.score, s.answered, s.total_time, s.time_limit"
+            " FROM sessions s JOIN players p ON p.id = s.player_id"
+            " WHERE p.name = ? ORDER BY s.finished_at DESC LIMIT ?",
+            (player, limit),
+        )
+        keys = ("session_id", "finished_at", "score", "answered", "total_time", "time_limit")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def category_accuracy(self, player: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """Return correct/total answers per category, for one player or everyone."""
+        if player is None:
+            rows = self._read(
+                "SELECT c.name, t.correct, t.total FROM category_totals t"
+                " JOIN categories c ON c.id = t.category_id ORDER BY c.name")
+        else:
+            rows = self._read(
+                "SELECT c.name, t.correct, t.total FROM player_category_totals t"
+                " JOIN categories c ON c.id = t.category_id"
+                " WHERE t.player_id = (SELECT id FROM players WHERE name = ?) ORDER BY c.name",
+                (player,))
+        return {name: {"correct": correct, "total": total} for name, correct, total in rows}
+
+    def leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the highest-scoring sessions; ties go to the faster player."""
+        rows = self._read(
+            "SELECT p.name, s.score, s.answered, s.total_time, s.finished_at"
+            " FROM sessions s JOIN players p ON p.id = s.player_id"
+            " ORDER BY s.score DESC, s.total_time LIMIT ?",
+            (limit,),
+        )
+        keys = ("player", "score", "answered", "total_time", "finished_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+
+class _BatchWriter:
+    """Writes batches of sessions, caching the ids of names it has seen."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self._players: Dict[str, int] = {}
+        self._categories: Dict[str, int] = {}
+        self._questions: Dict[bytes, int] = {}  # Content hash -> id
+
+    def _intern(self, cache: Dict[str, int], table: str, name: str) -> int:
+        row_id = cache.get(name)
+        if row_id is None:
+            cursor = self.connection.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            row_id = cursor.lastrowid if cursor.rowcount else self.connection.execute(
+                f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+            cache[name] = row_id
+        return row_id
+
+    def _question_id(self, text: str, options: List[str], category: str, category_id: int,
+                     correct_answer: int) -> int:
+        key = question_key(text, options, category)
+        row_id = self._questions.get(key)
+        if row_id is None:
+            encoded_options = json.dumps(options, ensure_ascii=False, separators=(",", ":"))
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO questions (content_hash, text, options, category_id, correct_answer)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, text, encoded_options, category_id, correct_answer))
+            row_id = cursor.lastrowid if cursor.rowcount else self.connection.execute(
+                "SELECT id FROM questions WHERE content_hash = ?", (key,)).fetchone()[0]
+            self._questions[key] = row_id
+        return row_id
+
+    def write(self, records: List[SessionRecord]):
+        try:
+            with self.connection:
+                self._write(records)
+        except Exception:
+            # Rolled back: ids cached during this batch may not exist
+            self._players.clear()
+            self._categories.clear()
+            self._questions.clear()
+            raise
+
+    def _write(self, records: List[SessionRecord]):
+        answer_rows = []
+        totals: Dict[Tuple[int, int], List[int]] = {}
+        for record in records:
+            player_id = self._intern(self._players, "players", record.player)
+            session_id = self.connection.execute(
+                "INSERT INTO sessions (player_id, finished_at, score, answered, total_time, time_limit)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (player_id, record.finished_at, record.score, record.answered,
+                 record.total_time, record.time_limit),
+            ).lastrowid
+            for position, (text, options, category, correct_answer, answer, time_taken) \
+                    in enumerate(record.answers):
+                category_id = self._intern(self._categories, "categories", category)
+                question_id = self._question_id(text, options, category, category_id, correct_answer)
+                correct = int(answer == correct_answer)
+                answer_rows.append((session_id, position, question_id, answer, correct, time_taken))
+                total = totals.setdefault((player_id, category_id), [0, 0])
+                total[0] += correct
+                total[1] += 1
+
+        self.connection.executemany(
+            "INSERT INTO answers (session_id, position, question_id, answer, correct, time_taken)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            answer_rows,
+        )
+        self.connection.executemany(
+            "INSERT INTO player_category_totals (player_id, category_id, correct, total)"
+            " VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (player_id, category_id)"
+            " DO UPDATE SET correct = correct + excluded.correct, total = total + excluded.total",
+            [(player_id, category_id, correct, total)
+             for (player_id, category_id), (correct, total) in totals.items()],
+        )
+        category_totals: Dict[int, List[int]] = {}
+        for (_, category_id), (correct, total) in totals.items():
+            overall = category_totals.setdefault(category_id, [0, 0])
+            overall[0] += correct
+            overall[1] += total
+        self.connection.executemany(
+            "INSERT INTO category_totals (category_id, correct, total) VALUES (?, ?, ?)"
+            " ON CONFLICT (category_id)"
+            " DO UPDATE SET correct = correct + excluded.correct, total = total + excluded.total",
+            [(category_id, correct, total) for category_id, (correct, total) in category_totals.items()],
+        )
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show stored quiz results.")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_PATH, help="results database")
+    parser.add_argument("--player", help="show this player's history and category accuracy")
+    parser.add_argument("--leaderboard", action="store_true", help="show the top scores")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    try:
+        if args.leaderboard or not args.player:
+            print("Leaderboard")
+            for rank, entry in enumerate(store.leaderboard(args.limit), 1):
+                print(f"{rank:3}. {entry['player']:20} {entry['score']}/{entry['answered']}"
+                      f"  {entry['total_time']:.1f} s")
+        if args.player:
+            print(f"Recent quizzes for {args.player}")
+            for entry in store.player_history(args.player, args.limit):
+                finished = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["finished_at"]))
+                print(f"  {finished}  {entry['score']}/{entry['answered']}  {entry['total_time']:.1f} s")
+            print("Accuracy by category")
+            for category, stats in store.category_accuracy(args.player).items():
+                percentage = (stats["correct"] / stats["total"]) * 100 if stats["total"] else 0.0
+                print(f"  {category}: {stats['correct']}/{stats['total']} ({percentage:.1f}%)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""Full-text search over a question bank.
+
+SearchIndex is an inverted index: for every term (a casefolded word of a
+question's text, options or category) it keeps the questions containing
+it. Each posting is one 64-bit key, the question's length in words above
+its id, and a term's keys are kept sorted, so its postings run from the
+shortest question to the longest. The last word of a query also matches as
+a prefix, so results can follow a word while it is being typed.
+
+BM25 ranks short questions above long ones, so a query is answered by
+walking the postings of its words from the shortest question on, a chunk
+at a time, intersecting each chunk with set operations (the rarest word
+first) and stopping as soon as enough matches have been found. Work
+therefore depends on how many questions are needed rather than on how
+many contain a common word such as "what".
+Only the MAX_SCORED shortest matches are scored; a longer question that
+repeats a query word can occasionally rank below them. One-word queries
+are exact: common terms also keep a head, their highest-scoring questions,
+which a query rebuilds if questions were added since it was built (the
+average length, and with it every score, may have moved).
+
+Questions are indexed incrementally as they are added to the bank, and the
+index can be saved so it does not have to be rebuilt on the next start. A
+CRC32 chained over every indexed question is saved with it; a saved index
+is checked against the bank before it is extended and rebuilt if any of
+its questions changed::
+
+    index = SearchIndex.load(bank, "questions.qidx")  # indexes any new questions
+    for question_id, score in index.search("capital austr"):
+        print(bank[question_id].text)
+    index.save("questions.qidx")
+
+Run the module to search a bank from the command line::
+
+    python search_index.py questions.jsonl "capital of"
+"""
+import heapq
+import math
+import os
+import re
+import struct
+import zlib
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+MAGIC = b"QZIX"
+VERSION = 2
+
+HEADER = struct.Struct("<4sHHQQQQI")  # magic, version, reserved, questions, terms, term bytes, postings, checksum
+
+K1 = 1.2  # BM25 term frequency saturation
+B = 0.75  # BM25 document length normalisation
+MIN_PREFIX = 2  # Shorter final words only match whole terms
+MAX_EXPANSIONS = 64  # Most frequent terms a prefix expands to
+MAX_SCORED = 500  # Shortest matches scored for one query
+PROBE_COST = 8  # Binary search lookups cost about this many set membership tests
+HEAD_SIZE = 64  # Top-scoring questions kept per common term; also the largest limit heads can serve
+HEAD_MIN_POSTINGS = 256  # Terms in at least this many questions get a head
+MAX_FREQUENCY = 255  # Occurrences of a term in one question are counted up to this
+NEW_TERMS_LIMIT = 1024  # New terms kept apart before being merged into the sorted term list
+ID_BITS = 32  # Low bits of a posting key hold the question id
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into casefolded words."""
+    return _WORD.findall(text.casefold())
+
+
+def _checksum(question: Any, value: int = 0) -> int:
+    """Fold a question's text, options and category into a running CRC32."""
+    fields = "\x1f".join([question.text, *question.options, question.category])
+    return zlib.crc32(fields.encode("utf-8") + b"\x1e", value)
+
+
+class SearchIndexError(ValueError):
+    """Raised when a file is not a valid search index."""
+
+
+class SearchIndex:
+    """Inverted index with prefix matching and BM25 ranking.
+
+    Question ids are assigned in the order questions are added, so an index
+    kept next to a QuestionBank uses the same ids as the bank.
+    """
+
+    def __init__(self):
+        self._terms: Dict[str, int] = {}
+        self._sorted_terms: List[str] = []
+        self._new_terms: List[str] = []  # Sorted; merged into _sorted_terms in bulk
+        # Posting keys (length << ID_BITS | question id) per term number. None means
+        # they are still the slice of _base_keys read from a file.
+        self._keys: List[Optional[array]] = []
+        self._unsorted: Set[int] = set()  # Terms whose keys were appended out of order
+        self._base_keys = array("Q")
+        self._base_offsets = array("Q")
+        # Most terms occur once per question; larger counts are kept apart as
+        # (question ids, counts) per term
+        self._repeats: Dict[int, Tuple[array, bytearray]] = {}
+        # Term number -> (question id << 8 | frequency) of its best questions, best first,
+        # and how many questions were indexed when it was built
+        self._heads: Dict[int, array] = {}
+        self._head_counts: Dict[int, int] = {}
+        self._lengths = array("H")  # Words per question
+        self._total_length = 0
+        self._checksum = 0  # Chained over every indexed question, in id order
+        # Questions of a read index checked against the bank so far, and their
+        # checksum; None once they all have been
+        self._checked: Optional[int] = None
+        self._checked_checksum = 0
+        self.modified = False
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / len(self._lengths) if self._lengths else 1.0
+
+    def _term_keys(self, term: int) -> Sequence[int]:
+        """Return the sorted posting keys of a term."""
+        keys = self._keys[term]
+        if keys is None:
+            return memoryview(self._base_keys)[self._base_offsets[term]:self._base_offsets[term + 1]]
+        if term in self._unsorted:
+            keys = self._keys[term] = array("Q", sorted(keys))
+            self._unsorted.discard(term)
+        return keys
+
+    def document_frequency(self, term: int) -> int:
+        """Return how many questions contain a term number."""
+        keys = self._keys[term]
+        if keys is None:
+            return self._base_offsets[term + 1] - self._base_offsets[term]
+        return len(keys)
+
+    def frequency(self, term: int, question_id: int) -> int:
+        """Return how often a term number occurs in a question that contains it."""
+        repeats = self._repeats.get(term)
+        if repeats is None:
+            return 1
+        ids, counts = repeats
+        i = bisect_left(ids, question_id)
+        return counts[i] if i < len(ids) and ids[i] == question_id else 1
+
+    def idf(self, document_frequency: int) -> float:
+        """Return the BM25 inverse document frequency of a term in that many questions."""
+        return math.log(1 + (len(self._lengths) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _weight(self, posting: int, average_length: float) -> float:
+        """BM25 weight of a head posting, before multiplying by the term's idf."""
+        frequency = posting & MAX_FREQUENCY
+        length = self._lengths[posting >> 8]
+        return frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average_length))
+
+    def add(self, question: Any) -> int:
+        """Index a question and return its id."""
+        question_id = len(self._lengths)
+        words = tokenize(question.text)
+        for option in question.options:
+            words += tokenize(option)
+        words += tokenize(question.category)
+        length = min(len(words), 0xFFFF)
+        self._lengths.append(length)
+        self._total_length += len(words)
+        self._checksum = _checksum(question, self._checksum)
+        self.modified = True
+
+        frequencies: Dict[str, int] = {}
+        for word in words:
+            frequencies[word] = frequencies.get(word, 0) + 1
+        key = length << ID_BITS | question_id
+        for word, frequency in frequencies.items():
+            frequency = min(frequency, MAX_FREQUENCY)
+            term = self._terms.get(word)
+            if term is None:
+                term = self._terms[word] = len(self._keys)
+                self._keys.append(array("Q"))
+                self._add_new_term(word)
+            elif self._keys[term] is None:
+                # Copy keys read from a file before changing them
+                self._keys[term] = array("Q", self._term_keys(term))
+            keys = self._keys[term]
+            if keys and keys[-1] > key:
+                self._unsorted.add(term)
+            keys.append(key)
+            if frequency > 1:
+                ids, counts = self._repeats.setdefault(term, (array("I"), bytearray()))
+                ids.append(question_id)
+                counts.append(frequency)
+        return question_id
+
+    def verify(self, bank: Any, limit: Optional[int] = None) -> int:
+        """Check up to limit questions of a read index against the bank; return how many.
+
+        Once every question has been checked, an index that does not match
+        the bank is emptied, so update() indexes the bank from the start.
+        """
+        if self._checked is None:
+            return 0
+        count = len(self._lengths)
+        if count > len(bank):
+            self._reset()
+            return 0
+        start = self._checked
+        end = count if limit is None else min(count, start + limit)
+        checksum = self._checked_checksum
+        for question_id in range(start, end):
+            checksum = _checksum(bank[question_id], checksum)
+        self._checked, self._checked_checksum = end, checksum
+        if end == count:
+            if checksum != self._checksum:
+                self._reset()
+            self._checked = None
+        return end - start
+
+    def _reset(self):
+        self.__init__()
+        self.modified = True
+
+    def update(self, bank: Any, limit: Optional[int] = None) -> int:
+        """Index questions the bank has and the index does not; return how many were added.
+
+        A read index is checked first; the questions checked count towards
+        limit and the return value.
+        """
+        checked = self.verify(bank, limit)
+        if limit is not None:
+            limit -= checked
+            if limit <= 0:
+                return checked
+        end = len(bank) if limit is None else min(len(bank), len(self._lengths) + limit)
+        start = len(self._lengths)
+        for question_id in range(start, end):
+            self.add(bank[question_id])
+        return checked + max(end - start, 0)
+
+    def _add_new_term(self, word: str):
+        insort(self._new_terms, word)
+        if len(self._new_terms) >= NEW_TERMS_LIMIT:
+            self._sorted_terms = sorted(self._sorted_terms + self._new_terms)
+            self._new_terms = []
+
+    def _head(self, term: int) -> array:
+        """Return a common term's head, rebuilding it if questions were added since."""
+        head = self._heads.get(term)
+        if head is None or self._head_counts[term] != len(self._lengths):
+            mask = (1 << ID_BITS) - 1
+            average_length = self.average_length
+            postings = [(key & mask) << 8 | self.frequency(term, key & mask) for key in self._term_keys(term)]
+            head = self._heads[term] = array("Q", heapq.nlargest(
+                HEAD_SIZE, postings, key=lambda p: self._weight(p, average_length)))
+            self._head_counts[term] = len(self._lengths)
+        return head
+
+    def expand(self, prefix: str) -> List[int]:
+        """Return the numbers of the most frequent terms starting with prefix."""
+        words = []
+        for terms in (self._sorted_terms, self._new_terms):
+            position = bisect_left(terms, prefix)
+            while position < len(terms) and terms[position].startswith(prefix):
+                words.append(terms[position])
+                position += 1
+        # In word order, so ties in frequency are broken the same way every time
+        matches = [self._terms[word] for word in sorted(words)]
+        if len(matches) > MAX_EXPANSIONS:
+            matches = heapq.nlargest(MAX_EXPANSIONS, matches, key=self.document_frequency)
+        return matches
+
+    def _query_groups(self, query: str, prefix: bool) -> List[List[int]]:
+        """Return the matching term numbers for each word of a query."""
+        words = tokenize(query)
+        # A word still being typed is matched as a prefix
+        typing = prefix and bool(words) and not query[-1].isspace()
+        groups = []
+        for i, word in enumerate(words):
+            if typing and i == len(words) - 1 and len(word) >= MIN_PREFIX:
+                terms = self.expand(word)
+            else:
+                term = self._terms.get(word)
+                terms = [] if term is None else [term]
+            if not terms:
+                return []
+            groups.append(terms)
+        return groups
+
+    def _shortest_matches(self, groups: List[List[int]], count: int) -> List[int]:
+        """Return the keys of up to count of the shortest questions matching every group."""
+        keys = [[self._term_keys(term) for term in terms] for terms in groups]
+        # Chunks of key space end at positions in the largest term of the rarest word
+        pivot = max(keys[0], key=len)
+        matches: List[int] = []
+        start, position, step = 0, 0, count
+        while position < len(pivot) and len(matches) < count:
+            position += step
+            end = pivot[position] if position < len(pivot) else 1 << 64
+            # Only the rarest word's keys are copied into a set; the others are checked against it
+            found: Set[int] = set()
+            for term in keys[0]:
+                found.update(term[bisect_left(term, start):bisect_left(term, end)])
+            for term_keys in keys[1:]:
+                if not found:
+                    break
+                chunk: Set[int] = set()
+                for term in term_keys:
+                    chunk |= self._within(found, term, bisect_left(term, start), bisect_left(term, end))
+                found = chunk
+            matches.extend(sorted(found))
+            # Size the next chunk from the share of keys that matched so far
+            estimate = int((count - len(matches)) * position / len(matches) * 1.25) + 1 if matches else step * 4
+            step = min(estimate, step * 4)
+            start = end
+        return matches[:count]
+
+    @staticmethod
+    def _within(found: Set[int], keys: Sequence[int], low: int, high: int) -> Set[int]:
+        """Return the keys in found that are also in keys[low:high]."""
+        if len(found) * PROBE_COST < high - low:
+            # Look each one up rather than walk a much longer slice
+            within = set()
+            for key in found:
+                position = bisect_left(keys, key, low, high)
+                if position < high and keys[position] == key:
+                    within.add(key)
+            return within
+        return found.intersection(keys[low:high])
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> List[Tuple[int, float]]:
+        """Return up to limit (question id, score) pairs matching every word of query, best first.
+
+        A word that matches several terms (a prefix) counts once in every
+        question that contains any of them.
+        """
+        groups = self._query_groups(query, prefix)
+        if not groups or limit <= 0:
+            return []
+        # Rarest words first, so intersections shrink quickly
+        sized = sorted((sum(map(self.document_frequency, terms)), terms) for terms in groups)
+        groups = [terms for _, terms in sized]
+        idfs = [self.idf(min(size, len(self._lengths))) for size, _ in sized]
+        base = K1 * (1 - B)
+        per_word = K1 * B / self.average_length
+
+        scores: Dict[int, float] = {}
+        if len(groups) == 1 and len(groups[0]) == 1 and limit <= HEAD_SIZE:
+            # A common term's head holds its best questions
+            term = groups[0][0]
+            if self.document_frequency(term) >= HEAD_MIN_POSTINGS:
+                head = self._head(term)
+                saturation = idfs[0] * (K1 + 1)
+                for posting in head[:limit]:
+                    frequency = posting & MAX_FREQUENCY
+                    scores[posting >> 8] = saturation * frequency / (
+                        frequency + base + per_word * self._lengths[posting >> 8])
+                return self._best(scores, limit)
+
+        # Words without repeated occurrences score the same in every question of a length
+        repeated = [(terms[0], idf) for terms, idf in zip(groups, idfs)
+                    if len(terms) == 1 and terms[0] in self._repeats]
+        once = (K1 + 1) * (sum(idfs) - sum(idf for _, idf in repeated))
+        mask = (1 << ID_BITS) - 1
+        for key in self._shortest_matches(groups, max(MAX_SCORED, limit)):
+            question_id = key & mask
+            norm = base + per_word * (key >> ID_BITS)
+            score = once / (1 + norm)
+            for term, idf in repeated:
+                frequency = self.frequency(term, question_id)
+                score += idf * (K1 + 1) * frequency / (frequency + norm)
+            scores[question_id] = score
+        return self._best(scores, limit)
+
+    @staticmethod
+    def _best(scores: Dict[int, float], limit: int) -> List[Tuple[int, float]]:
+        # Equal scores go to the earlier question, so results do not depend on term order
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def save(self, path: str):
+        """Write the index to a file, replacing it atomically."""
+        terms = [self._terms[word] for word in sorted(self._terms)]
+        # Heads that are out of date are left out and rebuilt when next needed
+        heads = {term: head for term, head in self._heads.items()
+                 if self._head_counts[term] == len(self._lengths)}
+        encoded = "\n".join(sorted(self._terms)).encode("utf-8")
+        offsets = array("Q", [0])
+        repeat_offsets = array("Q", [0])
+        head_offsets = array("Q", [0])
+        for term in terms:
+            offsets.append(offsets[-1] + self.document_frequency(term))
+            repeat_offsets.append(repeat_offsets[-1] + len(self._repeats.get(term, ((), ()))[0]))
+            head_offsets.append(head_offsets[-1] + len(heads.get(term, ())))
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(self._lengths), len(terms),
+                                len(encoded), offsets[-1], self._checksum))
+            f.write(encoded)
+            offsets.tofile(f)
+            repeat_offsets.tofile(f)
+            head_offsets.tofile(f)
+            self._lengths.tofile(f)
+            for term in terms:
+                f.write(self._term_keys(term))
+            for term in terms:
+                f.write(self._repeats.get(term, (b"", b""))[0])
+            for term in terms:
+                f.write(self._repeats.get(term, (b"", b""))[1])
+            for term in terms:
+                f.write(heads.get(term, b""))
+        os.replace(temp_path, path)
+        self.modified = False
+
+    @classmethod
+    def read(cls, path: str) -> "SearchIndex":
+        """Read an index written by save()."""
+        index = cls()
+        with open(path, "rb") as f:
+            try:
+                magic, version, _, count, num_terms, term_bytes, num_postings, checksum = \
+                    HEADER.unpack(f.read(HEADER.size))
+            except struct.error:
+                raise SearchIndexError(f"{path}: file is too short to be a search index")
+            if magic != MAGIC:
+                raise SearchIndexError(f"{path}: not a search index")
+            if version != VERSION:
+                raise SearchIndexError(f"{path}: unsupported index format version {version}")
+            try:
+                terms = f.read(term_bytes).decode("utf-8")
+                index._base_offsets.fromfile(f, num_terms + 1)
+                repeat_offsets = array("Q")
+                repeat_offsets.fromfile(f, num_terms + 1)
+                head_offsets = array("Q")
+                head_offsets.fromfile(f, num_terms + 1)
+                index._lengths.fromfile(f, count)
+                index._base_keys.fromfile(f, num_postings)
+                repeat_ids = array("I")
+                repeat_ids.fromfile(f, repeat_offsets[-1])
+                repeat_counts = f.read(repeat_offsets[-1])
+                heads = array("Q")
+                heads.fromfile(f, head_offsets[-1])
+            except (EOFError, ValueError):
+                raise SearchIndexError(f"{path}: file is truncated")
+
+        index._sorted_terms = terms.split("\n") if num_terms else []
+        index._terms = dict(zip(index._sorted_terms, range(num_terms)))
+        index._keys = [None] * num_terms
+        for term in range(num_terms):
+            start, end = repeat_offsets[term], repeat_offsets[term + 1]
+            if start != end:
+                index._repeats[term] = (repeat_ids[start:end], bytearray(repeat_counts[start:end]))
+            start, end = head_offsets[term], head_offsets[term + 1]
+            if start != end:
+                index._heads[term] = heads[start:end]
+                index._head_counts[term] = count
+        index._total_length = sum(index._lengths)
+        index._checksum = checksum
+        index._checked = 0 if count else None
+        return index
+
+    @classmethod
+    def load(cls, bank: Any, path: Optional[str] = None, index_new: bool = True) -> "SearchIndex":
+        """Read a saved index and bring it up to date with the bank.
+
+        The index starts empty when there is no saved index, and is emptied
+        when it no longer matches the bank (the bank shrank or its questions
+        changed). Pass index_new=False to leave checking the saved questions
+        and indexing the rest of the bank to update(), a slice at a time.
+        """
+        index = None
+        if path is not None:
+            try:
+                index = cls.read(path)
+            except (OSError, SearchIndexError):
+                pass
+        if index is None:
+            index = cls()
+        if index_new:
+            index.update(bank)
+        return index
+
+
+def index_path(bank_path: str) -> str:
+    """Return where the search index of a bank file is kept."""
+    return os.path.splitext(bank_path)[0] + ".qidx"
+
+
+def main():
+    import argparse
+    import time
+
+    from question_loader import load_bank
+
+    parser = argparse.ArgumentParser(description="Search a question bank.")
+    parser.add_argument("bank", help="question bank (.jsonl, .csv or .qbank)")
+    parser.add_argument("query", nargs="+", help="words to search for; the last may be a prefix")
+    parser.add_argument("--index", help="saved index to use and update (default: next to the bank)")
+    parser.add_argument("--limit", type=int, default=20, help="number of results (default 20)")
+    args = parser.parse_args()
+
+    bank = load_bank(args.bank)
+    path = args.index or index_path(args.bank)
+    index = SearchIndex.load(bank, path)
+    if index.modified:
+        index.save(path)
+
+    start = time.perf_counter()
+    results = index.search(" ".join(args.query), args.limit)
+    elapsed = time.perf_counter() - start
+    for question_id, score in results:
+        question = bank[question_id]
+        print(f"{score:6.2f}  [{question.category}] {question.text}")
+    print(f"{len(results)} results in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Bot players for load-testing the quiz flow without a server or display.
+
+Each bot starts a quiz, answers or lets time run out on every question, and
+finishes on the results, through the same QuizEngine the GUI and server
+use. Bots run on a simulated clock, so a 15-second answer costs nothing to
+wait for and a whole quiz takes microseconds of real time. How good and how
+quick the bots are is tunable: every bot draws its accuracy from a normal
+distribution, and every response time comes from a log-normal one. A
+response that would take longer than the time limit becomes a time-up.
+
+Bots are split into batches over a pool of worker processes. Workers share
+nothing but the bank file, and their statistics are streaming summaries
+that merge exactly, so throughput grows with the number of cores::
+
+    python simulator.py --players 1000000 --questions 10 --accuracy 0.65
+
+The report gives throughput, the real time spent in each engine call, the
+simulated answer times and the distribution of final scores.
+"""
+import math
+import os
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from instrumentation import Timing
+from quiz_engine import QuizEngine
+from quiz_stats import PERCENTILES, QuizStats, StatsRecorder
+
+BATCH_SIZE = 2000  # Bots per task handed to a worker process
+ENGINE_CALLS = ("start", "answer", "timeout", "next")
+BAR_WIDTH = 40  # Characters in the longest score distribution bar
+
+
+class BotConfig(NamedTuple):
+    questions: int = 10  # Questions per quiz
+    time_limit: int = 15  # Seconds per question
+    accuracy: float = 0.7  # Mean chance that a bot picks the right option
+    accuracy_spread: float = 0.15  # Standard deviation of accuracy between bots
+    median_time: float = 5.0  # Median response time in seconds
+    time_spread: float = 0.6  # Sigma of the log-normal response time
+    categories: Optional[Tuple[str, ...]] = None  # None plays every category
+
+
+class SimulatedClock:
+    """A clock that only moves when told to."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class SimulationResult:
+    """Everything a batch of bots measured; results of several batches merge."""
+
+    def __init__(self):
+        self.players = 0
+        self.calls: Dict[str, Timing] = {name: Timing() for name in ENGINE_CALLS}
+        self.stats = QuizStats()
+        self.scores: Counter = Counter()  # Final score -> number of players
+        self.busy = 0.0  # Seconds of real time the workers spent playing
+
+    @property
+    def answers(self) -> int:
+        return self.stats.overall.total
+
+    def merge(self, other: "SimulationResult"):
+        self.players += other.players
+        for name, timing in other.calls.items():
+            self.calls[name].stats.merge(timing.stats)
+            self.calls[name].histogram.merge(timing.histogram)
+        self.stats.merge(other.stats)
+        self.scores.update(other.scores)
+        self.busy += other.busy
+
+
+def play(bank: Any, config: BotConfig, players: int, seed: int) -> SimulationResult:
+    """Play players quizzes against bank, one bot after another."""
+    rng = random.Random(seed)
+    clock = SimulatedClock()
+    engine = QuizEngine(bank, clock=clock, rng=rng)
+    result = SimulationResult()
+    StatsRecorder(engine, result.stats)
+    categories = list(config.categories or bank.categories())
+    mu = math.log(config.median_time)
+    time_limit = config.time_limit
+    timings = result.calls
+    start_timing, answer_timing = timings["start"], timings["answer"]
+    timeout_timing, next_timing = timings["timeout"], timings["next"]
+    perf_counter = time.perf_counter
+
+    began = perf_counter()
+    for _ in range(players):
+        accuracy = min(max(rng.gauss(config.accuracy, config.accuracy_spread), 0.0), 1.0)
+        started = perf_counter()
+        session = engine.start(categories, config.questions, time_limit)
+        start_timing.add(perf_counter() - started)
+        while True:
+            response_time = rng.lognormvariate(mu, config.time_spread)
+            if response_time >= time_limit:
+                clock.advance(time_limit)
+                started = perf_counter()
+                engine.timeout()
+                timeout_timing.add(perf_counter() - started)
+            else:
+                clock.advance(response_time)
+                question = session.current_question()
+                choice = question.correct_answer
+                if rng.random() >= accuracy:
+                    # Any wrong option, equally likely
+                    choice = (choice + rng.randrange(1, len(question.options))) % len(question.options)
+                started = perf_counter()
+                engine.answer(choice)
+                answer_timing.add(perf_counter() - started)
+            started = perf_counter()
+            more = engine.next()
+            next_timing.add(perf_counter() - started)
+            if not more:
+                break
+        result.scores[session.score] += 1
+    result.busy = perf_counter() - began
+    result.players = players
+    return result
+
+
+_worker_bank = None
+
+
+def _init_worker(bank_path: str):
+    global _worker_bank
+    from question_loader import load_bank
+
+    _worker_bank = load_bank(bank_path)
+
+
+def _play_batch(task: Tuple[BotConfig, int, int]) -> SimulationResult:
+    config, players, seed = task
+    return play(_worker_bank, config, players, seed)
+
+
+def batches(players: int, batch_size: int, seed: int) -> Iterator[Tuple[int, int]]:
+    """Yield (players, seed) for each batch; the seeds make a run repeatable."""
+    for number, first in enumerate(range(0, players, batch_size)):
+        yield min(batch_size, players - first), seed * 1_000_003 + number
+
+
+def simulate(bank_path: str, config: BotConfig, players: int, workers: int = 0,
+             batch_size: int = BATCH_SIZE, seed: int = 0) -> SimulationResult:
+    """Play players quizzes spread over workers processes (all cores by default)."""
+    workers = workers or os.cpu_count() or 1
+    tasks = [(config, count, batch_seed) for count, batch_seed in batches(players, batch_size, seed)]
+    total = SimulationResult()
+    if workers == 1:
+        # Play in this process; handy under a profiler
+        _init_worker(bank_path)
+        for task in tasks:
+            total.merge(_play_batch(task))
+        return total
+
+    import multiprocessing
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(bank_path,)) as pool:
+        for result in pool.imap_unordered(_play_batch, tasks):
+            total.merge(result)
+    return total
+
+
+def score_rows(scores: Counter) -> List[Tuple[int, int]]:
+    """Return (score, players) for every score from 0 to the highest seen."""
+    top = max(scores, default=0)
+    return [(score, scores.get(score, 0)) for score in range(top + 1)]
+
+
+def report(result: SimulationResult, elapsed: float, workers: int):
+    answers = result.answers
+    print(f"Players:            {result.players} ({result.players / elapsed:.0f}/s)")
+    print(f"Answers:            {answers} ({answers / elapsed:.0f}/s)")
+    print(f"Elapsed:            {elapsed:.2f} s on {workers} worker(s), "
+          f"{result.busy / elapsed / workers:.0%} busy")
+    print("Engine call latency:")
+    for name in ENGINE_CALLS:
+        timing = result.calls[name]
+        if not timing.stats.count:
+            continue
+        quantiles = "  ".join(f"{label} {timing.histogram.quantile(fraction) * 1e6:7.1f}"
+                              for label, fraction in PERCENTILES)
+        print(f"  {name:8} {quantiles}  max {timing.stats.max * 1e6:8.1f} us")
+
+    overall = result.stats.overall
+    print(f"Accuracy:           {overall.accuracy:.1%} ({overall.timeouts} time-ups)")
+    times = "  ".join(f"{label} {seconds:.2f} s" for label, seconds in overall.percentiles().items())
+    print(f"Simulated answers:  {times}")
+
+    rows = score_rows(result.scores)
+    print("Final scores:")
+    most = max((players for _, players in rows), default=0)
+    for score, players in rows:
+        bar = "#" * round(BAR_WIDTH * players / most) if most else ""
+        print(f"  {score:3} {players:10} {players / result.players:6.1%} {bar}")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    from question_loader import DEFAULT_BANK_PATH
+
+    defaults = BotConfig()
+    parser = argparse.ArgumentParser(description="Play bot players through the quiz engine in parallel.")
+    parser.add_argument("--bank", default=DEFAULT_BANK_PATH, help="question bank (.jsonl, .csv or .qbank)")
+    parser.add_argument("--players", type=int, default=100_000, help="quizzes to play")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: one per core)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="bots per task handed to a worker")
+    parser.add_argument("--questions", type=int, default=defaults.questions, help="questions per quiz")
+    parser.add_argument("--time-limit", type=int, default=defaults.time_limit, help="seconds per question")
+    parser.add_argument("--category", action="append", dest="categories",
+                        help="play only this category (repeatable)")
+    parser.add_argument("--accuracy", type=float, default=defaults.accuracy,
+                        help="mean chance of a right answer")
+    parser.add_argument("--accuracy-spread", type=float, default=defaults.accuracy_spread,
+                        help="standard deviation of accuracy between bots")
+    parser.add_argument("--median-time", type=float, default=defaults.median_time,
+                        help="median response time in seconds")
+    parser.add_argument("--time-spread", type=float, default=defaults.time_spread,
+                        help="sigma of the log-normal response time; larger means more time-ups")
+    parser.add_argument("--seed", type=int, default=0, help="seed for a repeatable run")
+    args = parser.parse_args(argv)
+    if args.players < 1 or args.batch < 1 or args.workers < 0:
+        parser.error("--players and --batch must be positive and --workers not negative")
+    if not 0.0 <= args.accuracy <= 1.0 or args.median_time <= 0:
+        parser.error("--accuracy must be between 0 and 1 and --median-time positive")
+
+    config = BotConfig(args.questions, args.time_limit, args.accuracy, args.accuracy_spread,
+                       args.median_time, args.time_spread,
+                       tuple(args.categories) if args.categories else None)
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    result = simulate(args.bank, config, args.players, workers, args.batch, args.seed)
+    report(result, time.perf_counter() - started, workers)
+
+
+if __name__ == "__main__":
+    main()
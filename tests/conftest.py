@@ -0,0 +1,68 @@
+"""Shared fixtures: small question banks built in memory."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import Question, QuestionBank  # noqa: E402
+from quiz_engine import QuizResults  # noqa: E402
+from quiz_session import QuizSession  # noqa: E402
+
+CATEGORIES = ("Science", "History", "Geography")
+
+
+def make_question(number: int, category: str = "Science", options: int = 4) -> Question:
+    """Return a distinct question whose right answer is number % options."""
+    return Question(f"Question {number} about {category}?",
+                    [f"Answer {number}.{i}" for i in range(options)],
+                    number % options, category)
+
+
+def play_session(bank, question_ids, answers, time_taken: float = 2.0, time_limit: int = 15):
+    """Play a deck without shuffling; answers are option indices, None for a time-up.
+
+    Returns the finished QuizSession and its QuizResults.
+    """
+    session = QuizSession(bank, question_ids, time_limit)
+    for answer in answers:
+        if answer is None:
+            session.record_timeout(time_limit)
+        else:
+            session.record_answer(answer, time_taken)
+        session.advance()
+    results = QuizResults(session.score, session.answered_count, session.total_time,
+                          session.category_stats)
+    return session, results
+
+
+@pytest.fixture
+def make_questions():
+    """make_questions(per_category, categories) -> list of questions, category by category."""
+    def make(per_category: int = 10, categories=CATEGORIES):
+        questions = []
+        for category in categories:
+            for _ in range(per_category):
+                questions.append(make_question(len(questions), category))
+        return questions
+    return make
+
+
+@pytest.fixture
+def make_bank(make_questions):
+    """make_bank(per_category, categories) -> QuestionBank of make_questions()."""
+    def make(per_category: int = 10, categories=CATEGORIES) -> QuestionBank:
+        return QuestionBank(make_questions(per_category, categories))
+    return make
+
+
+@pytest.fixture
+def bank(make_bank) -> QuestionBank:
+    return make_bank()
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    return random.Random(1234)
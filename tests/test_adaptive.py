@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from adaptive import (INITIAL_RATING, PROBES_PER_QUESTION, RELEARN_INTERVAL, AdaptiveScheduler,
+                      IndexedHeap, ReviewQueue, expected_score)
+from quiz_engine import QuizEngine
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_expected_score_is_even_for_equal_ratings():
+    assert expected_score(1500, 1500) == pytest.approx(0.5)
+    assert expected_score(1700, 1500) > 0.5
+
+
+def test_indexed_heap_reprioritises_and_removes(rng):
+    heap = IndexedHeap()
+    priorities = {item: rng.random() for item in range(200)}
+    for item, priority in priorities.items():
+        heap.push(item, priority)
+    for item in range(0, 200, 3):
+        priorities[item] = rng.random()
+        heap.push(item, priorities[item])
+    for item in range(1, 200, 5):
+        heap.remove(item)
+        del priorities[item]
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted((p, i) for i, p in priorities.items())
+
+
+def test_review_queue_counts_due_items(rng):
+    queue = ReviewQueue()
+    dues = {}
+    now = 0.0
+    for step in range(2000):
+        item = rng.randrange(300)
+        action = rng.random()
+        if action < 0.6:
+            dues[item] = now + rng.uniform(-5, 20)
+            queue.push(item, dues[item])
+        elif action < 0.7 and item in dues:
+            queue.remove(item)
+            del dues[item]
+        else:
+            # Mostly forward, sometimes back
+            now += rng.uniform(-2, 5)
+            assert queue.due_count(now) == sum(1 for due in dues.values() if due <= now)
+
+
+def test_due_reviews_come_first(bank, clock):
+    scheduler = AdaptiveScheduler(bank, clock)
+    player = scheduler.player("Alice")
+    science = bank.category_index["Science"]
+    player.record(science[0], "Science", False)
+    player.record(science[1], "Science", True)
+    assert player.due_count(["Science"]) == 0
+    clock.now += RELEARN_INTERVAL + 1
+    assert player.due_count(["Science", "History"]) == 1
+    deck = player.sample(["Science"], 5, random.Random(1))
+    assert deck[0] == science[0]
+    assert len(deck) == len(set(deck)) == 5
+    assert science[1] not in deck[:4]
+
+
+def test_new_questions_probe_a_bounded_number_of_ids(make_bank, clock):
+    bank = make_bank(5000, ["Science"])
+    scheduler = AdaptiveScheduler(bank, clock)
+    for question_id in range(5000):
+        scheduler.set_difficulty(question_id, "Science", INITIAL_RATING + 10)
+
+    class CountingSeen(dict):
+        lookups = 0
+
+        def __contains__(self, question_id):
+            CountingSeen.lookups += 1
+            return super().__contains__(question_id)
+
+    # The player has seen all but the last few questions
+    seen = CountingSeen((question_id, None) for question_id in range(4990))
+    chosen = scheduler.new_questions(["Science"], 3, INITIAL_RATING, seen, random.Random(2))
+    assert len(chosen) <= 3 and all(question_id >= 4990 for question_id in chosen)
+    assert CountingSeen.lookups <= 2 * PROBES_PER_QUESTION * 3
+
+
+def test_new_questions_prefer_the_target_difficulty(make_bank, clock):
+    bank = make_bank(100, ["Science"])
+    scheduler = AdaptiveScheduler(bank, clock)
+    for question_id in range(100):
+        scheduler.set_difficulty(question_id, "Science", 1000.0 + 10 * question_id)
+    chosen = scheduler.new_questions(["Science"], 3, 1500.0, {}, random.Random(3))
+    assert all(abs(1000.0 + 10 * question_id - 1500.0) <= 25 for question_id in chosen)
+
+
+def test_save_and_load_round_trip(tmp_path, bank, clock):
+    path = str(tmp_path / "adaptive.json")
+    scheduler = AdaptiveScheduler(bank, clock)
+    scheduler.player("Alice").record(3, bank[3].category, True)
+    scheduler.save(path)
+    loaded = AdaptiveScheduler.load(bank, path, clock)
+    assert loaded.difficulties == scheduler.difficulties
+    assert loaded.player("Alice").ability == scheduler.player("Alice").ability
+    assert 3 in loaded.player("Alice").reviews
+
+
+def test_attach_and_detach(bank, clock):
+    scheduler = AdaptiveScheduler(bank, clock)
+    engine = QuizEngine(bank, clock=clock, shuffle_options=False)
+    scheduler.attach(engine)
+    engine.selector = scheduler.player("Alice")
+    session = engine.start(["Science"], 2, 15)
+    engine.answer(session.current_question().correct_answer)
+    assert len(scheduler.difficulties) == 1
+    scheduler.detach()
+    engine.next()
+    engine.timeout()
+    assert len(scheduler.difficulties) == 1
@@ -0,0 +1,69 @@
+from collections import Counter
+
+import pytest
+
+from adaptive import AdaptiveScheduler
+from alias_sampler import AliasTable, DifficultyBands, WeightedSampler, _without
+
+
+def test_alias_table_follows_weights(rng):
+    table = AliasTable([1, 0, 3])
+    counts = Counter(table.draw(rng) for _ in range(40_000))
+    assert counts[1] == 0
+    assert counts[2] / counts[0] == pytest.approx(3, rel=0.1)
+
+
+def test_alias_table_needs_a_positive_weight():
+    with pytest.raises(ValueError):
+        AliasTable([0, 0])
+
+
+def test_without_leaves_exactly_the_other_ids(rng):
+    ids = list(range(0, 300, 3))
+    excluded = rng.sample(ids, 40)
+    group = _without(ids, excluded)
+    kept = [group.moved.get(position, ids[position]) for position in range(group.size)]
+    assert sorted(kept) == sorted(set(ids) - set(excluded))
+    assert len(group.moved) <= len(excluded)
+
+
+def test_sample_is_distinct_and_weighted(bank, rng):
+    sampler = WeightedSampler(bank, {"Science": 4, "History": 1, "Geography": 0})
+    counts = Counter()
+    for _ in range(2000):
+        deck = sampler.sample(["Science", "History", "Geography"], 5, rng)
+        assert len(set(deck)) == 5
+        counts.update(bank[question_id].category for question_id in deck)
+    assert counts["Geography"] == 0
+    assert counts["Science"] > 2 * counts["History"]
+
+
+def test_sample_stops_when_every_group_is_used_up(bank, rng):
+    sampler = WeightedSampler(bank, {})
+    deck = sampler.sample(["History"], 50, rng)
+    assert sorted(deck) == list(bank.category_index["History"])
+
+
+def test_medium_group_never_draws_rated_questions(bank, rng):
+    ratings = {question_id: 1000.0 for question_id in bank.category_index["Science"][:6]}
+    sampler = WeightedSampler(bank, {}, {"easy": 0, "medium": 1, "hard": 0},
+                              DifficultyBands.of(bank, ratings))
+    deck = sampler.sample(["Science"], 10, rng)
+    assert sorted(deck) == sorted(set(bank.category_index["Science"]) - set(ratings))
+
+
+def test_groups_follow_rating_changes(bank, rng):
+    scheduler = AdaptiveScheduler(bank)
+    sampler = WeightedSampler(bank, {}, {"easy": 0, "medium": 0, "hard": 1}, scheduler.bands)
+    assert sampler.sample(["Science"], 5, rng) == []
+
+    hard = bank.category_index["Science"][3]
+    scheduler.set_difficulty(hard, "Science", 1800.0)
+    assert sampler.sample(["Science"], 5, rng) == [hard]
+    groups, _ = sampler.table(frozenset(["Science"]))
+    # A change within the band keeps the groups; one out of it rebuilds them
+    scheduler.set_difficulty(hard, "Science", 1700.0)
+    assert sampler.table(frozenset(["Science"]))[0] is groups
+    scheduler.set_difficulty(hard, "Science", 1500.0)
+    assert sampler.sample(["Science"], 5, rng) == []
+    assert scheduler.bands.ids["Science"] == {"easy": set(), "hard": set()}
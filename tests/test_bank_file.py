@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from bank_file import HEADER, MAX_CATEGORIES, BankFileError, compile_bank, open_bank
+from conftest import make_question
+from question_loader import QuestionFormatError
+
+
+@pytest.fixture
+def compiled(tmp_path, make_questions):
+    questions = make_questions(5)
+    path = str(tmp_path / "bank.qbank")
+    assert compile_bank(questions, path) == len(questions)
+    return questions, path
+
+
+def test_round_trip(compiled):
+    questions, path = compiled
+    bank = open_bank(path)
+    assert len(bank) == len(questions)
+    assert sorted(bank.categories()) == sorted({q.category for q in questions})
+    for question in questions:
+        ids = bank.category_index[question.category]
+        assert any(bank[i].text == question.text and list(bank[i].options) == question.options
+                   and bank[i].correct_answer == question.correct_answer for i in ids)
+    bank.store.close()
+
+
+def test_compile_replaces_atomically(compiled, make_questions):
+    _, path = compiled
+    compile_bank(make_questions(2, ["Art"]), path)
+    assert not os.path.exists(path + ".tmp")
+    bank = open_bank(path)
+    assert list(bank.categories()) == ["Art"] and len(bank) == 2
+    bank.store.close()
+
+
+def test_interleaved_categories_are_grouped(tmp_path):
+    # Thousands of categories, each split into several runs across the stream
+    questions = [make_question(number, f"C{number % 3000}", options=2) for number in range(9000)]
+    path = str(tmp_path / "bank.qbank")
+    assert compile_bank(questions, path) == len(questions)
+    bank = open_bank(path)
+    assert len(bank.categories()) == 3000
+    assert [bank[i].text for i in bank.category_index["C7"]] == [
+        questions[n].text for n in (7, 3007, 6007)]
+    bank.store.close()
+
+
+@pytest.mark.parametrize("questions", [
+    [make_question(number, f"C{number}", options=2) for number in range(MAX_CATEGORIES + 1)],
+    [make_question(0)._replace(options=["yes", "n" * 0x10000])],
+    [make_question(0)._replace(text="é" * 0x8000)],
+])
+def test_fields_too_big_for_the_format_are_refused(compiled, questions):
+    _, path = compiled
+    before = open(path, "rb").read()
+    with pytest.raises(QuestionFormatError):
+        compile_bank(questions, path)
+    assert open(path, "rb").read() == before
+
+
+def test_failed_compile_keeps_old_file(compiled):
+    _, path = compiled
+    before = open(path, "rb").read()
+
+    def broken():
+        yield from ()
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        compile_bank(broken(), path)
+    assert open(path, "rb").read() == before
+    assert not os.path.exists(path + ".tmp")
+
+
+@pytest.mark.parametrize("keep", [0, 3, HEADER.size, HEADER.size + 5, -1])
+def test_empty_or_truncated_file_is_a_bank_file_error(compiled, keep):
+    _, path = compiled
+    data = open(path, "rb").read()
+    with open(path, "wb") as f:
+        f.write(data[:keep])
+    with pytest.raises(BankFileError):
+        open_bank(path)
+
+
+def test_other_file_is_rejected(tmp_path):
+    path = tmp_path / "bank.qbank"
+    path.write_bytes(b"not a bank at all, just some bytes" * 4)
+    with pytest.raises(BankFileError):
+        open_bank(str(path))
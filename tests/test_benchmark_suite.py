@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from suite import compare  # noqa: E402
+
+BASELINE = {
+    "deck_build/1000": {"p50_ms": 0.002},
+    "results_screen/10": {"p50_ms": 1.0},
+    "memory/1000": {"bytes_per_question": 100.0},
+}
+
+
+def test_small_time_changes_are_noise(capsys):
+    results = {
+        "deck_build/1000": {"p50_ms": 0.004},  # Twice as slow, but by 2 us
+        "results_screen/10": {"p50_ms": 1.1},
+        "memory/1000": {"bytes_per_question": 110.0},
+    }
+    assert compare(results, BASELINE, 0.2) == []
+
+
+def test_regressions_beyond_tolerance_and_floor(capsys):
+    results = {
+        "deck_build/1000": {"p50_ms": 0.010},
+        "results_screen/10": {"p50_ms": 1.5},
+        "memory/1000": {"bytes_per_question": 130.0},
+        "render": {"p50_ms": 9.0},  # No baseline to compare with
+    }
+    assert compare(results, BASELINE, 0.2) == ["deck_build/1000", "results_screen/10", "memory/1000"]
+    assert compare(results, BASELINE, 0.2, min_change_us=1000) == ["memory/1000"]
+    assert "REGRESSION" in capsys.readouterr().out
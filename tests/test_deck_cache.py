@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from deck_cache import DeckCache, build_deck
+from hot_reload import BankSnapshot
+
+
+@pytest.fixture
+def cache(bank):
+    cache = DeckCache(bank, seed=7, max_keys=2, depth=2)
+    yield cache
+    cache.close()
+
+
+def test_decks_are_reproducible(cache, bank):
+    first = cache.take(["Science", "History"], 5)
+    second = cache.take(["History", "Science"], 5)
+    assert (first.serial, second.serial) == (0, 1)
+    assert build_deck(bank, first.key, first.serial) == first
+    assert build_deck(bank, second.key, second.serial) == second
+    assert len(set(first.question_ids)) == 5
+
+
+def test_prefetched_decks_are_hits(cache):
+    cache.prefetch(["Science"], 3)
+    for _ in range(100):
+        if cache.stats()["ready_decks"] == 2:
+            break
+        time.sleep(0.01)
+    deck = cache.take(["Science"], 3)
+    assert deck.serial == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["prefetched"] >= 1
+
+
+def test_least_recently_used_key_is_evicted(cache):
+    cache.take(["Science"], 3)
+    cache.take(["History"], 3)
+    cache.take(["Science"], 3)
+    cache.take(["Geography"], 3)
+    assert len(cache) == 2 and cache.stats()["evictions"] == 1
+
+
+def test_new_bank_version_drops_decks_and_restarts_serials(cache, bank, make_bank):
+    cache.take(["Science"], 3)
+    cache.take(["Science"], 3)
+    replacement = BankSnapshot.of(make_bank(20), version=1, rebuilt=True)
+    cache.set_bank(replacement)
+    deck = cache.take(["Science"], 3)
+    assert (deck.serial, deck.version) == (0, cache.version)
+    assert all(question_id < len(replacement) for question_id in deck.question_ids)
+    assert build_deck(replacement, deck.key, 0, deck.version) == deck
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_growing_bank_invalidates(cache, bank, make_questions):
+    first = cache.take(["Science"], 3)
+    bank.extend(make_questions(1, ["Science"]))
+    deck = cache.take(["Science"], 3)
+    assert deck.version == first.version + 1 and deck.serial == 0
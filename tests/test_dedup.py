@@ -0,0 +1,65 @@
+from dedup import Deduplicator, _BucketTable, deduplicate, shingles
+from question_bank import Question
+
+OPTIONS = ["Sydney", "Canberra", "Melbourne", "Perth"]
+
+
+PLANETS = ["Mercury", "Venus", "Jupiter", "Mars"]
+
+
+def test_shingles_are_word_pairs_of_the_text():
+    assert shingles("What's up?") == {"\x02 what", "what s", "s up", "up \x03"}
+
+
+def test_reworded_question_is_a_duplicate():
+    deduplicator = Deduplicator()
+    original = Question("What is the capital city of Australia?", OPTIONS, 1, "Geography")
+    assert deduplicator.check(original) is None
+    # The same right answer in another place counts as the same answer
+    reordered = ["Perth", "Melbourne", "Sydney", "canberra"]
+    duplicate = deduplicator.check(Question("What is the capital of Australia?", reordered, 3, "Geography"))
+    assert duplicate is not None
+    assert (duplicate.index, duplicate.duplicate_of) == (1, 0)
+    assert duplicate.similarity >= deduplicator.threshold
+
+
+def test_same_prompt_with_other_options_is_kept():
+    deduplicator = Deduplicator()
+    deduplicator.check(Question("What is the capital of Australia?", OPTIONS, 1, "Geography"))
+    other = Question("What is the capital of Australia?", ["Vienna", "Graz", "Linz", "Salzburg"], 0, "Geography")
+    assert deduplicator.check(other) is None
+
+
+def test_questions_that_share_options_are_not_duplicates():
+    deduplicator = Deduplicator()
+    assert deduplicator.check(Question("The Sun is a star.", ["True", "False"], 0, "Science")) is None
+    assert deduplicator.check(Question("The Moon is a star.", ["True", "False"], 1, "Science")) is None
+    largest = Question("Which planet is the largest in the solar system?", PLANETS, 2, "Science")
+    smallest = Question("Which planet is the smallest in the solar system?", PLANETS, 0, "Science")
+    assert deduplicator.check(largest) is None
+    assert deduplicator.check(smallest) is None
+
+
+def test_different_right_answers_are_never_merged():
+    deduplicator = Deduplicator(threshold=0.0)
+    deduplicator.check(Question("Which planet is the largest?", PLANETS, 2, "Science"))
+    assert deduplicator.check(Question("Which planet is the largest?", PLANETS, 1, "Science")) is None
+    assert deduplicator.check(Question("Which planet is the largest?", PLANETS, 2, "Science")) is not None
+
+
+def test_deduplicate_drops_and_reports(make_questions):
+    questions = make_questions(20)
+    reported = []
+    kept = list(deduplicate(questions + questions[:5], on_duplicate=lambda d, q: reported.append(d)))
+    assert kept == questions
+    assert [d.duplicate_of for d in reported] == [0, 1, 2, 3, 4]
+
+
+def test_bucket_table_keeps_every_member_through_growth():
+    table = _BucketTable(capacity=4)
+    for member in range(100):
+        table.add(member % 7 + 1, member)
+    assert table.used == 100
+    assert len(table.keys) >= 200
+    assert sorted(table.get(3)) == list(range(2, 100, 7))
+    assert list(table.get(99)) == []
@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import play_session  # noqa: E402
+from grading import UNANSWERED, AnswerSheetError, grade, grade_deck, read_answer_sheets  # noqa: E402
+
+
+def test_grades_match_playing_the_deck(bank, rng):
+    question_ids = rng.sample(range(len(bank)), 12)
+    sheets = [[rng.choice([UNANSWERED, 0, 1, 2, 3]) for _ in question_ids] for _ in range(40)]
+    report = grade_deck(bank, question_ids, np.array(sheets, dtype=np.int8))
+    for student, sheet in enumerate(sheets):
+        answers = [None if answer == UNANSWERED else answer for answer in sheet]
+        _, results = play_session(bank, question_ids, answers)
+        assert report.scores[student] == results.score
+        assert report.category_stats(student) == results.category_stats
+    assert report.percentages()[0] == pytest.approx(100 * report.scores[0] / 12)
+
+
+def test_accuracy_per_question_and_category():
+    report = grade([[0, 1, 2], [0, 0, 2]], [0, 1, 2], ["A", "B", "A"])
+    assert list(report.question_accuracy()) == [1.0, 0.5, 1.0]
+    assert report.category_accuracy() == {"A": 1.0, "B": 0.5}
+
+
+def test_answer_matrix_must_fit_the_deck():
+    with pytest.raises(ValueError):
+        grade([[0, 1]], [0, 1, 2], ["A", "A", "A"])
+
+
+def test_answer_sheets_accept_numbers_letters_and_blanks(tmp_path):
+    path = tmp_path / "sheets.csv"
+    path.write_text("student,4,9,2\nAda,1,b,\nBo,D,3,a\n", encoding="utf-8")
+    students, question_ids, answers = read_answer_sheets(str(path))
+    assert students == ["Ada", "Bo"]
+    assert question_ids == [4, 9, 2]
+    assert answers.tolist() == [[0, 1, UNANSWERED], [3, 2, 0]]
+
+
+def test_invalid_answers_report_their_line(tmp_path):
+    path = tmp_path / "sheets.csv"
+    path.write_text("student,4\nAda,1\nBo,Z\n", encoding="utf-8")
+    with pytest.raises(AnswerSheetError, match=":3:"):
+        read_answer_sheets(str(path))
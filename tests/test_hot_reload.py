@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from conftest import make_question
+from hot_reload import BankReloader, BankSnapshot
+from question_loader import load_bank, write_jsonl
+
+
+def append_questions(path, questions):
+    with open(path, "a", encoding="utf-8") as f:
+        for question in questions:
+            f.write(json.dumps({"text": question.text, "options": list(question.options),
+                                "correct_answer": question.correct_answer,
+                                "category": question.category}) + "\n")
+
+
+def touch_later(path):
+    """Make the next poll see a new signature even on coarse file system clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def reload(reloader):
+    """Poll until the reloader publishes a snapshot, as the event loop would."""
+    for _ in range(4):
+        snapshot = reloader.poll()
+        reloader.close()
+        if snapshot is not None:
+            return snapshot
+    return None
+
+
+@pytest.fixture
+def bank_path(tmp_path, make_questions):
+    path = str(tmp_path / "bank.jsonl")
+    write_jsonl(make_questions(3), path)
+    return path
+
+
+def test_appended_questions_extend_the_shared_store(bank_path):
+    reloader = BankReloader(bank_path, load_bank(bank_path))
+    reloader.close()
+    first = reloader.snapshot
+    append_questions(bank_path, [make_question(100, "History"), make_question(101, "Music")])
+    touch_later(bank_path)
+
+    second = reload(reloader)
+    assert second is not None and not second.rebuilt
+    assert len(first) == 9 and len(second) == 11
+    assert second.store is first.store
+    assert second[10].category == "Music"
+    assert list(first.category_index["History"]) == [3, 4, 5]
+    assert list(second.category_index["History"]) == [3, 4, 5, 9]
+    assert second.category_index["Science"] is first.category_index["Science"]
+    with pytest.raises(IndexError):
+        first[9]
+
+
+def test_an_edited_file_is_rebuilt(bank_path, make_questions):
+    reloader = BankReloader(bank_path, load_bank(bank_path))
+    reloader.close()
+    write_jsonl(make_questions(2), bank_path)
+    touch_later(bank_path)
+
+    snapshot = reload(reloader)
+    assert snapshot.rebuilt and len(snapshot) == 6
+    assert snapshot.version == 1 and reloader.reloads == 1
+
+
+def test_a_broken_file_keeps_the_current_snapshot(bank_path):
+    reloader = BankReloader(bank_path, load_bank(bank_path))
+    reloader.close()
+    current = reloader.snapshot
+    with open(bank_path, "a", encoding="utf-8") as f:
+        f.write("{not json\n")
+    touch_later(bank_path)
+
+    assert reload(reloader) is None
+    assert reloader.snapshot is current
+    assert "invalid JSON" in reloader.error
+
+
+def test_a_line_that_is_not_an_object_is_reported(bank_path):
+    reloader = BankReloader(bank_path, load_bank(bank_path))
+    reloader.close()
+    with open(bank_path, "a", encoding="utf-8") as f:
+        f.write("[1, 2]\n")
+    touch_later(bank_path)
+
+    assert reload(reloader) is None
+    assert reloader.error.endswith(":10: expected a JSON object")
+
+    # Fixing the file is picked up by the next change
+    with open(bank_path, "r+", encoding="utf-8") as f:
+        lines = f.readlines()[:-1]
+        f.seek(0)
+        f.writelines(lines)
+        f.truncate()
+    append_questions(bank_path, [make_question(100, "History")])
+    touch_later(bank_path)
+    snapshot = reload(reloader)
+    assert snapshot is not None and len(snapshot) == 10
+    assert reloader.error is None
+
+
+def test_snapshots_are_read_only(bank):
+    with pytest.raises(TypeError):
+        BankSnapshot.of(bank).add(make_question(99))
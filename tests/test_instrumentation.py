@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from instrumentation import Instrumentation
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Root:
+    """Just enough of a Tk root for after(): callbacks run when run() is called."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.pending = []
+
+    def after(self, ms, callback, *args):
+        self.pending.append((self.clock.now + ms / 1000, callback, args))
+
+    def run(self, late=0.0):
+        due, callback, args = self.pending.pop(0)
+        self.clock.now = due + late
+        callback(*args)
+
+
+class App:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def show_results(self, seconds):
+        self.clock.now += seconds
+        return seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_instrumented_methods_are_timed(clock):
+    app = App(clock)
+    instrumentation = Instrumentation(clock)
+    instrumentation.instrument(app, ["show_results"])
+    assert app.show_results(0.25) == 0.25
+    app.show_results(0.5)
+    timing = instrumentation.spans["show_results"]
+    assert timing.stats.count == 2
+    assert timing.stats.max == pytest.approx(0.5)
+
+
+def test_spans_are_timed_even_when_they_raise(clock):
+    instrumentation = Instrumentation(clock)
+    with pytest.raises(KeyError):
+        with instrumentation.span("lookup"):
+            clock.now += 0.1
+            raise KeyError("missing")
+    assert instrumentation.spans["lookup"].stats.mean == pytest.approx(0.1)
+
+
+def test_event_loop_lag_is_how_late_the_probe_ran(clock):
+    root = Root(clock)
+    instrumentation = Instrumentation(clock)
+    instrumentation.watch_event_loop(root, interval_ms=100)
+    root.run()
+    root.run(late=0.3)
+    root.run()
+    assert instrumentation.lag.stats.count == 3
+    assert instrumentation.lag.stats.max == pytest.approx(0.3)
+
+
+def test_exports(clock, tmp_path):
+    instrumentation = Instrumentation(clock)
+    with instrumentation.span("update_timer"):
+        clock.now += 0.002
+
+    prom = tmp_path / "metrics.prom"
+    instrumentation.export(str(prom))
+    text = prom.read_text()
+    assert 'quiz_span_seconds{span="update_timer",quantile="0.5"}' in text
+    assert 'quiz_span_seconds_count{span="update_timer"} 1' in text
+    assert "quiz_event_loop_lag_seconds_count 0" in text
+
+    lines = tmp_path / "metrics.jsonl"
+    instrumentation.export(str(lines))
+    instrumentation.export(str(lines))
+    snapshots = [json.loads(line) for line in lines.read_text().splitlines()]
+    assert len(snapshots) == 2
+    assert snapshots[0]["spans"]["update_timer"]["count"] == 1
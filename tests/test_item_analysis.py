@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import item_analysis  # noqa: E402
+from conftest import play_session  # noqa: E402
+from results_store import ResultsStore  # noqa: E402
+
+
+@pytest.fixture
+def results_db(tmp_path, make_bank):
+    """A results database of 300 quizzes, in a directory whose name needs quoting in a URI."""
+    directory = tmp_path / "odd ?#% name"
+    directory.mkdir()
+    path = str(directory / "results.db")
+    bank = make_bank(10, ["Science"])
+    rng = random.Random(5)
+    store = ResultsStore(path, flush_interval=0.01)
+    for player in range(300):
+        skill = rng.random()
+        ids = rng.sample(range(len(bank)), rng.randint(3, 8))
+        # Question 0 is answered right by everyone, question 1 by the better players
+        answers = [bank[i].correct_answer if i == 0 or rng.random() < skill else
+                   (bank[i].correct_answer + 1) % 4 for i in ids]
+        if rng.random() < 0.1 and ids[-1] != 0:
+            answers[-1] = None
+        session, results = play_session(bank, ids, answers)
+        store.record_session(f"player{player}", session, results)
+    store.flush()
+    store.close()
+    return path
+
+
+def test_plan_is_the_same_however_sessions_are_fetched(results_db, monkeypatch):
+    whole = item_analysis.plan_chunks(results_db, chunk_rows=100)
+    monkeypatch.setattr(item_analysis, "FETCH_ROWS", 7)
+    streamed = item_analysis.plan_chunks(results_db, chunk_rows=100)
+    assert streamed == whole
+    ranges, lower, upper = whole
+    assert len(ranges) > 5 and 0.0 <= lower < upper <= 1.0
+    # Ranges are back to back and cover every session
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert ranges[0][0] == 1 and ranges[-1][1] == 301
+
+
+def test_statistics_match_the_stored_answers(results_db):
+    items = {item.question_id: item for item in item_analysis.analyze(results_db, chunk_rows=100)}
+    connection = item_analysis._connect(results_db)
+    rows = connection.execute("SELECT question_id, COUNT(*), SUM(correct) FROM answers GROUP BY question_id")
+    for question_id, responses, correct in rows:
+        assert items[question_id].responses == responses
+        assert items[question_id].p_value == pytest.approx(correct / responses)
+        assert sum(items[question_id].option_rates) == pytest.approx(1.0)
+    connection.close()
+    always_right = [item for item in items.values() if item.p_value == 1.0]
+    assert always_right and "too easy" in always_right[0].flags()
+
+
+def test_chunked_and_whole_analysis_agree(results_db):
+    whole = item_analysis.analyze(results_db, chunk_rows=10 ** 9)
+    chunked = item_analysis.analyze(results_db, chunk_rows=50)
+    assert [item.question_id for item in whole] == [item.question_id for item in chunked]
+    for a, b in zip(whole, chunked):
+        assert a.discrimination == pytest.approx(b.discrimination)
+        assert a.point_biserial == pytest.approx(b.point_biserial)
+
+
+def test_empty_database(tmp_path):
+    path = str(tmp_path / "empty.db")
+    ResultsStore(path).close()
+    assert item_analysis.plan_chunks(path) == ([], 0.0, 1.0)
+    assert item_analysis.analyze(path) == []
@@ -0,0 +1,37 @@
+from collections import Counter
+
+import pytest
+
+from question_bank import QuestionBank, sample_ids
+
+
+def test_category_index_lists_ids_in_order(bank):
+    assert bank.categories() == ["Science", "History", "Geography"]
+    assert list(bank.category_index["History"]) == list(range(10, 20))
+    assert bank.count(["Science", "Geography", "Astronomy"]) == 20
+
+
+def test_sample_is_distinct_and_stays_in_its_categories(bank, rng):
+    for _ in range(200):
+        deck = bank.sample(["History", "Geography"], 7, rng)
+        assert len(set(deck)) == 7
+        assert {bank[question_id].category for question_id in deck} <= {"History", "Geography"}
+
+
+def test_sample_stops_at_the_pool_size(bank, rng):
+    assert sorted(bank.sample(["Science", "Astronomy"], 50, rng)) == list(range(10))
+
+
+def test_sample_ids_skips_empty_groups_and_is_uniform(rng):
+    groups = [[], [1, 2], [], [], [3], []]
+    counts = Counter()
+    for _ in range(6000):
+        counts.update(sample_ids(groups, 1, rng))
+    assert set(counts) == {1, 2, 3}
+    assert min(counts.values()) == pytest.approx(2000, rel=0.1)
+
+
+def test_from_store_shares_the_store(bank):
+    wrapped = QuestionBank.from_store(bank.store, bank.category_index)
+    assert wrapped[12].text == bank[12].text
+    assert wrapped.category_index is not bank.category_index
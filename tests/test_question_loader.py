@@ -0,0 +1,66 @@
+import pytest
+
+from question_loader import (QuestionFormatError, batched, load_bank, load_questions, read_csv,
+                             validate_records, write_jsonl)
+
+
+def write_csv(path, header, *rows):
+    path.write_text("\n".join([header, *rows]) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_jsonl_round_trip(tmp_path, make_questions):
+    questions = make_questions(3)
+    path = str(tmp_path / "bank.jsonl")
+    assert write_jsonl(questions, path) == len(questions)
+    assert list(load_questions(path)) == [q._replace(options=tuple(q.options)) for q in questions]
+    assert len(load_bank(path, limit=4)) == 4
+
+
+def test_csv_orders_numbered_option_columns(tmp_path):
+    path = write_csv(tmp_path / "bank.csv", "option10,text,option2,option1,correct_answer,category",
+                     "D,Pick one?,B,A,2,Science")
+    [question] = load_questions(path)
+    assert question.options == ("A", "B", "D")
+    assert question.correct_answer == 2
+
+
+def test_csv_ignores_empty_option_cells(tmp_path):
+    path = write_csv(tmp_path / "bank.csv", "text,option1,option2,option3,correct_answer,category",
+                     "Yes or no?,Yes,No,,0,Science")
+    [question] = load_questions(path)
+    assert question.options == ("Yes", "No")
+
+
+@pytest.mark.parametrize("column", ["options", "optionA", "Option1", "option"])
+def test_csv_rejects_other_option_columns(tmp_path, column):
+    path = write_csv(tmp_path / "bank.csv", f"text,option1,option2,{column},correct_answer,category",
+                     "Yes or no?,Yes,No,Maybe,0,Science")
+    with pytest.raises(QuestionFormatError, match=column):
+        list(read_csv(path))
+
+
+@pytest.mark.parametrize("line", ["[1, 2]", '"x"', "7", "null"])
+def test_json_lines_must_be_objects(tmp_path, make_questions, line):
+    path = str(tmp_path / "bank.jsonl")
+    write_jsonl(make_questions(1), path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+    with pytest.raises(QuestionFormatError, match="object") as error:
+        list(load_questions(path, skip_invalid=True))
+    assert error.value.line == 4
+
+
+def test_invalid_records_report_their_line():
+    records = [
+        {"text": "Fine?", "options": ["a", "b"], "correct_answer": 1, "category": "X", "_line": 1},
+        {"text": "Broken?", "options": ["a", "b"], "correct_answer": 5, "category": "X", "_line": 2},
+    ]
+    with pytest.raises(QuestionFormatError) as error:
+        list(validate_records(records, "bank.jsonl"))
+    assert error.value.line == 2
+    assert [q.text for q in validate_records(records, skip_invalid=True)] == ["Fine?"]
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
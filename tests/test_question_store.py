@@ -0,0 +1,28 @@
+import pytest
+
+from conftest import make_question
+from question_bank import Question
+from question_store import QuestionStore, object_bytes_per_question
+
+
+def test_views_read_back_what_was_stored(make_questions):
+    questions = make_questions(5) + [Question("Ünïcode ✓?", ["ja", "nein", "‽"], 2, "Sprachen")]
+    store = QuestionStore(questions)
+    assert len(store) == len(questions)
+    for question, view in zip(questions, store):
+        assert (view.text, view.options, view.correct_answer, view.category) == \
+            (question.text, list(question.options), question.correct_answer, question.category)
+    assert store.category_names == ["Science", "History", "Geography", "Sprachen"]
+
+
+def test_ids_out_of_range_are_refused():
+    store = QuestionStore([make_question(0)])
+    with pytest.raises(IndexError):
+        store[1]
+    with pytest.raises(IndexError):
+        store[-1]
+
+
+def test_store_is_smaller_than_question_objects(make_questions):
+    questions = make_questions(200)
+    assert QuestionStore(questions).bytes_per_question() < object_bytes_per_question(questions)
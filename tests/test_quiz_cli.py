@@ -0,0 +1,51 @@
+import io
+import os
+import subprocess
+import sys
+
+from quiz_cli import KeyReader, QuizGameCLI
+
+
+def piped_keys(tmp_path, keys):
+    """A KeyReader over a file, as when answers are piped into the game."""
+    path = tmp_path / "keys.txt"
+    path.write_text(keys, encoding="latin-1")
+    return KeyReader(open(path, "rb"))
+
+
+def test_piped_answers_play_a_whole_quiz(tmp_path, bank):
+    out = io.StringIO()
+    with piped_keys(tmp_path, "1\nb\n3\n") as keys:
+        cli = QuizGameCLI(bank, keys, out)
+        assert cli.play(["Science"], 3, 15)
+        keys.stream.close()
+    text = out.getvalue()
+    assert "Question 3/3" in text
+    assert "Final Score:" in text and "/3 " in text
+    assert [record.answer is not None for _, record in cli.engine.session.history()] == [True] * 3
+
+
+def test_keys_that_name_no_option_are_ignored(tmp_path, bank):
+    out = io.StringIO()
+    with piped_keys(tmp_path, "9x1") as keys:
+        cli = QuizGameCLI(bank, keys, out)
+        assert cli.play(["History"], 1, 15)
+        keys.stream.close()
+    assert cli.engine.session.answered_count == 1
+
+
+def test_quitting_or_running_out_of_input_stops_the_quiz(tmp_path, bank):
+    for keys_text in ("1q", "1"):
+        out = io.StringIO()
+        with piped_keys(tmp_path, keys_text) as keys:
+            cli = QuizGameCLI(bank, keys, out)
+            assert not cli.play(["Science"], 3, 15)
+            keys.stream.close()
+        assert cli.engine.session.answered_count == 1
+        assert len(cli.timer_wheel) == 0
+
+
+def test_the_cli_does_not_import_tkinter():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", "import sys, quiz_cli; assert 'tkinter' not in sys.modules"],
+                   cwd=root, check=True)
@@ -0,0 +1,79 @@
+import pytest
+
+from alias_sampler import WeightedSampler
+from quiz_engine import QuizEngine, QuizError
+from timing_wheel import TimingWheel
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def record_events(engine):
+    events = []
+    for event in ("question", "answered", "timeout", "finished"):
+        engine.on(event, lambda *args, event=event: events.append(event))
+    return events
+
+
+def test_a_quiz_runs_through_its_events(bank, clock, rng):
+    engine = QuizEngine(bank, clock=clock, rng=rng)
+    events = record_events(engine)
+    session = engine.start(["Science"], 3, 15)
+    assert len(session) == 3
+
+    clock.now += 4
+    assert engine.answer(session.current_question().correct_answer)
+    assert engine.next()
+    clock.now += 20
+    assert not engine.answer(0)  # Too late: counted as a time-up
+    assert engine.next()
+    engine.timeout()
+    assert not engine.next()
+
+    assert events == ["question", "answered", "question", "timeout", "question", "timeout", "finished"]
+    results = engine.results()
+    assert (results.score, results.answered) == (1, 3)
+    assert results.total_time == pytest.approx(4 + 20 + 0)
+
+
+def test_the_wheel_times_questions_out(bank, clock, rng):
+    wheel = TimingWheel(0.25, clock=clock)
+    engine = QuizEngine(bank, rng=rng, wheel=wheel)
+    events = record_events(engine)
+    engine.start(["History"], 2, 5)
+    clock.now += 5.25
+    wheel.advance()
+    assert events == ["question", "timeout"]
+    assert engine.session.answer_record(0).answer is None
+
+
+def test_bad_settings_are_refused(bank, rng):
+    engine = QuizEngine(bank, rng=rng)
+    with pytest.raises(QuizError):
+        engine.start([], 5, 15)
+    with pytest.raises(QuizError):
+        engine.start(["Science"], 0, 15)
+    with pytest.raises(QuizError):
+        engine.start(["Astronomy"], 5, 15)
+
+
+def test_an_empty_deck_leaves_the_running_quiz_alone(bank, clock, rng):
+    wheel = TimingWheel(0.25, clock=clock)
+    engine = QuizEngine(bank, rng=rng, wheel=wheel)
+    session = engine.start(["Science"], 2, 15)
+
+    engine.selector = WeightedSampler(bank, {"Science": 0, "History": 0, "Geography": 0})
+    with pytest.raises(QuizError, match="weights"):
+        engine.start(["Science", "History"], 5, 15)
+    assert engine.session is session
+    assert len(wheel) == 1  # The running question still has its deadline
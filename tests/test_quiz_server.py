@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from quiz_client import QuizClient, QuizServerError
+from quiz_server import MAX_LINE, QuizServer, Room
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def started_server(bank, tmp_path):
+    server = QuizServer(bank)
+    path = str(tmp_path / "quiz.sock")
+    listener = await server.start_unix(path)
+    return server, listener, path
+
+
+def test_quiz_round_trip(bank, tmp_path):
+    async def scenario():
+        server, listener, path = await started_server(bank, tmp_path)
+        async with listener:
+            client = await QuizClient.connect_unix(path)
+            await client.request("hello", name="Alice")
+            reply = await client.request("start", categories=["Science"], num_questions=2, time_limit=30)
+            assert reply["question"]["category"] == "Science"
+            await client.request("answer", index=0)
+            reply = await client.request("next")
+            assert not reply["finished"]
+            await client.request("timeout")
+            reply = await client.request("next")
+            assert reply["finished"] and reply["results"]["answered"] == 2
+            with pytest.raises(QuizServerError):
+                await client.request("bogus")
+            await client.close()
+    run(scenario())
+
+
+def test_over_long_line_gets_an_error_and_closes(bank, tmp_path):
+    async def scenario():
+        server, listener, path = await started_server(bank, tmp_path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(path, limit=4 * MAX_LINE)
+            writer.write(b'{"op": "hello", "name": "' + b"x" * (2 * MAX_LINE) + b'"}\n')
+            await writer.drain()
+            reply = json.loads(await asyncio.wait_for(reader.readline(), 5))
+            assert reply["ok"] is False and "longer" in reply["error"]
+            assert await asyncio.wait_for(reader.read(), 5) == b""
+            writer.close()
+    run(scenario())
+
+
+def test_room_draws_a_new_seed_each_round():
+    room = Room("friday")
+    alice, bob = object(), object()
+    first = room.seed_for(alice)
+    assert room.seed_for(bob) == first
+    second = room.seed_for(alice)
+    assert second != first
+    assert room.seed_for(bob) == second
+    room.remove(bob)
+    assert room.seed_for(alice) != second
@@ -0,0 +1,56 @@
+import itertools
+import random
+
+import pytest
+
+from conftest import play_session
+from quiz_session import FACTORIALS, QuizSession, decode_permutation, encode_permutation
+
+
+@pytest.mark.parametrize("n", range(1, 6))
+def test_lehmer_codes_number_every_permutation_in_order(n):
+    orders = list(itertools.permutations(range(n)))
+    assert [encode_permutation(order) for order in orders] == list(range(FACTORIALS[n]))
+    assert [decode_permutation(code, n) for code in range(FACTORIALS[n])] == orders
+
+
+def test_unshuffled_session_scores_and_records(bank):
+    ids = list(bank.category_index["History"][:3])
+    answers = [bank[ids[0]].correct_answer, None, (bank[ids[2]].correct_answer + 1) % 4]
+    session, results = play_session(bank, ids, answers)
+    assert results.score == 1
+    assert results.answered == 3
+    assert results.category_stats == {"History": {"correct": 1, "total": 3}}
+    assert [record.answer for _, record in session.history()] == [answers[0], None, answers[2]]
+
+
+def test_answering_twice_is_refused(bank):
+    session = QuizSession(bank, [0, 1], 15)
+    session.record_answer(0, 1.0)
+    with pytest.raises(RuntimeError):
+        session.record_timeout(15)
+
+
+def test_shuffled_options_are_answered_as_displayed_and_stored_as_in_the_bank(bank):
+    ids = list(range(len(bank)))
+    session = QuizSession(bank, ids, 15, rng=random.Random(7))
+    orders = set()
+    while True:
+        question = session.current_question()
+        original = bank[session.question_ids[session.current_index]]
+        assert sorted(question.options) == sorted(original.options)
+        assert question.options[question.correct_answer] == original.options[original.correct_answer]
+        orders.add(question.order)
+        # Pick the option shown last, whatever it is
+        shown = len(question.options) - 1
+        assert session.record_answer(shown, 1.0) == (shown == question.correct_answer)
+        record = session.answer_record(session.current_index)
+        assert record.answer == question.original_index(shown)
+        if not session.advance():
+            break
+    assert len(orders) > 1
+
+    for index in range(len(ids)):
+        question, record = session.review_entry(index)
+        assert record.answer == len(question.options) - 1
+        assert question.order == session.question(index).order
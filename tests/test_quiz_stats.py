@@ -0,0 +1,65 @@
+import statistics
+
+import pytest
+
+from quiz_engine import QuizEngine
+from quiz_stats import AnswerStats, LogHistogram, QuizStats, RunningStats, StatsRecorder
+
+
+def test_running_stats_match_the_statistics_module_after_merging(rng):
+    values = [rng.lognormvariate(1, 0.5) for _ in range(1000)]
+    parts = [RunningStats() for _ in range(3)]
+    for i, value in enumerate(values):
+        parts[i % 3].add(value)
+    total = RunningStats()
+    for part in parts:
+        total.merge(part)
+    total.merge(RunningStats())
+    assert total.count == len(values)
+    assert total.mean == pytest.approx(statistics.mean(values))
+    assert total.stddev == pytest.approx(statistics.stdev(values))
+    assert (total.min, total.max) == (min(values), max(values))
+
+
+def test_histogram_quantiles_stay_within_the_relative_error(rng):
+    values = sorted(rng.lognormvariate(1, 1) for _ in range(5000))
+    histogram = LogHistogram(relative_error=0.01)
+    for value in values:
+        histogram.add(value)
+    for fraction in (0.1, 0.5, 0.95, 0.99):
+        exact = values[int(fraction * (len(values) - 1))]
+        assert histogram.quantile(fraction) == pytest.approx(exact, rel=0.011)
+
+
+def test_histograms_with_different_errors_do_not_merge():
+    with pytest.raises(ValueError):
+        LogHistogram(0.01).merge(LogHistogram(0.02))
+
+
+def test_timeouts_count_for_accuracy_but_not_for_times():
+    stats = AnswerStats()
+    stats.add_answer(2.0, True)
+    stats.add_answer(4.0, False)
+    stats.add_timeout()
+    assert stats.accuracy == pytest.approx(1 / 3)
+    assert stats.times.count == 2
+    assert 2.0 <= stats.quantile(0.5) <= 4.0
+
+
+def test_recorder_keeps_session_and_overall_stats(bank, rng):
+    engine = QuizEngine(bank, rng=rng, shuffle_options=False)
+    overall = QuizStats()
+    recorder = StatsRecorder(engine, overall)
+    for _ in range(2):
+        session = engine.start(["Science"], 3, 15)
+        engine.answer(session.current_question().correct_answer)
+        engine.next()
+        engine.timeout()
+        engine.next()
+        engine.answer(session.current_question().correct_answer)
+        engine.next()
+        assert recorder.session.overall.total == 3
+    assert overall.overall.correct == 4
+    assert overall.overall.timeouts == 2
+    assert overall.categories["Science"].total == 6
+    assert sum(stats.total for stats in overall.questions.values()) == 6
@@ -0,0 +1,53 @@
+import pytest
+
+from conftest import play_session
+from question_bank import Question, QuestionBank
+from results_store import ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_sessions_are_written(store, bank):
+    ids = list(bank.category_index["Science"][:3])
+    session, results = play_session(bank, ids, [bank[i].correct_answer for i in ids[:2]] + [None])
+    store.record_session("Alice", session, results)
+    store.flush()
+    assert store.error is None
+    [entry] = store.player_history("Alice")
+    assert (entry["score"], entry["answered"]) == (2, 3)
+    assert store.category_accuracy("Alice") == {"Science": {"correct": 2, "total": 3}}
+    assert store.leaderboard()[0]["player"] == "Alice"
+
+
+def test_questions_sharing_text_are_kept_apart(store):
+    bank = QuestionBank([
+        Question("Which of these is a prime?", ["4", "6", "7"], 2, "Maths"),
+        Question("Which of these is a prime?", ["9", "11", "15"], 1, "Maths"),
+        Question("Which of these is a prime?", ["4", "6", "7"], 2, "Puzzles"),
+    ])
+    for question_id in range(3):
+        session, results = play_session(bank, [question_id], [bank[question_id].correct_answer])
+        store.record_session("Bob", session, results)
+    store.flush()
+    rows = store._read("SELECT q.options, q.correct_answer FROM questions q ORDER BY q.id")
+    assert rows == [('["4","6","7"]', 2), ('["9","11","15"]', 1), ('["4","6","7"]', 2)]
+    assert store._read("SELECT COUNT(DISTINCT question_id) FROM answers") == [(3,)]
+
+
+def test_a_bad_record_does_not_stop_the_writer(store, bank):
+    session, results = play_session(bank, [0, 1], [0, None])
+    store._queue.put(object())  # Not a SessionRecord
+    store.flush()
+    assert store.error is not None
+    assert store.sessions_written == 0
+
+    store.error = None
+    store.record_session("Dana", session, results)
+    store.flush()
+    assert store.error is None
+    assert store.sessions_written == 1
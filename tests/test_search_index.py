@@ -0,0 +1,118 @@
+import pytest
+
+from question_bank import Question, QuestionBank
+from search_index import SearchIndex, tokenize
+
+
+@pytest.fixture
+def geography():
+    return QuestionBank([
+        Question("What is the capital of Australia?", ["Sydney", "Canberra"], 1, "Geography"),
+        Question("What is the capital of Austria?", ["Vienna", "Graz"], 0, "Geography"),
+        Question("Which river flows through the capital of Austria and many other cities?",
+                 ["Danube", "Rhine"], 0, "Geography"),
+        Question("Who painted the Mona Lisa?", ["Leonardo", "Raphael"], 0, "Art"),
+    ])
+
+
+def test_tokenize_casefolds():
+    assert tokenize("What's the CAPITAL?") == ["what", "s", "the", "capital"]
+
+
+def test_search_ranks_shorter_matches_first(geography):
+    index = SearchIndex.load(geography)
+    assert [question_id for question_id, _ in index.search("capital austria")] == [1, 2]
+    assert [question_id for question_id, _ in index.search("capital austr")] == [0, 1, 2]
+    assert index.search("capital austr", prefix=False) == []
+    assert [question_id for question_id, _ in index.search("leonardo")] == [3]
+
+
+def test_saved_index_is_reused(tmp_path, geography):
+    path = str(tmp_path / "bank.qidx")
+    SearchIndex.load(geography).save(path)
+    index = SearchIndex.load(geography, path)
+    assert not index.modified
+    assert index.search("danube")[0][0] == 2
+
+
+def test_new_questions_are_indexed_after_reading(tmp_path, geography):
+    path = str(tmp_path / "bank.qidx")
+    SearchIndex.load(geography).save(path)
+    geography.add(Question("What is the capital of Peru?", ["Lima", "Cusco"], 0, "Geography"))
+    index = SearchIndex.load(geography, path)
+    assert len(index) == 5 and index.search("peru")[0][0] == 4
+
+
+def test_changed_question_rebuilds_a_stale_index(tmp_path, geography):
+    path = str(tmp_path / "bank.qidx")
+    SearchIndex.load(geography).save(path)
+    questions = list(geography)
+    # Same last question, so only a checksum over every question notices
+    questions[0] = Question("What is the capital of Canada?", ["Ottawa", "Toronto"], 0, "Geography")
+    changed = QuestionBank(questions)
+    index = SearchIndex.load(changed, path)
+    assert index.modified
+    assert index.search("australia") == []
+    assert index.search("canada")[0][0] == 0
+
+
+def test_shrunk_bank_rebuilds(tmp_path, geography):
+    path = str(tmp_path / "bank.qidx")
+    SearchIndex.load(geography).save(path)
+    smaller = QuestionBank(list(geography)[:2])
+    index = SearchIndex.load(smaller, path)
+    assert len(index) == 2 and index.search("danube") == []
+
+
+def test_update_checks_a_read_index_in_slices(tmp_path, make_bank):
+    bank = make_bank(10)
+    path = str(tmp_path / "bank.qidx")
+    SearchIndex.load(bank).save(path)
+    index = SearchIndex.load(bank, path, index_new=False)
+    steps = []
+    while True:
+        done = index.update(bank, 7)
+        if not done:
+            break
+        steps.append(done)
+    assert steps == [7, 7, 7, 7, 2]
+    assert not index.modified and len(index) == len(bank)
+
+
+def test_truncated_file_is_ignored(tmp_path, geography):
+    path = tmp_path / "bank.qidx"
+    SearchIndex.load(geography).save(str(path))
+    path.write_bytes(path.read_bytes()[:40])
+    index = SearchIndex.load(geography, str(path))
+    assert len(index) == len(geography) and index.modified
+
+
+def test_common_words_rank_exactly_after_questions_are_added(tmp_path):
+    def question(number, text):
+        return Question(f"Question {number} {text}", ["yes", "no"], 0, "Quiz")
+
+    # Short questions with the word once rank above long ones with it twice,
+    # until the long questions added later raise the average length
+    bank = QuestionBank([question(n, "common" if n % 3 else "common common " + "word " * 24)
+                         for n in range(400)])
+    index = SearchIndex.load(bank)
+    assert all(question_id % 3 for question_id, _ in index.search("common", 10))
+    for n in range(400, 800):
+        bank.add(question(n, "word " * 200))
+    index.update(bank)
+
+    def expected(limit):
+        average = index.average_length
+        scores = {}
+        for question_id, q in enumerate(bank):
+            words = tokenize(" ".join([q.text, *q.options, q.category]))
+            frequency = words.count("common")
+            if frequency:
+                scores[question_id] = frequency / (frequency + 1.2 * (0.25 + 0.75 * len(words) / average))
+        return sorted(scores, key=lambda i: (-scores[i], i))[:limit]
+
+    assert [question_id for question_id, _ in index.search("common", 10)] == expected(10)
+    assert not any(question_id % 3 for question_id in expected(10))
+    path = str(tmp_path / "bank.qidx")
+    index.save(path)
+    assert [question_id for question_id, _ in SearchIndex.read(path).search("common", 10)] == expected(10)
@@ -0,0 +1,52 @@
+import pytest
+
+from question_loader import write_jsonl
+from simulator import BotConfig, SimulationResult, batches, play, score_rows, simulate
+
+
+def test_bots_play_every_question(bank):
+    config = BotConfig(questions=5, accuracy=1.0, accuracy_spread=0.0, time_spread=0.01)
+    result = play(bank, config, 20, seed=1)
+    assert result.players == 20
+    assert result.answers == 100
+    assert result.scores == {5: 20}
+    assert result.calls["start"].stats.count == 20
+    assert result.stats.overall.percentiles()["p50"] == pytest.approx(config.median_time, rel=0.05)
+
+
+def test_slow_bots_run_out_of_time(bank):
+    config = BotConfig(questions=4, time_limit=1, median_time=60.0)
+    result = play(bank, config, 10, seed=2)
+    assert result.stats.overall.timeouts == 40
+    assert result.calls["answer"].stats.count == 0
+    assert result.scores == {0: 10}
+
+
+def test_results_merge(bank):
+    config = BotConfig(questions=3)
+    total = SimulationResult()
+    for seed in range(3):
+        total.merge(play(bank, config, 5, seed))
+    assert total.players == 15
+    assert total.answers == 45
+    assert sum(total.scores.values()) == 15
+
+
+def test_batches_cover_every_player_with_distinct_seeds():
+    sizes = list(batches(2500, 1000, seed=3))
+    assert [players for players, _ in sizes] == [1000, 1000, 500]
+    assert len({seed for _, seed in sizes}) == 3
+
+
+def test_a_run_is_repeatable(tmp_path, make_questions):
+    path = str(tmp_path / "bank.jsonl")
+    write_jsonl(make_questions(5), path)
+    config = BotConfig(questions=4)
+    first = simulate(path, config, 30, workers=1, batch_size=7, seed=9)
+    second = simulate(path, config, 30, workers=1, batch_size=7, seed=9)
+    assert first.players == 30
+    assert first.scores == second.scores
+
+
+def test_score_rows_include_missing_scores():
+    assert score_rows({0: 2, 3: 1}) == [(0, 2), (1, 0), (2, 0), (3, 1)]
@@ -0,0 +1,76 @@
+import pytest
+
+from timing_wheel import TimingWheel
+
+TICK = 0.25
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def run(wheel, clock, until, step=TICK):
+    """Advance the clock and the wheel one step at a time until the clock reaches until."""
+    while clock.now < until:
+        clock.now += step
+        wheel.advance()
+
+
+def test_timers_fire_within_a_tick_of_their_deadline(clock, rng):
+    # A small wheel, so deadlines cascade through every level and past its range
+    wheel = TimingWheel(TICK, slots=4, levels=2, clock=clock)
+    fired = {}
+    deadlines = {name: rng.uniform(0, 40) for name in range(300)}
+    for name, deadline in deadlines.items():
+        wheel.schedule(deadline, lambda name: fired.setdefault(name, clock.now), name)
+    assert len(wheel) == len(deadlines)
+
+    run(wheel, clock, 45)
+    assert fired.keys() == deadlines.keys()
+    for name, deadline in deadlines.items():
+        assert deadline <= fired[name] < deadline + TICK
+    assert len(wheel) == 0
+
+
+def test_late_ticks_fire_everything_that_came_due(clock):
+    wheel = TimingWheel(TICK, slots=4, levels=2, clock=clock)
+    fired = []
+    for delay in (0.3, 2.0, 9.0, 30.0):
+        wheel.call_later(delay, fired.append, delay)
+    clock.now = 10.0
+    assert wheel.advance() == 3
+    assert fired == [0.3, 2.0, 9.0]
+
+
+def test_cancelled_timers_never_fire(clock):
+    wheel = TimingWheel(TICK, clock=clock)
+    fired = []
+    keep = wheel.call_later(1.0, fired.append, "keep")
+    drop = wheel.call_later(1.0, fired.append, "drop")
+    wheel.cancel(drop)
+    wheel.cancel(drop)
+    wheel.cancel(None)
+    assert len(wheel) == 1
+    run(wheel, clock, 2.0)
+    assert fired == ["keep"]
+    assert keep.cancelled and len(wheel) == 0
+
+
+def test_overdue_timers_fire_on_the_next_tick(clock):
+    clock.now = 5.0
+    wheel = TimingWheel(TICK, clock=clock)
+    fired = []
+    wheel.schedule(1.0, fired.append, "overdue")
+    assert wheel.advance() == 0
+    clock.now += TICK
+    assert wheel.advance() == 1
+    assert fired == ["overdue"]
@@ -0,0 +1,124 @@
+"""Hierarchical timing wheel for question deadlines.
+
+All countdowns share one wheel that is advanced by a single periodic tick,
+instead of every session rescheduling its own one-second callback. Timers
+are kept in buckets by deadline: the first level has one bucket per tick,
+and each level above covers ``slots`` times the span of the level below.
+When a higher-level bucket comes due its timers are moved down a level, so
+scheduling, cancelling and advancing one tick all cost O(1) no matter how
+many timers are active.
+
+Deadlines are absolute time.monotonic() values, so the wheel never drifts:
+a timer fires on the first tick at or after its deadline, however late the
+ticks themselves run.
+"""
+import math
+import time
+from typing import Callable, List, Optional
+
+
+class Timer:
+    """A scheduled callback; keep it to cancel the callback later."""
+
+    __slots__ = ("deadline", "callback", "args", "cancelled", "_tick")
+
+    def __init__(self, deadline: float, callback: Callable, args: tuple, tick: int):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._tick = tick
+
+
+class TimingWheel:
+    """Schedules callbacks at monotonic deadlines with tick resolution."""
+
+    def __init__(self, tick: float = 0.05, slots: int = 64, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self.slots = slots
+        self.clock = clock
+        self.current_tick = int(clock() / tick)
+        self._levels: List[List[List[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._active = 0
+
+    def __len__(self) -> int:
+        """Return the number of timers that have not fired or been cancelled."""
+        return self._active
+
+    def schedule(self, deadline: float, callback: Callable, *args) -> Timer:
+        """Call callback(*args) once the clock reaches deadline."""
+        # Round up so a timer never fires before its deadline; timers that are
+        # already due fire on the next tick
+        tick = max(math.ceil(deadline / self.tick), self.current_tick + 1)
+        timer = Timer(deadline, callback, args, tick)
+        self._active += 1
+        self._insert(timer)
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """Call callback(*args) after delay seconds."""
+        return self.schedule(self.clock() + delay, callback, *args)
+
+    def cancel(self, timer: Optional[Timer]):
+        """Stop a timer from firing; cancelling twice is harmless."""
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self._active -= 1
+
+    def _insert(self, timer: Timer):
+        delta = timer._tick - self.current_tick
+        if delta <= 0:
+            # Moved down from a higher level exactly on its tick
+            self._levels[0][self.current_tick % self.slots].append(timer)
+            return
+        for level in range(len(self._levels)):
+            if delta < self._spans[level + 1]:
+                index = (timer._tick // self._spans[level]) % self.slots
+                self._levels[level][index].append(timer)
+                return
+        # Beyond the wheel's range: park it in the furthest bucket of the top level
+        level = len(self._levels) - 1
+        index = (self.current_tick // self._spans[level] - 1) % self.slots
+        self._levels[level][index].append(timer)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fire every timer due by now; return how many fired."""
+        target = int((self.clock() if now is None else now) / self.tick)
+        if not self._active:
+            self.current_tick = max(self.current_tick, target)
+            return 0
+
+        fired = 0
+        while self.current_tick < target:
+            self.current_tick += 1
+            tick = self.current_tick
+
+            # Move timers from higher levels down as their bucket comes due
+            for level in range(1, len(self._levels)):
+                if tick % self._spans[level]:
+                    break
+                index = (tick // self._spans[level]) % self.slots
+                bucket = self._levels[level][index]
+                self._levels[level][index] = []
+                for timer in bucket:
+                    if not timer.cancelled:
+                        self._insert(timer)
+
+            index = tick % self.slots
+            bucket = self._levels[0][index]
+            if not bucket:
+                continue
+            self._levels[0][index] = []
+            for timer in bucket:
+                if timer.cancelled:
+                    continue
+                if timer._tick > tick:
+                    self._insert(timer)
+                    continue
+                timer.cancelled = True
+                self._active -= 1
+                fired += 1
+                timer.callback(*timer.args)
+        return fired